@@ -1,15 +1,16 @@
 import streamlit as st
-import json
 import os
 import glob
 from datetime import datetime
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 from PIL import Image
-import pandas as pd
 import time
 import sys
 import importlib
+import progress_reporter
+from patent_table import read_patent_table
+from topic_model_store import load_topic_run
 
 # 한글 파일명 import 처리
 try:
@@ -171,14 +172,7 @@ def show_navigation():
 
 def update_progress(step, message):
     """진행 상황 업데이트"""
-    progress_data = {
-        "stage": f"Step {step}",
-        "current": step,
-        "total": 5,
-        "message": message
-    }
-    with open("progress.json", "w", encoding="utf-8") as f:
-        json.dump(progress_data, f, ensure_ascii=False)
+    progress_reporter.report(f"Step {step}", step, 5, message, force=True)
     
     st.session_state.step_progress = step
 
@@ -207,15 +201,14 @@ def run_analysis_pipeline(keyword):
         
         status_container.info(f"{icon} Step {step_num}: {step_name} 중...")
         
-        # progress.json 파일 모니터링
-        import time
+        # 같은 프로세스의 reporter에서 새 보고가 올 때까지 대기 (파일 폴링 없음)
+        reporter = progress_reporter.get_reporter()
+        version = 0
         
         while True:
             try:
-                if os.path.exists("progress.json"):
-                    with open("progress.json", "r", encoding="utf-8") as f:
-                        progress_data = json.load(f)
-                    
+                version, progress_data = reporter.wait_for_update(version, timeout=0.5)
+                if progress_data:
                     current = progress_data.get("current", 0)
                     total = progress_data.get("total", 1)
                     message = progress_data.get("message", "")
@@ -234,10 +227,6 @@ def run_analysis_pipeline(keyword):
                         # 단계 완료 확인
                         if step_progress >= 1.0:
                             break
-                            
-                    time.sleep(0.1)  # 0.1초마다 체크
-                else:
-                    time.sleep(0.5)
             except:
                 time.sleep(0.5)
     
@@ -440,7 +429,7 @@ def display_patent_graph():
         # 키워드별 건수 표시
         if hasattr(st.session_state, 'generated_keywords') and st.session_state.generated_keywords:
             try:
-                df = pd.read_csv("./extract_end.csv")
+                df = read_patent_table(columns=["검색 키워드"])
                 for kw in st.session_state.generated_keywords:
                     mask = df["검색 키워드"].astype(str).str.contains(kw, case=False, na=False)
                     count = mask.sum()
@@ -512,6 +501,11 @@ def display_generated_reports():
 
 def display_topic_results():
     """토픽 분석 결과 표시"""
+    # 저장된 마지막 Step4 실행 (다시 학습하지 않고 토픽 단어/대표 문서만 읽음)
+    stored = load_topic_run(name="step4")
+    if not st.session_state.topic_results and stored is not None:
+        st.session_state.topic_results = stored.topics_dict()
+
     if st.session_state.topic_results:
         st.subheader("🔍 토픽 분석 결과.")
         
@@ -519,6 +513,10 @@ def display_topic_results():
             with st.expander(f"Topic {topic_id + 1}"):
                 st.write("**주요 키워드:**")
                 st.write(", ".join(words[:10]))  # 상위 10개 키워드만 표시
+                if stored is not None and stored.representative_docs.get(topic_id):
+                    st.write(f"**대표 문서** ({stored.topic_sizes.get(topic_id, 0)}건 중):")
+                    for doc in stored.representative_docs[topic_id][:3]:
+                        st.caption(doc[:200])
 
 def main():
     # 멋진 배너 디자인을 위한 CSS
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 하이퍼파라미터 탐색: 전체 그리드(TopicGridSearch) vs 시간 예산 탐색(BudgetedTopicSearch)
+예산 탐색이 그리드 시간의 일부만 써서 찾은 조합이 그리드 전체 순위에서 몇 등인지 비교
+
+    cd code && python benchmarks/bench_budget_search.py
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bertopic.vectorizers import ClassTfidfTransformer
+from hdbscan import HDBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.feature_extraction.text import CountVectorizer
+from umap import UMAP
+
+from reduction_cache import ReductionCache
+from topic_budget_search import BudgetedTopicSearch
+from topic_grid_search import TopicGridSearch, PARAM_NAMES
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_DOCS = 3000
+N_TOPICS = 12
+SPACE = {
+    "n_neighbors": [10, 15, 30, 50],
+    "n_components": [5, 8],
+    "min_dist": [0, 0.01],
+    "min_cluster_size": [15, 30, 60, 120],
+}
+TOPIC_MODEL_KWARGS = {"language": "korean", "nr_topics": 6, "top_n_words": 15}
+BUDGET_RATIO = 0.25
+
+
+def make_corpus():
+    # 세부 토픽 12개가 두 개씩 비슷한 단어를 공유 → 파라미터에 따라 coherence가 달라짐
+    embeddings, labels = make_blobs(n_samples=N_DOCS, n_features=768, centers=N_TOPICS, cluster_std=12.0,
+                                    random_state=SEED)
+    rng = np.random.default_rng(SEED)
+    shared = [[f"공유{t // 2}단어{i}" for i in range(20)] for t in range(N_TOPICS)]
+    own = [[f"토픽{t}단어{i}" for i in range(20)] for t in range(N_TOPICS)]
+    common = [f"공통단어{i}" for i in range(200)]
+    docs = []
+    for label in labels:
+        words = list(rng.choice(shared[label], 6)) + list(rng.choice(own[label], 6)) + list(rng.choice(common, 10))
+        docs.append(" ".join(words))
+    vocab = sorted({word for doc in docs for word in doc.split()})
+    return docs, embeddings.astype(np.float32), vocab
+
+
+def templates(vocab):
+    vectorizer_model = CountVectorizer(vocabulary=vocab, ngram_range=(1, 1), min_df=2, token_pattern=r"(?u)\b\w[\w_]+\b")
+    hdbscan_model = HDBSCAN(min_cluster_size=40, min_samples=2, metric='euclidean',
+                            cluster_selection_method='eom', prediction_data=True)
+    ctfidf_model = ClassTfidfTransformer(bm25_weighting=True, reduce_frequent_words=False)
+    return vectorizer_model, ctfidf_model, hdbscan_model
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    docs, embeddings, vocab = make_corpus()
+    n_combos = int(np.prod([len(values) for values in SPACE.values()]))
+
+    # numba JIT 컴파일 시간을 빼기 위해 한 번 미리 실행
+    UMAP(n_neighbors=10, n_components=5, metric='cosine', random_state=SEED).fit_transform(embeddings[:300])
+
+    start = time.perf_counter()
+    grid = TopicGridSearch(docs, ReductionCache(embeddings, random_state=SEED), *templates(vocab),
+                           topic_model_kwargs=TOPIC_MODEL_KWARGS, max_workers=1)
+    grid.run(SPACE)
+    t_grid = time.perf_counter() - start
+    grid_scores = {
+        key: record["mean_coherence"] for key, record in grid.log.load().items() if record["status"] == "ok"
+    }
+
+    budget = t_grid * BUDGET_RATIO
+    start = time.perf_counter()
+    search = BudgetedTopicSearch(docs, ReductionCache(embeddings, random_state=SEED), *templates(vocab),
+                                 topic_model_kwargs=TOPIC_MODEL_KWARGS)
+    best = search.run(SPACE, budget)
+    t_search = time.perf_counter() - start
+
+    ranking = sorted(grid_scores.values(), reverse=True)
+    key = tuple(best[name] for name in PARAM_NAMES)
+    full_score = grid_scores.get(key, float('nan'))
+    rank = ranking.index(full_score) + 1 if key in grid_scores else None
+    n_full = sum(1 for (_, fraction) in search.results if fraction == 1.0)
+    print(f"전체 그리드: {n_combos}회 학습, {t_grid:.0f}s, 최고 평균 coherence {ranking[0]:.4f}")
+    print(f"예산 탐색 (예산 {budget:.0f}s): {search.n_fits}회 학습 (전체 코퍼스 {n_full}회), {t_search:.0f}s, "
+          f"선택 조합 {key}의 전체 코퍼스 coherence {full_score:.4f} → 그리드 {len(ranking)}개 중 {rank}위")
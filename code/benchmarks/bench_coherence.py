@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+토픽 coherence(c_v): 토픽마다 gensim CoherenceModel을 새로 만드는 기존 방식
+vs CoherenceEvaluator (문서 창 통계 한 번, 토픽 단어 통계는 희소 행렬 곱)
+
+    cd code && python benchmarks/bench_coherence.py
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gensim.corpora import Dictionary
+from gensim.models.coherencemodel import CoherenceModel
+
+from topic_coherence import CoherenceEvaluator
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_DOCS = 5000
+N_COMBOS = 10      # 그리드서치 조합 수
+N_TOPICS = 6       # 조합당 토픽 수
+TOP_N = 15
+
+
+def make_texts(rng):
+    vocab = np.array([f"단어{i}" for i in range(3000)])
+    # Zipf 분포 단어 빈도, 요약문 길이 40~160 토큰 (일부는 창 크기 110보다 김)
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(40, 160, N_DOCS)
+    return [list(rng.choice(vocab, length, p=weights)) for length in lengths]
+
+
+def make_topics(rng, dictionary):
+    words = np.array(list(dictionary.token2id))
+    return [[list(rng.choice(words[:500], TOP_N, replace=False)) for _ in range(N_TOPICS)] for _ in range(N_COMBOS)]
+
+
+def before(texts, dictionary, combos):
+    scores = []
+    for topics in combos:
+        for words in topics:
+            cm = CoherenceModel(topics=[words], texts=texts, dictionary=dictionary, coherence='c_v')
+            scores.append(cm.get_coherence())
+    return scores
+
+
+def after(texts, dictionary, combos):
+    evaluator = CoherenceEvaluator(texts, dictionary)
+    return [score for topics in combos for score in evaluator.c_v(topics)]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(SEED)
+    texts = make_texts(rng)
+    dictionary = Dictionary(texts)
+    combos = make_topics(rng, dictionary)
+
+    start = time.perf_counter()
+    scores_before = before(texts, dictionary, combos)
+    t_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores_after = after(texts, dictionary, combos)
+    t_after = time.perf_counter() - start
+
+    diff = np.max(np.abs(np.array(scores_before) - np.array(scores_after)))
+    print(f"{N_DOCS}건, {N_COMBOS}개 조합 × {N_TOPICS}개 토픽: gensim {t_before:.1f}s, "
+          f"CoherenceEvaluator {t_after:.2f}s (x{t_before / t_after:.0f}), 최대 차이 {diff:.2e}")
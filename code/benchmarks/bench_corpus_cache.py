@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 전처리 캐시: 처음 실행 / 같은 코퍼스 / 일부 문서 변경 / 사전 파일 수정
+
+    cd code && python benchmarks/bench_corpus_cache.py
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus_cache import CorpusCache, corpus_fingerprint, DICTIONARY_PATHS
+from korean_tokenizer import KoreanTokenizer
+from patent_preprocessor import PatentPreprocessor, PREPROCESSOR_VERSION
+from phrase_matcher import PhraseMatcher, load_phrases
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+N_DOCS = 1000
+SENTENCES = [
+    "본 발명은 자율주행 로봇이 물류 창고 내에서 장애물을 회피하며 이동하는 방법에 관한 것이다.",
+    "상기 로봇은 rgb-d 카메라와 LiDAR 센서를 이용하여 주변 지도를 생성하고 위치를 추정한다.",
+    "서버는 라스트 마일 배송을 위해 복수의 AGV에게 작업을 할당하고 경로를 계획한다.",
+    "콜드 체인 물류에서 정온 물류 상태를 블록체인에 기록하여 디지털 트윈으로 관리한다.",
+]
+
+
+def run(docs, tokenizer):
+    # Step4.ber와 같은 순서: 사전 로드 → fingerprint → 캐시에 없는 문서만 전처리
+    with open('data/stopwords.txt', encoding='utf-8') as f:
+        stop_words = set(f.read().splitlines())
+    with open('data/eng_data.txt', encoding='utf-8') as f:
+        eng_keywords = set(line.strip().lower() for line in f if line.strip())
+    preprocessor = PatentPreprocessor(stop_words, eng_keywords, PhraseMatcher(load_phrases()), tokenizer)
+
+    start = time.perf_counter()
+    with CorpusCache(corpus_fingerprint(tokenizer.version, PREPROCESSOR_VERSION)) as cache:
+        result = cache.lemmatize(docs, preprocessor.lemmatize)
+        hits, misses = cache.hits, cache.misses
+    return time.perf_counter() - start, result, hits, misses
+
+
+if __name__ == "__main__":
+    # 캐시 DB와 수정할 사전 파일이 작업 폴더를 건드리지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp())
+    os.makedirs('data')
+    for path in DICTIONARY_PATHS:
+        shutil.copy(os.path.join(DATA_DIR, os.path.basename(path)), path)
+
+    rng = random.Random(0)
+    docs = [f"{i}번 특허. " + " ".join(rng.choices(SENTENCES, k=6)) for i in range(N_DOCS)]
+    changed = list(docs)
+    for i in rng.sample(range(N_DOCS), N_DOCS // 10):
+        changed[i] += " 추가로 배송 드론을 포함한다."
+
+    with KoreanTokenizer() as tokenizer:
+        for label, corpus in (("처음 실행", docs), ("같은 코퍼스", docs), ("10% 문서 변경", changed)):
+            elapsed, result, hits, misses = run(corpus, tokenizer)
+            print(f"{label:<10}: {elapsed:.2f}s, 재사용 {hits}개, 새로 전처리 {misses}개")
+
+        with open('data/stopwords.txt', 'a', encoding='utf-8') as f:
+            f.write("\n로봇\n")
+        elapsed, result, hits, misses = run(changed, tokenizer)
+        print(f"{'불용어 수정':<10}: {elapsed:.2f}s, 재사용 {hits}개, 새로 전처리 {misses}개, "
+              f"'로봇' 남은 문서 수: {sum('로봇' in doc.split() for doc in result)}")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 캐시: 처음 실행 / 같은 코퍼스 재실행 / 절반이 겹치는 코퍼스 (로컬 임베딩 stub 사용)
+마지막으로 캐시가 찬 상태에서 새 텍스트 임베딩이 전부 실패해도 캐시가 남는지 확인
+
+    cd code && python benchmarks/bench_embedding_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+
+from embedding_cache import EmbeddingCache
+from embedding_client import BatchEmbedder
+from benchmarks.embedding_stub import EmbeddingStubServer, FAIL_MARKER
+
+N_TEXTS = 2000
+
+
+def make_texts(keyword, n):
+    return [f"{keyword} 특허 {i} 본 발명은 경로 인식과 충돌회피에 관한 것이다." for i in range(n)]
+
+
+def run(embedder, texts):
+    start = time.perf_counter()
+    with EmbeddingCache("text-embedding-3-small") as cache:
+        matrix, valid = cache.embed(texts, embedder.embed_matrix)
+        hits, misses = cache.hits, cache.misses
+    return time.perf_counter() - start, matrix, hits, misses
+
+
+if __name__ == "__main__":
+    # 캐시 폴더가 작업 폴더에 생기지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp())
+    first = make_texts("자율주행", N_TEXTS)
+    # 앞 절반은 first와 같은 특허, 뒤 절반은 새 특허
+    overlap = first[N_TEXTS // 2:] + make_texts("물류로봇", N_TEXTS // 2)
+
+    with EmbeddingStubServer(latency=0.01, per_input_latency=0.0002, dimensions=384) as stub:
+        client = OpenAI(api_key='stub', base_url=stub.base_url, max_retries=0)
+        embedder = BatchEmbedder(client, batch_size=256, max_workers=4)
+
+        for label, texts in (("처음 실행", first), ("같은 코퍼스", first), ("절반 겹침", overlap)):
+            before = stub.input_count
+            elapsed, matrix, hits, misses = run(embedder, texts)
+            print(f"{label:<8}: {elapsed:.2f}s, 캐시 재사용 {hits}개, 새로 임베딩 {misses}개 "
+                  f"(API 입력 {stub.input_count - before}개)")
+
+        # 캐시 결과가 직접 임베딩한 결과와 같은지 확인
+        direct, _ = embedder.embed_matrix(overlap)
+        print(f"결과 동일: {np.array_equal(direct, matrix)}")
+
+        # 새 텍스트가 전부 실패: 캐시를 비우지 않고 캐시된 행만 유효로 반환
+        expected, _ = embedder.embed_matrix(first[:100])
+        failing = first[:100] + [f"{FAIL_MARKER} {i}" for i in range(10)]
+        with EmbeddingCache("text-embedding-3-small") as cache:
+            cached = cache.count()
+            matrix, valid = cache.embed(failing, embedder.embed_matrix)
+            assert cache.count() == cached, (cache.count(), cached)
+            assert valid[:100].all() and not valid[100:].any()
+            assert np.array_equal(matrix[:100], expected)
+        print(f"전부 실패: 캐시 {cached}개 유지, 캐시된 100개만 유효")
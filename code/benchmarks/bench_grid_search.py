@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 그리드서치: 조합마다 UMAP/HDBSCAN/BERTopic을 처음부터 학습하고 결과 JSON 전체를 다시 쓰는 기존 방식
+vs TopicGridSearch (UMAP 그룹 공유, HDBSCAN 트리 공유, 추가 전용 로그, 재시작)
+
+    cd code && python benchmarks/bench_grid_search.py
+"""
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bertopic import BERTopic
+from bertopic.vectorizers import ClassTfidfTransformer
+from gensim.corpora import Dictionary
+from gensim.models.coherencemodel import CoherenceModel
+from hdbscan import HDBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.feature_extraction.text import CountVectorizer
+from umap import UMAP
+
+from reduction_cache import ReductionCache
+from topic_grid_search import TopicGridSearch, GridSearchLog
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_DOCS = 1500
+N_TOPICS = 6
+PARAM_GRID = {
+    "n_neighbors": [10, 20],
+    "n_components": [5],
+    "min_dist": [0, 0.01],
+    "min_cluster_size": [20, 30, 40],
+}
+TOPIC_MODEL_KWARGS = {"language": "korean", "nr_topics": 6, "top_n_words": 15}
+
+
+def make_corpus():
+    embeddings, labels = make_blobs(n_samples=N_DOCS, n_features=768, centers=N_TOPICS, cluster_std=8.0,
+                                    random_state=SEED)
+    rng = np.random.default_rng(SEED)
+    topic_vocab = [[f"토픽{t}단어{i}" for i in range(30)] for t in range(N_TOPICS)]
+    common = [f"공통단어{i}" for i in range(50)]
+    docs = []
+    for label in labels:
+        words = list(rng.choice(topic_vocab[label], 15)) + list(rng.choice(common, 5))
+        docs.append(" ".join(words))
+    vocab = sorted({word for doc in docs for word in doc.split()})
+    return docs, embeddings.astype(np.float32), vocab
+
+
+def templates(vocab):
+    vectorizer_model = CountVectorizer(vocabulary=vocab, ngram_range=(1, 1), min_df=2, token_pattern=r"(?u)\b\w[\w_]+\b")
+    hdbscan_model = HDBSCAN(min_cluster_size=40, min_samples=2, metric='euclidean',
+                            cluster_selection_method='eom', prediction_data=True)
+    ctfidf_model = ClassTfidfTransformer(bm25_weighting=True, reduce_frequent_words=False)
+    return vectorizer_model, ctfidf_model, hdbscan_model
+
+
+def before(docs, embeddings, vocab):
+    vectorizer_model, ctfidf_model, _ = templates(vocab)
+    texts = [doc.split() for doc in docs]
+    dictionary = Dictionary(texts)
+    results = []
+    for n_neighbors, n_components, min_dist, min_cs in itertools.product(*PARAM_GRID.values()):
+        topic_model = BERTopic(
+            calculate_probabilities=True,
+            vectorizer_model=vectorizer_model,
+            umap_model=UMAP(n_neighbors=n_neighbors, n_components=n_components, min_dist=min_dist,
+                            metric='cosine', random_state=SEED),
+            hdbscan_model=HDBSCAN(min_cluster_size=min_cs, min_samples=2, metric='euclidean',
+                                  cluster_selection_method='eom', prediction_data=True),
+            ctfidf_model=ctfidf_model,
+            **TOPIC_MODEL_KWARGS
+        )
+        topic_model.fit_transform(docs, embeddings=embeddings)
+        topic_words = {
+            str(topic_id): [word for word, _ in topic_model.get_topic(topic_id)]
+            for topic_id in topic_model.get_topic_freq().Topic
+            if topic_id != -1
+        }
+        if len(topic_words) < 3:
+            continue
+        coherence = {}
+        for topic_id, words in topic_words.items():
+            cm = CoherenceModel(topics=[words], texts=texts, dictionary=dictionary, coherence='c_v')
+            coherence[topic_id] = cm.get_coherence()
+        mean_coh = sum(coherence.values()) / len(coherence)
+        results.append({"params": [n_neighbors, n_components, min_dist, min_cs], "mean_coherence": mean_coh})
+        with open("grid_before.json", "w", encoding="utf-8") as f:
+            json.dump({"results": results, "best": max(results, key=lambda x: x["mean_coherence"])}, f)
+    return max(results, key=lambda x: x["mean_coherence"])
+
+
+def after(docs, embeddings, vocab, param_grid=PARAM_GRID):
+    search = TopicGridSearch(docs, ReductionCache(embeddings, random_state=SEED), *templates(vocab),
+                             topic_model_kwargs=TOPIC_MODEL_KWARGS, log_path="grid_after.jsonl")
+    return search, search.run(param_grid)
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    docs, embeddings, vocab = make_corpus()
+    n_combos = int(np.prod([len(values) for values in PARAM_GRID.values()]))
+
+    # numba JIT 컴파일 시간을 빼기 위해 한 번 미리 실행
+    UMAP(n_neighbors=10, n_components=5, metric='cosine', random_state=SEED).fit_transform(embeddings[:300])
+
+    start = time.perf_counter()
+    best_before = before(docs, embeddings, vocab)
+    t_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    search, best_after = after(docs, embeddings, vocab)
+    t_after = time.perf_counter() - start
+
+    print(f"{N_DOCS}건, {n_combos}개 조합: 기존 {t_before:.1f}s (UMAP {n_combos}회), "
+          f"새 방식 {t_after:.1f}s (UMAP 4회, 워커 {search.max_workers}개), x{t_before / t_after:.1f}")
+    print(f"최적 평균 coherence: 기존 {best_before['mean_coherence']:.4f}, 새 방식 {best_after['mean_coherence']:.4f}")
+
+    # 중단 후 재시작: 절반만 평가된 로그에서 이어서 실행
+    os.remove("grid_after.jsonl")
+    half = dict(PARAM_GRID, n_neighbors=PARAM_GRID["n_neighbors"][:1])
+    after(docs, embeddings, vocab, half)
+    start = time.perf_counter()
+    after(docs, embeddings, vocab)
+    t_resume = time.perf_counter() - start
+    n_lines = sum(1 for _ in open("grid_after.jsonl", encoding="utf-8"))
+    log = GridSearchLog("grid_after.jsonl", search.log.fingerprint)
+    print(f"재시작: 남은 조합만 {t_resume:.1f}s, 로그 {n_lines}줄 / 조합 {len(log.load())}개 (중복 평가 없음)")
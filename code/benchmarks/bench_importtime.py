@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+진입점(main, web_api, app, test)과 Step 모듈의 import 시간 (python -X importtime)
+--rev를 주면 그 git 리비전의 code/와 나란히 비교
+
+    cd code && python benchmarks/bench_importtime.py
+    cd code && python benchmarks/bench_importtime.py --rev HEAD~1
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    "main", "web_api", "app", "test",
+    "step1_특허식", "step2_크롤링", "step3_필터링", "step3_5_특허그래프", "step4_벌토픽", "step5_보고서작성",
+]
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def measure(module, cwd):
+    """
+    Returns:
+        (float | None, list[(str, float)], str | None): 총 import 시간(초), 직접 import한 모듈 중 무거운 것, 실패 원인
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True, encoding="utf-8", errors="replace",
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    )
+    children = []
+    total = None
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 0:
+            if name == module:
+                total = cumulative / 1e6
+                break
+            children = []
+        elif indent == 2:
+            children.append((name, cumulative / 1e6))
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if "Error" in line]
+        return None, [], errors[-1] if errors else f"exit {result.returncode}"
+    heaviest = sorted(children, key=lambda item: item[1], reverse=True)[:4]
+    return total, heaviest, None
+
+
+def export_revision(rev):
+    directory = tempfile.mkdtemp(prefix="importtime-")
+    repo = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=CODE_DIR,
+                          capture_output=True, text=True, check=True).stdout.strip()
+    archive = subprocess.run(["git", "archive", rev, "code"], cwd=repo, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+    return os.path.join(directory, "code")
+
+
+def describe(total, heaviest, error):
+    if error:
+        return f"실패 ({error})"
+    top = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in heaviest)
+    return f"{total:.2f}s [{top}]"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rev", help="비교할 git 리비전 (예: HEAD~1)")
+    args = parser.parse_args()
+    old_dir = export_revision(args.rev) if args.rev else None
+
+    for module in TARGETS:
+        current = measure(module, CODE_DIR)
+        if old_dir:
+            previous = measure(module, old_dir)
+            print(f"{module}:\n  {args.rev}: {describe(*previous)}\n  현재: {describe(*current)}")
+        else:
+            print(f"{module}: {describe(*current)}")
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+새로 수집한 특허 반영: 전체 다시 학습 vs 저장된 실행에 증분 배정(IncrementalTopicAssigner)
+- 같은 토픽에서 나온 새 문서: 배정 정확도(학습 토픽의 다수 정답 라벨 기준)와 drift 판단
+- 학습 때 없던 토픽에서 나온 새 문서: drift로 다시 학습이 필요하다고 판단하는지
+
+    cd code && python benchmarks/bench_incremental.py
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bertopic import BERTopic
+from bertopic.vectorizers import ClassTfidfTransformer
+from hdbscan import HDBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.feature_extraction.text import CountVectorizer
+from umap import UMAP
+
+from topic_incremental import IncrementalTopicAssigner
+from topic_model_store import save_topic_model, load_topic_run
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_TOPICS = 7          # 마지막 토픽은 학습 코퍼스에 없음 (새 주제)
+N_TRAIN = 2400
+N_BATCH = 200
+
+
+def make_corpus():
+    embeddings, labels = make_blobs(n_samples=N_TRAIN + 4 * N_BATCH, n_features=768, centers=N_TOPICS,
+                                    cluster_std=8.0, random_state=SEED)
+    rng = np.random.default_rng(SEED)
+    own = [[f"토픽{t}단어{i}" for i in range(20)] for t in range(N_TOPICS)]
+    common = [f"공통단어{i}" for i in range(200)]
+    docs = [" ".join(list(rng.choice(own[label], 8)) + list(rng.choice(common, 10)) + [f"문서{i}"])
+            for i, label in enumerate(labels)]
+    return docs, embeddings.astype(np.float32), labels
+
+
+def fit(docs, embeddings):
+    topic_model = BERTopic(
+        language="korean", calculate_probabilities=True, top_n_words=15,
+        vectorizer_model=CountVectorizer(token_pattern=r"(?u)\b\w[\w_]+\b", min_df=2),
+        umap_model=UMAP(n_neighbors=10, n_components=7, min_dist=0.01, metric='cosine', random_state=SEED),
+        hdbscan_model=HDBSCAN(min_cluster_size=40, min_samples=2, prediction_data=True),
+        ctfidf_model=ClassTfidfTransformer(bm25_weighting=True),
+    )
+    topics, probabilities = topic_model.fit_transform(docs, embeddings=embeddings)
+    return topic_model, topics, probabilities
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    docs, embeddings, labels = make_corpus()
+    known = np.flatnonzero(labels != N_TOPICS - 1)
+    novel = np.flatnonzero(labels == N_TOPICS - 1)
+    train, batch = known[:N_TRAIN], known[N_TRAIN:N_TRAIN + N_BATCH]
+
+    # numba JIT 컴파일 시간을 빼기 위해 한 번 미리 실행
+    fit([docs[i] for i in train[:300]], embeddings[train[:300]])
+
+    train_docs = [docs[i] for i in train]
+    start = time.perf_counter()
+    topic_model, topics, probabilities = fit(train_docs, embeddings[train])
+    t_fit = time.perf_counter() - start
+    save_topic_model(topic_model, topics, probabilities, docs=train_docs, embeddings=embeddings[train])
+
+    # 학습 토픽 → 그 토픽 문서의 다수 정답 라벨
+    topics = np.asarray(topics)
+    majority = {topic: np.bincount(labels[train][topics == topic]).argmax() for topic in set(topics) if topic != -1}
+
+    start = time.perf_counter()
+    assigner = IncrementalTopicAssigner(load_topic_run())
+    new_indices = assigner.new_documents(train_docs + [docs[i] for i in batch])
+    assigned, _ = assigner.assign([docs[batch[i - N_TRAIN]] for i in new_indices], embeddings[batch])
+    same_drift = assigner.drift()
+    t_assign = time.perf_counter() - start
+
+    kept = assigned != -1
+    accuracy = np.mean([majority[topic] == label for topic, label in zip(assigned[kept], labels[batch][kept])])
+    print(f"학습 {N_TRAIN}건: 전체 학습 {t_fit:.1f}s / 새 문서 {len(new_indices)}건 증분 배정 {t_assign * 1000:.0f}ms")
+    print(f"  같은 주제의 새 문서: 배정 정확도 {accuracy:.1%} (-1 {np.mean(~kept):.1%}), "
+          f"다시 학습: {same_drift['refit']} ({same_drift['reason']})")
+
+    assigner.assign([docs[i] for i in novel[:N_BATCH]], embeddings[novel[:N_BATCH]])
+    novel_drift = assigner.drift()
+    print(f"  새 주제 문서 {N_BATCH}건 추가 후: 다시 학습: {novel_drift['refit']} ({novel_drift['reason']})")
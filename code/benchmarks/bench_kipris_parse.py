@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Step2.collect 메모리 벤치마크 (로컬 KIPRIS stub 사용)
+페이지 크기(NUM_OF_ROWS)를 늘려가며 작업 스레드 → 수집기 큐를 제한한 경우(기본 PAGE_QUEUE_SIZE)와
+제한하지 않은 경우(PAGE_QUEUE_SIZE=0: 먼저 끝난 페이지가 차례를 기다리며 통째로 메모리에 남음)의 peak RSS를 비교한다.
+stub 서버와 각 측정은 별도 프로세스에서 실행해서 peak RSS가 서로 섞이지 않게 한다.
+수집기가 MAX_RESULTS에 도달하는 시점과 작업 스레드 진행 상황에 따라 결과가 달라지므로 REPEAT번 중 가장 큰 RSS를 표시한다.
+
+    cd code && python benchmarks/bench_kipris_parse.py
+"""
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROW_COUNTS = [500, 5000, 20000]
+KEYWORDS = ['자율', '주행', '로봇', '센서', '경로', '카메라', '제어', '물류']
+MAX_WORKERS = 8
+REPEAT = 3
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kipris_stub.py')
+
+
+def measure(queue_size, rows, url):
+    import step2_크롤링
+    step2_크롤링.PAGE_QUEUE_SIZE = int(queue_size)
+    step2_크롤링.NUM_OF_ROWS = int(rows)
+    step2_크롤링.MAX_PAGES = 1
+
+    # progress.json이 작업 폴더를 덮어쓰지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp())
+    start = time.perf_counter()
+    patents = step2_크롤링.Step2(max_workers=MAX_WORKERS, requests_per_second=None, url=url).collect(KEYWORDS, 'stub')
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{len(patents)}\t{elapsed:.3f}\t{peak_mb:.1f}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("KIPRIS stub이 시작되지 않았습니다.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == 'collect':
+        measure(*sys.argv[2:])
+        sys.exit(0)
+
+    import step2_크롤링
+    port = free_port()
+    # 수집기가 일찍 멈추면 끊긴 연결에 대한 stub의 오류 출력이 섞이므로 버림
+    stub = subprocess.Popen([sys.executable, STUB, '--port', str(port), '--latency', '0'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(port)
+        url = f"http://127.0.0.1:{port}/getWordSearch"
+        print(f"{'rows':>6} | {'unbounded s':>11} {'RSS MB':>8} | {'bounded s':>9} {'RSS MB':>8} | 수집 특허 수")
+        for rows in ROW_COUNTS:
+            results = {}
+            for mode, queue_size in (('unbounded', 0), ('bounded', step2_크롤링.PAGE_QUEUE_SIZE)):
+                runs = []
+                for _ in range(REPEAT):
+                    out = subprocess.run([sys.executable, __file__, 'collect', str(queue_size), str(rows), url],
+                                         capture_output=True, text=True, check=True)
+                    count, elapsed, peak = out.stdout.strip().splitlines()[-1].split('\t')
+                    runs.append((int(count), float(elapsed), float(peak)))
+                results[mode] = max(runs, key=lambda run: run[2])
+            u, b = results['unbounded'], results['bounded']
+            print(f"{rows:>6} | {u[1]:>11.2f} {u[2]:>8.1f} | {b[1]:>9.2f} {b[2]:>8.1f} | {u[0]} / {b[0]}")
+    finally:
+        stub.terminate()
+        stub.wait()
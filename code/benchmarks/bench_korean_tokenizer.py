@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 형태소 분석: 문서마다 kiwi.tokenize 호출 vs KoreanTokenizer 배치 병렬 분석
+
+    cd code && python benchmarks/bench_korean_tokenizer.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korean_tokenizer import KoreanTokenizer, USE_KIWI
+
+N_DOCS = 2000
+SENTENCES = [
+    "본 발명은 자율주행 로봇이 물류 창고 내에서 장애물을 회피하며 이동하는 방법에 관한 것이다",
+    "상기 로봇은 라이다 센서와 카메라를 이용하여 주변 지도를 생성하고 자신의 위치를 추정한다",
+    "서버는 복수의 운반 로봇에게 작업을 할당하고 경로를 계획하여 무선 통신으로 전송한다",
+    "제어부는 적재된 물건의 무게에 따라 바퀴의 속도와 제동력을 조절할 수 있다",
+    "학습된 인공지능 모델을 이용하여 상자의 종류를 인식하고 분류하는 단계를 포함한다",
+]
+
+
+def make_docs(n, rng):
+    return [" ".join(rng.choices(SENTENCES, k=6)) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    if not USE_KIWI:
+        print("kiwipiepy가 설치되어 있지 않아 Okt 프로세스 풀로 측정합니다.")
+    docs = make_docs(N_DOCS, random.Random(0))
+
+    with KoreanTokenizer(num_workers=1) as tokenizer:
+        start = time.perf_counter()
+        if USE_KIWI:
+            # 기존 Step4 방식: 문서마다 tokenize 호출
+            expected = [[token.form for token in tokenizer._get_kiwi().tokenize(doc)] for doc in docs]
+        else:
+            expected = tokenizer.morphs(docs)
+        serial = time.perf_counter() - start
+
+    print(f"CPU 코어 {os.cpu_count()}개, 문서 {N_DOCS}개")
+    print(f"문서별 호출: {serial:.2f}s")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with KoreanTokenizer(num_workers=workers) as tokenizer:
+            start = time.perf_counter()
+            result = tokenizer.morphs(docs)
+            elapsed = time.perf_counter() - start
+        print(f"workers={workers}: {elapsed:.2f}s (x{serial / elapsed:.1f}), 결과 동일: {result == expected}")
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+대용량 코퍼스 토픽 모델링: 전체를 메모리에 올리는 BERTopic(UMAP + HDBSCAN) vs OnlineTopicModel
+배치를 그때그때 만들어 넘기므로 (디스크에서 읽는 것과 같음) 최대 메모리는 tracemalloc으로 측정
+
+    cd code && python benchmarks/bench_online.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics import adjusted_rand_score
+
+from topic_online import OnlineTopicModel
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_TOPICS = 6
+DIMENSIONS = 768
+BATCH_SIZE = 5000
+SIZES = [10000, 100000]
+N_FULL = 10000
+
+CENTERS = np.random.default_rng(SEED).uniform(-10, 10, (N_TOPICS, DIMENSIONS))
+OWN = [[f"토픽{t}단어{i}" for i in range(20)] for t in range(N_TOPICS)]
+COMMON = [f"공통단어{i}" for i in range(200)]
+
+
+def make_batch(index, size):
+    rng = np.random.default_rng(SEED + index)
+    labels = rng.integers(N_TOPICS, size=size)
+    embeddings = (CENTERS[labels] + rng.normal(0, 8.0, (size, DIMENSIONS))).astype(np.float32)
+    docs = [" ".join(list(rng.choice(OWN[label], 8)) + list(rng.choice(COMMON, 10))) for label in labels]
+    return docs, embeddings, labels
+
+
+def stream(n_docs):
+    def batches():
+        for index, start in enumerate(range(0, n_docs, BATCH_SIZE)):
+            docs, embeddings, _ = make_batch(index, min(BATCH_SIZE, n_docs - start))
+            yield docs, embeddings
+    return batches
+
+
+def true_labels(n_docs):
+    return np.concatenate([make_batch(index, min(BATCH_SIZE, n_docs - start))[2]
+                           for index, start in enumerate(range(0, n_docs, BATCH_SIZE))])
+
+
+def run_full(n_docs):
+    from bertopic import BERTopic
+    from hdbscan import HDBSCAN
+    from umap import UMAP
+    docs, embeddings = [], []
+    for batch_docs, batch_embeddings in stream(n_docs)():
+        docs += batch_docs
+        embeddings.append(batch_embeddings)
+    embeddings = np.vstack(embeddings)
+    topic_model = BERTopic(
+        language="korean", calculate_probabilities=True, nr_topics=N_TOPICS,
+        umap_model=UMAP(n_neighbors=10, n_components=7, min_dist=0.01, metric='cosine', random_state=SEED),
+        hdbscan_model=HDBSCAN(min_cluster_size=40, min_samples=2, prediction_data=True),
+    )
+    topics, _ = topic_model.fit_transform(docs, embeddings=embeddings)
+    return np.asarray(topics)
+
+
+def run_online(n_docs):
+    return OnlineTopicModel(n_topics=N_TOPICS).fit(stream(n_docs)).topics
+
+
+def measure(fn, n_docs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    topics = fn(n_docs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 ** 2, adjusted_rand_score(true_labels(n_docs), topics)
+
+
+if __name__ == "__main__":
+    elapsed, peak, ari = measure(run_full, N_FULL)
+    print(f"BERTopic(UMAP + HDBSCAN) {N_FULL}건: {elapsed:.1f}s, 최대 메모리 {peak:.0f}MB, ARI {ari:.3f}")
+    for n_docs in SIZES:
+        elapsed, peak, ari = measure(run_online, n_docs)
+        print(f"OnlineTopicModel {n_docs}건: {elapsed:.1f}s, 최대 메모리 {peak:.0f}MB, ARI {ari:.3f}")
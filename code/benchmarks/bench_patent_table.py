@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+extract_end.csv(pd.read_csv 전체) vs extract_end.parquet(컬럼 projection) 로드 시간/peak RSS 비교
+저장소의 extract_end.csv를 1×/10×/100×로 복제해서 측정한다.
+
+    cd code && python benchmarks/bench_patent_table.py [../extract_end.csv]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from patent_table import read_patent_table, write_patent_table
+
+SCALES = [1, 10, 100]
+
+# 각 Step이 실제로 읽는 컬럼
+CONSUMERS = {
+    'step3_5': ['검색 키워드', '출원연도'],
+    'step4': ['astrtCont', '발명명칭'],
+}
+
+
+def measure(mode, directory, consumer):
+    start = time.perf_counter()
+    if mode == 'csv':
+        df = pd.read_csv(os.path.join(directory, 'extract_end.csv'))
+    else:
+        df = read_patent_table(columns=CONSUMERS[consumer], path=os.path.join(directory, 'extract_end.parquet'))
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{len(df)}\t{elapsed:.3f}\t{peak_mb:.1f}")
+
+
+def prepare(source, scale, directory):
+    df = pd.read_csv(source)
+    df = pd.concat([df] * scale, ignore_index=True)
+    write_patent_table(df, directory=directory)
+    # 기존 방식 비교용: Step2가 쓰던 그대로의 CSV
+    df.to_csv(os.path.join(directory, 'extract_end.csv'), index=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == 'measure':
+        measure(sys.argv[2], sys.argv[3], sys.argv[4])
+        sys.exit(0)
+    if len(sys.argv) == 5 and sys.argv[1] == 'prepare':
+        prepare(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        sys.exit(0)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, '..', '..', 'extract_end.csv')
+
+    print(f"{'scale':>5} {'csv MB':>7} {'pq MB':>6} {'consumer':>8} | {'read_csv s':>10} {'RSS MB':>7} | {'parquet s':>9} {'RSS MB':>7}")
+    for scale in SCALES:
+        directory = tempfile.mkdtemp()
+        # 부모 프로세스의 peak RSS가 섞이지 않도록 준비/측정 모두 별도 프로세스에서 수행
+        subprocess.run([sys.executable, __file__, 'prepare', source, str(scale), directory], check=True)
+        csv_mb = os.path.getsize(os.path.join(directory, 'extract_end.csv')) / 1024 / 1024
+        pq_mb = os.path.getsize(os.path.join(directory, 'extract_end.parquet')) / 1024 / 1024
+        for consumer in CONSUMERS:
+            results = {}
+            for mode in ('csv', 'parquet'):
+                out = subprocess.run([sys.executable, __file__, 'measure', mode, directory, consumer],
+                                     capture_output=True, text=True, check=True)
+                rows, elapsed, peak = out.stdout.strip().split('\t')
+                results[mode] = (float(elapsed), float(peak))
+            c, p = results['csv'], results['parquet']
+            print(f"{scale:>5} {csv_mb:>7.1f} {pq_mb:>6.1f} {consumer:>8} | {c[0]:>10.3f} {c[1]:>7.1f} | {p[0]:>9.3f} {p[1]:>7.1f}")
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 복합어 처리: 복합어마다 re.sub/re.findall 반복 vs PhraseMatcher 한 번 스캔
+복합어 사전을 data/phrase_data.txt(37개)에서 수천 개까지 늘려가며 비교
+
+    cd code && python benchmarks/bench_phrase_matcher.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phrase_matcher import PhraseMatcher, load_phrases
+
+PHRASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'data', 'phrase_data.txt')
+N_DOCS = 300
+SYLLABLES = [chr(c) for c in range(ord('가'), ord('가') + 400)]
+
+
+def synthetic_phrases(n, rng):
+    """'가나다 라마' 형태의 가짜 복합어 n개 (긴 것부터)"""
+    phrases = set()
+    while len(phrases) < n:
+        left = ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        right = ''.join(rng.choices(SYLLABLES, k=rng.randint(1, 3)))
+        phrases.add(f"{left} {right}")
+    phrases = sorted(phrases, key=len, reverse=True)
+    return {ph.lower(): ph.replace(' ', '').lower() for ph in phrases}
+
+
+def make_docs(phrases, rng):
+    keys = list(phrases)
+    docs = []
+    for _ in range(N_DOCS):
+        words = [''.join(rng.choices(SYLLABLES, k=3)) for _ in range(120)]
+        for _ in range(8):
+            words.insert(rng.randrange(len(words)), rng.choice(keys))
+        docs.append(' '.join(words))
+    return docs
+
+
+def per_phrase(docs, concat_phrases):
+    # 기존 preprocess_patent_summaries의 2.1/2.2/2.6 루프
+    results = []
+    for text in docs:
+        for ph_lower, glued_lower in concat_phrases.items():
+            text = re.sub(re.escape(ph_lower), glued_lower, text, flags=re.IGNORECASE)
+        found = []
+        for ph_lower, glued_lower in concat_phrases.items():
+            count = len(re.findall(re.escape(glued_lower), text, flags=re.IGNORECASE))
+            if count:
+                found.extend([glued_lower] * count)
+        components = set()
+        for ph_lower, glued_lower in concat_phrases.items():
+            if re.search(re.escape(glued_lower), text, flags=re.IGNORECASE):
+                components.add(glued_lower)
+        results.append((text, components))
+    return results
+
+
+def single_scan(docs, matcher):
+    results = []
+    for text in docs:
+        text, found = matcher.scan(text)
+        results.append((text, set(found)))
+    return results
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    dictionaries = [("phrase_data.txt", load_phrases(PHRASE_PATH))]
+    dictionaries += [(f"가짜 {n}개", synthetic_phrases(n, rng)) for n in (500, 2000, 5000)]
+
+    for label, concat_phrases in dictionaries:
+        docs = make_docs(concat_phrases, rng)
+
+        start = time.perf_counter()
+        expected = per_phrase(docs, concat_phrases)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = PhraseMatcher(concat_phrases)
+        compile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results = single_scan(docs, matcher)
+        fast = time.perf_counter() - start
+
+        print(f"{label:<16} ({len(concat_phrases):>4}개): 복합어별 루프 {slow:.2f}s, "
+              f"한 번 스캔 {fast:.3f}s + 컴파일 {compile_time:.3f}s (x{slow / (fast + compile_time):.0f}), "
+              f"치환 결과/복합어 집합 동일: {results == expected}")
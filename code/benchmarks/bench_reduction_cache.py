@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 차원 축소: 2D 시각화용 UMAP + 버리는 BERTopic(HDBSCAN) + 본 모델 UMAP/HDBSCAN
+vs ReductionCache (kNN 한 번, 클러스터링 한 번)
+
+    cd code && python benchmarks/bench_reduction_cache.py
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import hdbscan
+import umap
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reduction_cache import ReductionCache, CachedUMAP
+
+warnings.filterwarnings('ignore')
+SEED = 42
+
+
+def cluster(reduced):
+    return hdbscan.HDBSCAN(min_cluster_size=40, min_samples=2, metric='euclidean',
+                           cluster_selection_method='eom', prediction_data=True).fit_predict(reduced)
+
+
+def before(embeddings):
+    # 2D UMAP(15) → 같은 UMAP을 넣은 버리는 BERTopic이 다시 학습 + HDBSCAN
+    umap_2d = umap.UMAP(n_neighbors=15, n_components=2, metric='cosine', min_dist=0.1, random_state=SEED)
+    umap_2d.fit_transform(embeddings)
+    cluster(umap_2d.fit_transform(embeddings))
+    # 본 모델: 7D UMAP(10) + HDBSCAN
+    reduced = umap.UMAP(n_neighbors=10, n_components=7, metric='cosine', min_dist=0.01,
+                        random_state=SEED).fit_transform(embeddings)
+    return cluster(reduced)
+
+
+def after(embeddings):
+    cache = ReductionCache(embeddings, random_state=SEED)
+    cache.reduce(n_neighbors=15, n_components=2, min_dist=0.1)
+    reduced = CachedUMAP(cache, n_neighbors=10, n_components=7, min_dist=0.01).fit(embeddings).transform(embeddings)
+    return cluster(reduced), cache.knn_builds
+
+
+if __name__ == "__main__":
+    for n_docs in (3000, 8000):
+        embeddings, truth = make_blobs(n_samples=n_docs, n_features=768, centers=6, cluster_std=8.0,
+                                       random_state=SEED)
+        embeddings = embeddings.astype(np.float32)
+        # numba JIT 컴파일 시간을 빼기 위해 한 번 미리 실행
+        if n_docs == 3000:
+            before(embeddings[:500])
+            after(embeddings[:500])
+
+        start = time.perf_counter()
+        labels_before = before(embeddings)
+        t_before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labels_after, knn_builds = after(embeddings)
+        t_after = time.perf_counter() - start
+
+        print(f"{n_docs}건: 기존 {t_before:.1f}s (UMAP 3회, HDBSCAN 2회), "
+              f"캐시 {t_after:.1f}s (kNN {knn_builds}회, UMAP 2회, HDBSCAN 1회), x{t_before / t_after:.1f} | "
+              f"정답과 ARI: 기존 {adjusted_rand_score(truth, labels_before):.3f}, "
+              f"캐시 {adjusted_rand_score(truth, labels_after):.3f}")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Step3 유사도 계산: 특허마다 sklearn cosine_similarity 호출 vs SimilarityScorer 행렬 곱 한 번
+
+    cd code && python benchmarks/bench_similarity.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from similarity_scorer import SimilarityScorer
+
+DIMENSIONS = 1536  # text-embedding-3-small
+
+
+def per_row(reference_vector, embeddings):
+    # 기존 Step3 방식
+    return [0 if emb is None else cosine_similarity([reference_vector], [emb])[0][0] for emb in embeddings]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    reference_vector = rng.standard_normal(DIMENSIONS).tolist()
+
+    for n_docs in (1000, 10000, 50000):
+        # API 응답과 같은 모양: float 리스트의 리스트 (일부는 임베딩 실패로 None)
+        embeddings = rng.standard_normal((n_docs, DIMENSIONS)).astype(np.float32).tolist()
+        embeddings[::97] = [None] * len(embeddings[::97])
+
+        start = time.perf_counter()
+        expected = per_row(reference_vector, embeddings)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = SimilarityScorer(reference_vector).score(embeddings)
+        from_list = time.perf_counter() - start
+
+        # Step3는 BatchEmbedder.embed_matrix로 응답을 바로 float32 행렬에 채우므로 행렬 곱만 남음
+        matrix = np.asarray([[0.0] * DIMENSIONS if e is None else e for e in embeddings], dtype=np.float32)
+        valid = np.array([e is not None for e in embeddings])
+        start = time.perf_counter()
+        SimilarityScorer(reference_vector).score(matrix, valid)
+        from_matrix = time.perf_counter() - start
+
+        print(f"{n_docs:>6}건: per-row {slow:.2f}s, 리스트 입력 {from_list:.3f}s (x{slow / from_list:.0f}), "
+              f"행렬 입력 {from_matrix:.4f}s (x{slow / from_matrix:.0f}), "
+              f"최대 오차 {np.max(np.abs(np.asarray(expected) - scores)):.1e}")
+
+    # 기준 벡터 여러 개도 한 번의 행렬 곱으로 계산
+    references = rng.standard_normal((8, DIMENSIONS))
+    matrix = rng.standard_normal((50000, DIMENSIONS)).astype(np.float32)
+    start = time.perf_counter()
+    SimilarityScorer(references).similarity_matrix(matrix)
+    print(f"50000건 x 기준 8개 (float32 행렬 입력): {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Step2 순차 크롤링 vs 동시 크롤링 벤치마크 (로컬 KIPRIS stub 사용)
+
+    cd code && python benchmarks/bench_step2_crawl.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import step2_크롤링
+from step2_크롤링 import Step2
+from benchmarks.kipris_stub import KiprisStubServer
+
+KEYWORDS = ['자율', '주행', '로봇', '센서', '경로', '카메라', '제어', '물류', '배송', '창고']
+
+
+def run(max_workers, url):
+    s2 = Step2(max_workers=max_workers, requests_per_second=None, url=url)
+    start = time.perf_counter()
+    patents = s2.collect(KEYWORDS, api_key='stub')
+    return time.perf_counter() - start, patents
+
+
+if __name__ == "__main__":
+    # progress.json 등 산출물이 작업 폴더를 덮어쓰지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp())
+    step2_크롤링.MAX_PAGES = 2
+    step2_크롤링.NUM_OF_ROWS = 100
+
+    with KiprisStubServer(latency=0.2) as stub:
+        serial_time, serial = run(1, stub.url)
+        for workers in (4, 8, 20):
+            elapsed, patents = run(workers, stub.url)
+            same = [p['출원번호'] for p in patents] == [p['출원번호'] for p in serial]
+            print(f"workers={workers:>2}: {elapsed:.2f}s (순차 {serial_time:.2f}s, x{serial_time / elapsed:.1f}), 결과 동일: {same}")
+
+    # 일시적인 429/503 응답이 섞여도 재시도로 전부 수집되는지 확인
+    with KiprisStubServer(latency=0.05, failures={429: 3, 503: 3}) as stub:
+        elapsed, patents = run(8, stub.url)
+        print(f"429/503 주입: {elapsed:.2f}s, 요청 {stub.request_count}회, 결과 동일: "
+              f"{[p['출원번호'] for p in patents] == [p['출원번호'] for p in serial]}")
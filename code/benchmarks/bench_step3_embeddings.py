@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Step3 임베딩: 특허당 요청 1회 vs 묶음 요청 벤치마크 (로컬 임베딩 stub 사용)
+
+    cd code && python benchmarks/bench_step3_embeddings.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+
+from embedding_client import BatchEmbedder
+from benchmarks.embedding_stub import EmbeddingStubServer, FAIL_MARKER
+
+N_TEXTS = 500
+
+
+def make_texts(n):
+    return [f"자율주행 로봇 특허 {i} 본 발명은 경로 인식과 충돌회피에 관한 것이다." for i in range(n)]
+
+
+def run_sequential(client, texts):
+    # 기존 Step3 방식: 특허마다 요청 1회
+    start = time.perf_counter()
+    vectors = [client.embeddings.create(input=text, model="text-embedding-3-small").data[0].embedding
+               for text in texts]
+    return time.perf_counter() - start, vectors
+
+
+def run_batched(client, texts, batch_size, max_workers):
+    embedder = BatchEmbedder(client, batch_size=batch_size, max_workers=max_workers)
+    start = time.perf_counter()
+    vectors = embedder.embed(texts)
+    return time.perf_counter() - start, vectors, embedder
+
+
+if __name__ == "__main__":
+    # progress.json 등 산출물이 작업 폴더를 덮어쓰지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp())
+    texts = make_texts(N_TEXTS)
+
+    with EmbeddingStubServer(latency=0.01, per_input_latency=0.0001) as stub:
+        client = OpenAI(api_key='stub', base_url=stub.base_url, max_retries=0)
+        serial_time, serial = run_sequential(client, texts)
+        print(f"순차 (요청 {stub.request_count}회): {serial_time:.2f}s")
+        for batch_size, workers in ((64, 1), (256, 1), (256, 4), (1024, 4)):
+            before = stub.request_count
+            elapsed, vectors, _ = run_batched(client, texts, batch_size, workers)
+            print(f"batch={batch_size:>4} workers={workers}: {elapsed:.2f}s (요청 {stub.request_count - before}회, "
+                  f"x{serial_time / elapsed:.1f}), 결과 동일: {vectors == serial}")
+
+    # 일시적인 오류 + 거부되는 입력이 섞여도 나머지는 모두 임베딩되는지 확인
+    texts_with_bad = list(texts)
+    texts_with_bad[10] = f"{FAIL_MARKER} 잘못된 입력"
+    with EmbeddingStubServer(failures={500: 2}) as stub:
+        client = OpenAI(api_key='stub', base_url=stub.base_url, max_retries=0)
+        elapsed, vectors, embedder = run_batched(client, texts_with_bad, 256, 4)
+        ok = sum(v is not None for v in vectors)
+        print(f"오류 주입: {elapsed:.2f}s, 성공 {ok}/{len(vectors)}건, 실패 묶음 {embedder.failed_batches}개, "
+              f"실패 항목 {embedder.failed_items}개, None 위치: {[i for i, v in enumerate(vectors) if v is None]}")
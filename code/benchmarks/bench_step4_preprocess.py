@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Step4 전처리: 형태소 분석 두 번(문자열로 이어붙인 뒤 다시 분석) vs PatentPreprocessor 한 번
+
+    cd code && python benchmarks/bench_step4_preprocess.py
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from korean_tokenizer import KoreanTokenizer
+from patent_preprocessor import PatentPreprocessor, wordnet_pos_tags_kor
+from phrase_matcher import PhraseMatcher, load_phrases
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+N_DOCS = 1000
+SENTENCES = [
+    "본 발명은 자율주행 로봇이 물류 창고 내에서 장애물을 회피하며 이동하는 방법에 관한 것이다.",
+    "상기 로봇은 rgb-d 카메라와 LiDAR 센서를 이용하여 주변 지도를 생성하고 위치를 추정한다.",
+    "서버는 라스트 마일 배송을 위해 복수의 AGV에게 작업을 할당하고 경로를 계획한다.",
+    "콜드 체인 물류에서 정온 물류 상태를 블록체인에 기록하여 디지털 트윈으로 관리한다.",
+    "학습된 AI 모델을 이용하여 인바운드 상자의 종류를 인식하고 아웃바운드 구역으로 분류한다.",
+]
+
+
+def two_pass(docs, preprocessor, tokenizer):
+    """기존 Step4: 1차 분석 결과를 문자열로 이어붙이고, 품사를 얻으려고 다시 분석"""
+    prepared = [preprocessor.prepare(doc) for doc in docs]
+    token_lists = tokenizer.morphs([item[0] if item else "" for item in prepared])
+    pre_docs = []
+    for item, tokens in zip(prepared, token_lists):
+        _, found_phrases, kept_eng = item
+        tokens = [t for t in tokens if t not in preprocessor.stop_words]
+        components = set(found_phrases)
+        tokens = [t for t in tokens if t not in components]
+        pre_docs.append(" ".join(tokens + found_phrases + kept_eng))
+
+    matcher = preprocessor.phrase_matcher
+    result = []
+    for text, tokens_with_pos in zip(pre_docs, tokenizer.pos(pre_docs)):
+        found_phrases = matcher.find_glued(text)
+        lem = [token for token, tag in tokens_with_pos
+               if token.lower() in preprocessor.eng_keywords or token.lower() in matcher.glued
+               or wordnet_pos_tags_kor(tag)]
+        cleaned = [t for t in lem if not any(t.lower() in g for g in found_phrases)]
+        result.append(" ".join(cleaned + found_phrases).strip())
+    return result
+
+
+if __name__ == "__main__":
+    with open(os.path.join(DATA_DIR, 'stopwords.txt'), encoding='utf-8') as f:
+        stop_words = set(f.read().splitlines())
+    with open(os.path.join(DATA_DIR, 'eng_data.txt'), encoding='utf-8') as f:
+        eng_keywords = set(line.strip().lower() for line in f if line.strip())
+    matcher = PhraseMatcher(load_phrases(os.path.join(DATA_DIR, 'phrase_data.txt')))
+
+    rng = random.Random(0)
+    docs = [" ".join(rng.choices(SENTENCES, k=6)) for _ in range(N_DOCS)]
+
+    with KoreanTokenizer() as tokenizer:
+        preprocessor = PatentPreprocessor(stop_words, eng_keywords, matcher, tokenizer)
+
+        start = time.perf_counter()
+        old = two_pass(docs, preprocessor, tokenizer)
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = preprocessor.lemmatize(docs)
+        new_time = time.perf_counter() - start
+
+    same_bag = sum(Counter(a.split()) == Counter(b.split()) for a, b in zip(old, new))
+    old_vocab = set(" ".join(old).split())
+    new_vocab = set(" ".join(new).split())
+    print(f"문서 {N_DOCS}개: 두 번 분석 {old_time:.2f}s, 한 번 분석 {new_time:.2f}s (x{old_time / new_time:.1f})")
+    print(f"토큰 구성이 같은 문서: {same_bag}/{N_DOCS}, 어휘 자카드 유사도: "
+          f"{len(old_vocab & new_vocab) / len(old_vocab | new_vocab):.2f}")
+    print(f"두 번 분석에만 있는 어휘 예: {sorted(old_vocab - new_vocab)[:10]}")
+    print(f"한 번 분석에만 있는 어휘 예: {sorted(new_vocab - old_vocab)[:10]}")
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Step4_1 → Step4_2 토픽 분포 전달: 밀집 확률 CSV(문서 텍스트 포함) vs 문서 ID별 상위 k개 float32 Arrow
+- 파일 크기, 쓰기 시간, Step4_2_GTM이 GTM 입력 행렬을 만들기까지의 읽기 시간
+- 읽은 GTM 입력에서 대표 토픽이 원래 확률의 최댓값 토픽과 같은지
+
+    cd code && python benchmarks/bench_topic_distribution.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_distribution import TOP_K, TopicDistribution, write_topic_distribution
+
+SEED = 42
+N_DOCS = 50000
+N_TOPICS = 60
+DOC_LENGTH = 1500     # 초록 + 명칭 전처리 텍스트 길이 (문자)
+
+
+def make_results():
+    rng = np.random.default_rng(SEED)
+    # HDBSCAN 소프트 군집 확률처럼 소수 토픽에 몰린 분포
+    probabilities = rng.dirichlet(np.full(N_TOPICS, 0.05), size=N_DOCS)
+    topics = probabilities.argmax(axis=1)
+    topics[rng.random(N_DOCS) < 0.1] = -1
+    doc_ids = [f"10-2020-{i:07d}" for i in range(N_DOCS)]
+    docs = ["특허 " * (DOC_LENGTH // 3)] * N_DOCS
+    return doc_ids, docs, topics, probabilities
+
+
+def write_csv(path, docs, topics, probabilities):
+    prob_df = pd.DataFrame(probabilities, columns=[f"Topic_{i}" for i in range(N_TOPICS)])
+    prob_df.insert(0, "Document", docs)
+    prob_df["Dominant_Topic"] = topics
+    prob_df.to_csv(path, index=False)
+
+
+def read_csv(path):
+    data_full = pd.read_csv(path)
+    data_filtered = data_full[data_full["Dominant_Topic"] != -1].copy().reset_index(drop=True)
+    prob_cols = [col for col in data_filtered.columns if col.startswith("Topic_")]
+    return data_filtered["Dominant_Topic"].values, data_filtered[prob_cols].values
+
+
+def read_arrow(path):
+    distribution = TopicDistribution(path)
+    keep = distribution.dominant_topic != -1
+    return distribution.dominant_topic[keep], distribution.dense(keep)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    doc_ids, docs, topics, probabilities = make_results()
+    kept = topics != -1
+    expected = probabilities[kept].argmax(axis=1)
+
+    t_write_csv, _ = timed(write_csv, "dist.csv", docs, topics, probabilities)
+    t_read_csv, (_, csv_matrix) = timed(read_csv, "dist.csv")
+    t_write_arrow, _ = timed(write_topic_distribution, doc_ids, topics, probabilities, "dist.arrow")
+    t_read_arrow, (_, arrow_matrix) = timed(read_arrow, "dist.arrow")
+
+    csv_mb = os.path.getsize("dist.csv") / 1024 ** 2
+    arrow_mb = os.path.getsize("dist.arrow") / 1024 ** 2
+    print(f"{N_DOCS}건 × {N_TOPICS}토픽 (상위 {TOP_K}개 저장)")
+    print(f"  CSV:   {csv_mb:.0f}MB, 쓰기 {t_write_csv:.2f}s, 읽기 {t_read_csv:.2f}s ({csv_matrix.dtype})")
+    print(f"  Arrow: {arrow_mb:.1f}MB, 쓰기 {t_write_arrow:.2f}s, 읽기 {t_read_arrow:.2f}s ({arrow_matrix.dtype})")
+    print(f"  대표 토픽 일치: {np.mean(arrow_matrix.argmax(axis=1) == expected):.1%}, "
+          f"상위 {TOP_K}개 밖으로 버린 확률 평균 {np.mean(1 - arrow_matrix.sum(axis=1)):.4f}")
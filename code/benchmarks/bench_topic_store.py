@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+학습한 BERTopic 결과 다시 쓰기: 매번 다시 학습 vs topic_model_store에 저장 후 불러오기
+(불러온 토픽/확률/c-TF-IDF가 학습 결과와 같은지도 확인)
+
+    cd code && python benchmarks/bench_topic_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bertopic import BERTopic
+from bertopic.vectorizers import ClassTfidfTransformer
+from hdbscan import HDBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.feature_extraction.text import CountVectorizer
+from umap import UMAP
+
+from topic_model_store import save_topic_model, load_topic_run, docs_fingerprint
+
+warnings.filterwarnings('ignore')
+SEED = 42
+N_DOCS = 3000
+N_TOPICS = 8
+N_LOADS = 20
+
+
+def make_corpus():
+    embeddings, labels = make_blobs(n_samples=N_DOCS, n_features=768, centers=N_TOPICS, cluster_std=8.0,
+                                    random_state=SEED)
+    rng = np.random.default_rng(SEED)
+    own = [[f"토픽{t}단어{i}" for i in range(20)] for t in range(N_TOPICS)]
+    common = [f"공통단어{i}" for i in range(200)]
+    docs = [" ".join(list(rng.choice(own[label], 8)) + list(rng.choice(common, 10))) for label in labels]
+    return docs, embeddings.astype(np.float32)
+
+
+def fit(docs, embeddings):
+    topic_model = BERTopic(
+        language="korean", calculate_probabilities=True, nr_topics=6, top_n_words=15,
+        vectorizer_model=CountVectorizer(token_pattern=r"(?u)\b\w[\w_]+\b"),
+        umap_model=UMAP(n_neighbors=10, n_components=7, min_dist=0.01, metric='cosine', random_state=SEED),
+        hdbscan_model=HDBSCAN(min_cluster_size=40, min_samples=2, prediction_data=True),
+        ctfidf_model=ClassTfidfTransformer(bm25_weighting=True),
+    )
+    topics, probabilities = topic_model.fit_transform(docs, embeddings=embeddings)
+    return topic_model, topics, probabilities
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    docs, embeddings = make_corpus()
+
+    # numba JIT 컴파일 시간을 빼기 위해 한 번 미리 실행
+    fit(docs[:300], embeddings[:300])
+
+    start = time.perf_counter()
+    topic_model, topics, probabilities = fit(docs, embeddings)
+    t_fit = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run_id = save_topic_model(topic_model, topics, probabilities, fingerprint=docs_fingerprint(docs))
+    t_save = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk("topic_models") for name in names)
+
+    start = time.perf_counter()
+    for _ in range(N_LOADS):
+        run = load_topic_run(fingerprint=docs_fingerprint(docs))
+        topics_dict = run.topics_dict()
+        loaded_probabilities = run.probabilities
+    t_load = (time.perf_counter() - start) / N_LOADS
+
+    expected = {topic: [word for word, _ in topic_model.get_topic(topic)]
+                for topic in topic_model.get_topics() if topic != -1}
+    same = (
+        topics_dict == expected
+        and np.array_equal(run.topics, topics)
+        and np.allclose(loaded_probabilities, probabilities)
+        and abs(run.c_tf_idf - topic_model.c_tf_idf_).max() < 1e-6
+        and np.allclose(run.topic_embeddings, topic_model.topic_embeddings_, atol=1e-6)
+    )
+    print(f"{N_DOCS}건, 토픽 {len(expected)}개: 다시 학습 {t_fit:.1f}s, 저장 {t_save * 1000:.0f}ms "
+          f"({size / 1024:.0f}KB), 불러오기(토픽 단어 + 확률) {t_load * 1000:.1f}ms, 결과 일치: {same}")
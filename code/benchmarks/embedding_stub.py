@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+OpenAI /v1/embeddings 응답을 흉내내는 로컬 HTTP 서버 (벤치마크용)
+
+    python benchmarks/embedding_stub.py --port 8766 --latency 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=stub python main.py
+"""
+import argparse
+import hashlib
+import json
+import struct
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DIMENSIONS = 64
+# 이 문자열이 들어간 입력은 400으로 거부 (항목별 fallback 확인용)
+FAIL_MARKER = '__fail__'
+
+
+def make_vector(text, dimensions=DIMENSIONS):
+    """텍스트로 결정되는 가짜 임베딩 벡터 (-1 ~ 1)"""
+    values = []
+    counter = 0
+    while len(values) < dimensions:
+        digest = hashlib.sha256(f"{counter}:{text}".encode('utf-8')).digest()
+        values.extend(v / 2**31 - 1.0 for v in struct.unpack('<8I', digest))
+        counter += 1
+    return values[:dimensions]
+
+
+class EmbeddingStubServer:
+    """
+    입력 텍스트 해시로 만든 벡터를 돌려주는 로컬 서버
+
+    Args:
+        latency (float): 요청마다 넣을 인위적인 지연(초)
+        per_input_latency (float): 입력 하나당 추가 지연(초)
+        failures (dict): {상태코드: 횟수} - 처음 몇 번의 요청을 해당 상태코드로 실패시킴
+    """
+    def __init__(self, port=0, latency=0.0, per_input_latency=0.0, failures=None, dimensions=DIMENSIONS):
+        self.latency = latency
+        self.per_input_latency = per_input_latency
+        self.dimensions = dimensions
+        self.failures = []
+        for status, count in (failures or {}).items():
+            self.failures.extend([status] * count)
+        self.request_count = 0
+        self.input_count = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                inputs = payload.get('input', [])
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                with server._lock:
+                    server.request_count += 1
+                    server.input_count += len(inputs)
+                    fail_status = server.failures.pop(0) if server.failures else None
+                delay = server.latency + server.per_input_latency * len(inputs)
+                if delay:
+                    time.sleep(delay)
+
+                if fail_status is None and any(FAIL_MARKER in text for text in inputs):
+                    fail_status = 400
+                if fail_status:
+                    status = fail_status
+                    body = {'error': {'message': 'stub failure', 'type': 'invalid_request_error'}}
+                else:
+                    status = 200
+                    body = {
+                        'object': 'list',
+                        'data': [
+                            {'object': 'embedding', 'index': i, 'embedding': make_vector(text, server.dimensions)}
+                            for i, text in enumerate(inputs)
+                        ],
+                        'model': payload.get('model', ''),
+                        'usage': {'prompt_tokens': 0, 'total_tokens': 0},
+                    }
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    with EmbeddingStubServer(port=args.port, latency=args.latency) as stub:
+        print(f"임베딩 stub 실행 중: {stub.base_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
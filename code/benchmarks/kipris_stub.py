@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+KIPRIS getWordSearch 응답을 흉내내는 로컬 HTTP 서버 (벤치마크용)
+
+    python benchmarks/kipris_stub.py --port 8765 --latency 0.2
+"""
+import argparse
+import zlib
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+STATUSES = ['등록', '공개', '거절', '소멸']
+
+
+def make_item(keyword, page, idx):
+    """검색어/페이지/순번으로 결정되는 가짜 특허 item XML"""
+    number = f"10{zlib.crc32(f'{keyword}-{page}-{idx}'.encode()) % 10**11:011d}"
+    fields = {
+        'applicantName': '주식회사 테스트',
+        'applicationDate': f"20{10 + idx % 15:02d}0{1 + idx % 9}15",
+        'applicationNumber': number,
+        'astrtCont': f"본 발명은 {keyword}에 관한 것이다. " * 20,
+        'bigDrawing': 'http://example.com/big.jpg',
+        'drawing': 'http://example.com/small.jpg',
+        'indexNo': str(idx),
+        'inventionTitle': f"{keyword} 장치 및 방법 {page}-{idx}",
+        'ipcNumber': 'G05D 1/02',
+        'openDate': f"20{11 + idx % 14:02d}0{1 + idx % 9}20",
+        'openNumber': number,
+        'publicationDate': '',
+        'publicationNumber': '',
+        'registerDate': '',
+        'registerNumber': '',
+        'registerStatus': STATUSES[idx % len(STATUSES)],
+    }
+    body = ''.join(f"<{k}>{escape(v)}</{k}>" for k, v in fields.items())
+    return f"<item>{body}</item>"
+
+
+def make_page(keyword, page, rows):
+    items = ''.join(make_item(keyword, page, i) for i in range(rows))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>'
+        f'<body><items>{items}</items><numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo>'
+        f'<totalCount>{rows}</totalCount></body></response>'
+    ).encode('utf-8')
+
+
+class KiprisStubServer:
+    """
+    canned XML을 돌려주는 로컬 서버
+
+    Args:
+        latency (float): 응답마다 넣을 인위적인 지연(초)
+        failures (dict): {상태코드: 횟수} - 처음 몇 번의 요청을 해당 상태코드로 실패시킴
+    """
+    def __init__(self, port=0, latency=0.0, failures=None):
+        self.latency = latency
+        self.failures = []
+        for status, count in (failures or {}).items():
+            self.failures.extend([status] * count)
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._cache = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                    fail_status = server.failures.pop(0) if server.failures else None
+                if server.latency:
+                    time.sleep(server.latency)
+                if fail_status:
+                    body = b'error'
+                    self.send_response(fail_status)
+                else:
+                    query = parse_qs(urlparse(self.path).query)
+                    keyword = query.get('word', [''])[0]
+                    page = int(query.get('page', ['1'])[0])
+                    rows = int(query.get('numOfRows', ['10'])[0])
+                    key = (keyword, page, rows)
+                    if key not in server._cache:
+                        server._cache[key] = make_page(keyword, page, rows)
+                    body = server._cache[key]
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/getWordSearch"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2)
+    args = parser.parse_args()
+
+    with KiprisStubServer(port=args.port, latency=args.latency) as stub:
+        print(f"KIPRIS stub 실행 중: {stub.url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import sqlite3
+
+CORPUS_CACHE_PATH = './corpus_cache.db'
+
+# Step4 전처리에 쓰는 사전 파일 (내용이 바뀌면 캐시 전체가 무효화됨)
+DICTIONARY_PATHS = ['data/stopwords.txt', 'data/eng_data.txt', 'data/phrase_data.txt']
+
+# SQLite 한 쿼리에 넣을 최대 파라미터 수
+QUERY_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key     TEXT PRIMARY KEY,   -- sha256(fingerprint + 원문)
+    fingerprint TEXT NOT NULL,      -- 사전 파일 + 분석기 버전 해시
+    lemmatized  TEXT NOT NULL       -- 전처리 결과 (표제어를 공백으로 이은 문자열)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_fingerprint ON documents(fingerprint);
+"""
+
+
+def corpus_fingerprint(analyzer_version, preprocessor_version, dictionary_paths=DICTIONARY_PATHS):
+    """
+    전처리 결과에 영향을 주는 모든 것(사전 파일 내용, 분석기/전처리 버전)의 해시
+
+    Args:
+        analyzer_version (str): 형태소 분석기 이름과 버전 (KoreanTokenizer.version)
+        preprocessor_version (int): 전처리 로직 버전 (patent_preprocessor.PREPROCESSOR_VERSION)
+        dictionary_paths (list[str]): 사전 파일 경로
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{analyzer_version}\0{preprocessor_version}\0".encode('utf-8'))
+    for path in dictionary_paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+class CorpusCache:
+    """
+    Step4 전처리(표제어) 결과를 문서 단위로 저장하는 캐시 (SQLite)
+    - 키는 (사전·분석기 fingerprint, 원문) 해시 → 원문이 바뀐 문서만 다시 전처리
+    - 사전 파일을 수정하거나 분석기/전처리 버전이 바뀌면 fingerprint가 달라져서 자동으로 전부 다시 전처리
+      (이전 fingerprint의 결과는 열 때 삭제)
+
+    Args:
+        fingerprint (str): corpus_fingerprint 결과
+        db_path (str): SQLite 파일 경로
+    """
+    def __init__(self, fingerprint, db_path=CORPUS_CACHE_PATH):
+        self.fingerprint = fingerprint
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute("DELETE FROM documents WHERE fingerprint != ?", (fingerprint,))
+        self.hits = 0
+        self.misses = 0
+
+    def _doc_key(self, text):
+        return hashlib.sha256(f"{self.fingerprint}\0{text}".encode('utf-8')).hexdigest()
+
+    def _lookup(self, keys):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), QUERY_CHUNK):
+            chunk = unique[start:start + QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f"SELECT doc_key, lemmatized FROM documents WHERE doc_key IN ({placeholders})", chunk
+            ).fetchall())
+        return found
+
+    def lemmatize(self, summaries, lemmatize_fn):
+        """
+        캐시에 없는 문서만 lemmatize_fn으로 전처리하고 결과를 합쳐서 반환
+
+        Args:
+            summaries (list[str]): 특허 요약문 (문자열이 아니면 "" 결과)
+            lemmatize_fn (callable): 요약문 리스트 → 전처리 결과 리스트 (PatentPreprocessor.lemmatize)
+
+        Returns:
+            list[str]: 입력과 같은 순서의 전처리 결과
+        """
+        summaries = list(summaries)
+        results = [""] * len(summaries)
+        keys = {i: self._doc_key(text) for i, text in enumerate(summaries) if isinstance(text, str)}
+        found = self._lookup(list(keys.values()))
+
+        missing = []
+        for i, key in keys.items():
+            if key in found:
+                results[i] = found[key]
+            else:
+                missing.append(i)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            # 같은 원문이 여러 번 있으면 한 번만 전처리
+            unique_missing = list(dict.fromkeys(summaries[i] for i in missing))
+            processed = dict(zip(unique_missing, lemmatize_fn(unique_missing)))
+            for i in missing:
+                results[i] = processed[summaries[i]]
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO documents (doc_key, fingerprint, lemmatized) VALUES (?, ?, ?)",
+                    [(self._doc_key(text), self.fingerprint, lemmatized) for text, lemmatized in processed.items()]
+                )
+        return results
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
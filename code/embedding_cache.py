@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+import numpy as np
+
+CACHE_DIR = './embedding_cache'
+
+# 모델 하나당 벡터 파일 최대 크기 (넘으면 가장 오래 안 쓴 벡터부터 제거)
+MAX_CACHE_BYTES = 1024 ** 3
+
+# 벡터 파일을 늘릴 때 최소 단위 (행 수)
+MIN_CAPACITY = 1024
+
+# SQLite 한 쿼리에 넣을 최대 파라미터 수
+QUERY_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    text_hash TEXT PRIMARY KEY,   -- 텍스트 sha256
+    row       INTEGER NOT NULL UNIQUE,  -- vectors.f32 안의 행 번호
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used);
+CREATE TABLE IF NOT EXISTS free_rows (
+    row INTEGER PRIMARY KEY         -- 제거된 벡터가 쓰던 행 (재사용)
+);
+"""
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _model_dir_name(model_name):
+    # 'snunlp/KR-SBERT-V40K-klueNLI-augSTS' → 'snunlp__KR-SBERT-V40K-klueNLI-augSTS'
+    return re.sub(r'[^0-9A-Za-z._-]+', '__', model_name)
+
+
+class EmbeddingCache:
+    """
+    (모델 이름, 텍스트 해시)를 키로 하는 디스크 임베딩 캐시
+    - 벡터는 모델별 float32 memmap 파일(vectors.f32)에, 해시 → 행 번호는 SQLite(index.db)에 저장
+    - 벡터 파일이 max_bytes를 넘으면 가장 오래 사용하지 않은 벡터부터 제거하고 그 행을 재사용
+    - 같은 텍스트는 한 번만 임베딩되므로, 같은/겹치는 키워드로 다시 실행하면 새 문서만 임베딩
+
+    Args:
+        model_name (str): 임베딩 모델 이름 (모델이 다르면 다른 캐시)
+        cache_dir (str): 캐시 폴더
+        max_bytes (int): 모델당 벡터 파일 최대 크기
+    """
+    def __init__(self, model_name, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(cache_dir, _model_dir_name(model_name))
+        os.makedirs(self.directory, exist_ok=True)
+        self.vectors_path = os.path.join(self.directory, 'vectors.f32')
+        self.conn = sqlite3.connect(os.path.join(self.directory, 'index.db'))
+        self.conn.executescript(SCHEMA)
+        self.dimensions = self._get_meta('dimensions', int)
+        self.next_row = self._get_meta('next_row', int) or 0
+        self._vectors = None
+        self.hits = 0
+        self.misses = 0
+
+    # ─── meta ──────────────────────────────────────────────────────────────
+    def _get_meta(self, name, cast=str):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return cast(row[0]) if row else None
+
+    def _set_meta(self, name, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, str(value)))
+
+    @property
+    def max_entries(self):
+        return max(1, self.max_bytes // (self.dimensions * 4)) if self.dimensions else 0
+
+    # ─── 벡터 파일 ─────────────────────────────────────────────────────────
+    def _capacity(self):
+        if not self.dimensions or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.dimensions * 4)
+
+    def _open_vectors(self):
+        if self._vectors is None and self._capacity() > 0:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                      shape=(self._capacity(), self.dimensions))
+        return self._vectors
+
+    def _ensure_capacity(self, rows):
+        capacity = self._capacity()
+        if rows <= capacity:
+            return
+        new_capacity = min(max(rows, capacity * 2, MIN_CAPACITY), max(rows, self.max_entries))
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(new_capacity * self.dimensions * 4)
+
+    def _reset(self, dimensions):
+        """차원이 바뀐 경우(같은 이름의 다른 모델 등) 캐시를 비우고 새로 시작"""
+        self._vectors = None
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM free_rows")
+            self._set_meta('dimensions', dimensions)
+            self._set_meta('next_row', 0)
+        if os.path.exists(self.vectors_path):
+            os.remove(self.vectors_path)
+        self.dimensions = dimensions
+        self.next_row = 0
+
+    # ─── 조회/저장 ─────────────────────────────────────────────────────────
+    def _lookup_rows(self, hashes):
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique), QUERY_CHUNK):
+            chunk = unique[start:start + QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f"SELECT text_hash, row FROM entries WHERE text_hash IN ({placeholders})", chunk
+            ).fetchall())
+        return found
+
+    def get_many(self, texts):
+        """
+        캐시에 있는 임베딩 조회
+
+        Returns:
+            (ndarray[n, d] float32 | None, list[int]): 찾은 벡터를 채운 행렬(없는 행은 0)과 캐시에 없는 인덱스
+        """
+        texts = list(texts)
+        if not self.dimensions:
+            return None, list(range(len(texts)))
+        hashes = [text_hash(text) for text in texts]
+        found = self._lookup_rows(hashes)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        hit_idx = [i for i, h in enumerate(hashes) if h in found]
+        missing = [i for i, h in enumerate(hashes) if h not in found]
+        if hit_idx:
+            vectors = self._open_vectors()
+            matrix[hit_idx] = vectors[[found[hashes[i]] for i in hit_idx]]
+            now = time.time()
+            with self.conn:
+                self.conn.executemany("UPDATE entries SET last_used = ? WHERE text_hash = ?",
+                                      [(now, h) for h in {hashes[i] for i in hit_idx}])
+        return matrix, missing
+
+    def put_many(self, texts, vectors):
+        """임베딩 저장 (vectors: [n, d] 행렬 또는 벡터 리스트)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) == 0:
+            return
+        if self.dimensions != vectors.shape[1]:
+            self._reset(vectors.shape[1])
+
+        # 같은 텍스트가 여러 번 있으면 한 번만 저장
+        items = {}
+        for text, vector in zip(texts, vectors):
+            items[text_hash(text)] = vector
+        existing = self._lookup_rows(list(items))
+        new_hashes = [h for h in items if h not in existing]
+        # 캐시보다 많이 넣으면 뒤쪽(최근) 것만 남김
+        new_hashes = new_hashes[-self.max_entries:]
+
+        now = time.time()
+        if not new_hashes:
+            with self.conn:
+                self.conn.executemany("UPDATE entries SET last_used = ? WHERE text_hash = ?",
+                                      [(now, h) for h in existing])
+            return
+
+        with self.conn:
+            self._evict(len(new_hashes))
+            free = [r for (r,) in self.conn.execute("SELECT row FROM free_rows ORDER BY row LIMIT ?",
+                                                      (len(new_hashes),))]
+            self.conn.executemany("DELETE FROM free_rows WHERE row = ?", [(r,) for r in free])
+            rows = free + list(range(self.next_row, self.next_row + len(new_hashes) - len(free)))
+            self.next_row += len(new_hashes) - len(free)
+            self._set_meta('next_row', self.next_row)
+            self._ensure_capacity(self.next_row)
+
+            vectors_file = self._open_vectors()
+            vectors_file[rows] = np.stack([items[h] for h in new_hashes])
+            vectors_file.flush()
+            self.conn.executemany(
+                "INSERT INTO entries (text_hash, row, last_used) VALUES (?, ?, ?)",
+                [(h, row, now) for h, row in zip(new_hashes, rows)]
+            )
+            self.conn.executemany("UPDATE entries SET last_used = ? WHERE text_hash = ?",
+                                  [(now, h) for h in existing])
+
+    def _evict(self, incoming):
+        """새 벡터 incoming개가 들어갈 자리를 만들기 위해 가장 오래 안 쓴 벡터 제거"""
+        overflow = self.count() + incoming - self.max_entries
+        if overflow <= 0:
+            return
+        victims = self.conn.execute(
+            "SELECT text_hash, row FROM entries ORDER BY last_used LIMIT ?", (overflow,)
+        ).fetchall()
+        self.conn.executemany("DELETE FROM entries WHERE text_hash = ?", [(h,) for h, _ in victims])
+        self.conn.executemany("INSERT OR IGNORE INTO free_rows (row) VALUES (?)", [(r,) for _, r in victims])
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def embed(self, texts, embed_fn):
+        """
+        캐시에 없는 텍스트만 embed_fn으로 임베딩하고 결과를 합쳐서 반환
+
+        Args:
+            texts (list[str]): 임베딩할 텍스트
+            embed_fn (callable): 텍스트 리스트 → float32 행렬, 또는 (행렬, 유효한 행 마스크)
+
+        Returns:
+            (ndarray[n, d] float32, ndarray[n] bool): 임베딩 행렬과 유효한 행 마스크
+        """
+        texts = list(texts)
+        matrix, missing = self.get_many(texts)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        valid = np.ones(len(texts), dtype=bool)
+        if not missing:
+            return matrix, valid
+
+        result = embed_fn([texts[i] for i in missing])
+        new_vectors, new_valid = result if isinstance(result, tuple) else (result, None)
+        new_vectors = np.asarray(new_vectors, dtype=np.float32)
+        if new_valid is None:
+            new_valid = np.ones(len(missing), dtype=bool)
+
+        if matrix is not None and not (new_vectors.shape[1] > 0 and new_valid.any()):
+            # 새 임베딩이 전부 실패(차원 0 행렬): 캐시는 그대로 두고 캐시된 행만 유효로 반환
+            valid[missing] = False
+            return matrix, valid
+        if matrix is not None and matrix.shape[1] != new_vectors.shape[1]:
+            # 캐시와 차원이 다른 모델: 캐시를 비우고 전부 다시 임베딩
+            self._reset(new_vectors.shape[1])
+            return self.embed(texts, embed_fn)
+        if matrix is None:
+            # 처음 실행(캐시 비어있음): 새 임베딩 차원으로 행렬 생성
+            matrix = np.zeros((len(texts), new_vectors.shape[1]), dtype=np.float32)
+        matrix[missing] = new_vectors
+        valid[missing] = new_valid
+
+        # 임베딩에 실패한 텍스트는 캐시하지 않음 (다음 실행에서 다시 시도)
+        keep = np.flatnonzero(new_valid)
+        if len(keep) and new_vectors.shape[1] > 0:
+            self.put_many([texts[missing[i]] for i in keep], new_vectors[keep])
+        return matrix, valid
+
+    def close(self):
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from kipris_client import HostRateLimiter
+
+# OpenAI 임베딩 API 한도: 요청당 입력 2048개, 입력당 8192 토큰, 요청당 합계 300k 토큰
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_INPUT_CHARS = 8000
+# 한국어는 대략 글자 하나가 토큰 하나 이상이므로 글자 수로 보수적으로 묶음
+MAX_BATCH_CHARS = 200000
+
+
+def make_batches(texts, batch_size, max_batch_chars=MAX_BATCH_CHARS):
+    """
+    (원래 인덱스, 텍스트) 묶음 리스트 생성. 빈 텍스트는 API가 거부하므로 제외
+
+    Returns:
+        list[list[tuple[int, str]]]
+    """
+    batches = []
+    current, current_chars = [], 0
+    for idx, text in enumerate(texts):
+        if not isinstance(text, str) or not text.strip():
+            continue
+        text = text[:MAX_INPUT_CHARS]
+        if current and (len(current) >= batch_size or current_chars + len(text) > max_batch_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append((idx, text))
+        current_chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BatchEmbedder:
+    """
+    OpenAI 임베딩을 여러 입력씩 묶어서 요청하는 클라이언트
+    - 묶음(batch)들은 스레드 풀로 동시에 보내되 초당 요청 수는 rate limiter로 제한
+    - 묶음 요청이 실패하면 그 묶음만 한 건씩 다시 요청하고, 그래도 실패한 항목은 None
+
+    Args:
+        client: openai.OpenAI 클라이언트 (base_url을 바꾸면 로컬 stub 서버도 사용 가능)
+        model (str): 임베딩 모델 이름
+        batch_size (int): 요청 하나에 담을 최대 입력 수 (최대 2048)
+        max_workers (int): 동시에 보낼 최대 요청 수
+        requests_per_second (float): 초당 요청 수 제한 (None이면 제한 없음)
+    """
+    def __init__(self, client, model="text-embedding-3-small", batch_size=256, max_workers=4,
+                 requests_per_second=None):
+        self.client = client
+        self.model = model
+        self.batch_size = max(1, min(int(batch_size), MAX_INPUTS_PER_REQUEST))
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.failed_batches = 0
+        self.failed_items = 0
+        # 실패 횟수는 여러 작업 스레드에서 올리므로 lock으로 보호
+        self._lock = threading.Lock()
+
+    def _request(self, inputs):
+        self.rate_limiter.wait(str(self.client.base_url))
+        response = self.client.embeddings.create(input=inputs, model=self.model)
+        # 응답 순서가 입력 순서와 다를 수 있으므로 index로 정렬
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _embed_batch(self, batch):
+        texts = [text for _, text in batch]
+        try:
+            return self._request(texts)
+        except Exception as e:
+            with self._lock:
+                self.failed_batches += 1
+            print(f"⚠️ 임베딩 묶음 요청 실패({len(texts)}건), 한 건씩 다시 시도합니다: {e}")
+
+        vectors = []
+        for text in texts:
+            try:
+                vectors.append(self._request([text])[0])
+            except Exception as e:
+                with self._lock:
+                    self.failed_items += 1
+                print(f"⚠️ 임베딩 실패: {e}")
+                vectors.append(None)
+        return vectors
+
+    def _iter_embedded(self, texts, progress_callback=None):
+        """묶음 순서대로 (원래 인덱스, 벡터 또는 None) 생성"""
+        batches = make_batches(texts, self.batch_size)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch, vectors in zip(batches, executor.map(self._embed_batch, batches)):
+                for (idx, _), vector in zip(batch, vectors):
+                    yield idx, vector
+                done += len(batch)
+                if progress_callback is not None:
+                    progress_callback(done, len(texts))
+
+    def embed(self, texts, progress_callback=None):
+        """
+        텍스트 리스트 임베딩 (입력과 같은 순서, 실패하거나 빈 텍스트는 None)
+
+        Args:
+            texts (list[str]): 임베딩할 텍스트
+            progress_callback (callable): (완료된 입력 수, 전체 입력 수)를 받는 함수
+        """
+        texts = list(texts)
+        embeddings = [None] * len(texts)
+        for idx, vector in self._iter_embedded(texts, progress_callback):
+            embeddings[idx] = vector
+        return embeddings
+
+    def embed_matrix(self, texts, progress_callback=None):
+        """
+        embed와 같지만 결과를 연속된 float32 행렬로 반환 (묶음이 도착할 때마다 채움)
+
+        Returns:
+            (ndarray[n, d] float32, ndarray[n] bool): 임베딩 행렬과 유효한 행 마스크 (실패한 행은 0 벡터)
+        """
+        texts = list(texts)
+        matrix = None
+        valid = np.zeros(len(texts), dtype=bool)
+        for idx, vector in self._iter_embedded(texts, progress_callback):
+            if vector is None:
+                continue
+            if matrix is None:
+                matrix = np.zeros((len(texts), len(vector)), dtype=np.float32)
+            matrix[idx] = vector
+            valid[idx] = True
+        if matrix is None:
+            matrix = np.zeros((len(texts), 0), dtype=np.float32)
+        return matrix, valid
+
+    def embed_one(self, text):
+        return self.embed([text])[0]
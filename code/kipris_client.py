@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+KIPRIS_URL = 'http://plus.kipris.or.kr/kipo-api/kipi/patUtiModInfoSearchSevice/getWordSearch'
+
+# 재시도할 HTTP 상태코드 (요청 과다 + 일시적인 서버 오류)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def iter_items(source, column_name_map=None):
+    """
+    KIPRIS 응답 XML을 스트리밍으로 파싱해서 item을 하나씩 특허 dict로 내보낸다.
+    처리한 item은 바로 트리에서 떼어내므로 페이지 크기와 무관하게 메모리가 일정하게 유지된다.
+
+    Args:
+        source: 읽기 가능한 파일 객체 (예: response.raw) 또는 파일 경로
+        column_name_map (dict): XML 태그 → 컬럼명 매핑 (없는 태그는 그대로 사용)
+    """
+    column_name_map = column_name_map or {}
+    parents = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag != 'item':
+            continue
+
+        patent_data = {}
+        for child in elem:
+            text = child.text.strip() if child.text else ''
+            patent_data[column_name_map.get(child.tag, child.tag)] = text
+
+        # 다 읽은 item은 부모(items)에서 제거해서 트리가 커지지 않게 함
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+        yield patent_data
+
+
+class HostRateLimiter:
+    """
+    호스트별 초당 요청 수를 제한하는 스레드 안전 리미터
+
+    Args:
+        requests_per_second (float): 호스트 하나당 허용할 초당 요청 수 (None 또는 0이면 제한 없음)
+    """
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RetryPolicy:
+    """
+    지수 백오프 + 지터 재시도 정책
+
+    Args:
+        max_retries (int): 첫 요청 이후 최대 재시도 횟수
+        backoff_factor (float): 첫 재시도 대기 시간(초), 이후 2배씩 증가
+        max_backoff (float): 대기 시간 상한(초)
+        jitter (float): 대기 시간에 더할 무작위 비율 (0.5 → 최대 50% 추가)
+        retry_statuses (tuple): 재시도할 HTTP 상태코드
+    """
+    def __init__(self, max_retries=5, backoff_factor=0.5, max_backoff=30.0, jitter=0.5,
+                 retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+
+    def delay(self, attempt, retry_after=None):
+        """attempt번째(0부터) 재시도 전 대기 시간. 서버가 Retry-After를 주면 그 이상 기다림"""
+        base = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if retry_after is not None:
+            base = max(base, min(retry_after, self.max_backoff))
+        return base + random.uniform(0, self.jitter * base)
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class KiprisClient:
+    """
+    KIPRIS API용 HTTP 클라이언트
+    - Session 하나로 keep-alive 연결을 재사용 (스레드 간 커넥션 풀 공유)
+    - 429/5xx, 연결 오류, 타임아웃은 RetryPolicy에 따라 재시도
+    - 요청마다 (연결, 읽기) 타임아웃 적용
+
+    Args:
+        url (str): 검색 API 주소
+        pool_size (int): 호스트당 유지할 최대 연결 수 (동시 요청 수 이상으로 설정)
+        timeout (tuple): (연결 타임아웃, 읽기 타임아웃) 초
+        retry_policy (RetryPolicy): 재시도 정책 (None이면 기본값)
+        requests_per_second (float): 호스트별 초당 요청 수 제한
+    """
+    def __init__(self, url=KIPRIS_URL, pool_size=8, timeout=(5, 30), retry_policy=None,
+                 requests_per_second=None):
+        self.url = url
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+
+        self.session = requests.Session()
+        # 재시도는 RetryPolicy에서 직접 처리하므로 urllib3 재시도는 끔
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+    def _send(self, params, stream):
+        """
+        요청 한 번
+
+        Returns:
+            (Response | None, str, float | None, bool): 200 응답(실패면 None), 실패 사유, Retry-After, 재시도 가능 여부
+        """
+        self.rate_limiter.wait(self.url)
+        try:
+            response = self.session.get(self.url, params=params, timeout=self.timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return None, f"연결 오류: {e.__class__.__name__}", None, True
+        if response.status_code == 200:
+            return response, None, None, True
+        retry_after = _retry_after_seconds(response)
+        response.close()
+        return (None, f"요청 실패: {response.status_code}", retry_after,
+                response.status_code in self.retry_policy.retry_statuses)
+
+    def _backoff(self, attempt, reason, retry_after=None):
+        """attempt번째 시도가 실패한 뒤 대기. 재시도 횟수를 다 썼으면 False"""
+        policy = self.retry_policy
+        if attempt == policy.max_retries:
+            print(f"{reason} (재시도 {policy.max_retries}회 모두 실패)")
+            return False
+        wait = policy.delay(attempt, retry_after)
+        print(f"{reason} → {wait:.1f}초 후 재시도 ({attempt + 1}/{policy.max_retries})")
+        time.sleep(wait)
+        return True
+
+    def get(self, params, stream=False):
+        """
+        재시도를 포함한 GET 요청. 최종적으로 성공하면 Response, 실패하면 None 반환
+        """
+        for attempt in range(self.retry_policy.max_retries + 1):
+            response, reason, retry_after, retryable = self._send(params, stream)
+            if response is not None:
+                return response
+            if not retryable:
+                print(reason)
+                return None
+            if not self._backoff(attempt, reason, retry_after):
+                return None
+        return None
+
+    def get_items(self, params, parse, on_item):
+        """
+        응답 본문을 스트리밍으로 파싱하면서 item을 하나씩 on_item에 넘김 (페이지 전체를 리스트로 모으지 않음)
+        본문을 받는 도중의 읽기 타임아웃/연결 끊김(urllib3 예외)도 같은 RetryPolicy 안의 한 번의 시도로 보고
+        다시 요청하며, 이미 넘긴 item은 건너뛰고 이어서 넘김
+
+        Args:
+            params (dict): 요청 파라미터
+            parse (callable): 응답 스트림 → item iterator (예: iter_items)
+            on_item (callable): item을 받는 함수. False를 반환하면 읽기를 멈춤
+
+        Returns:
+            int | None: 페이지를 끝까지 받았으면 넘긴 item 수, 실패하거나 중간에 멈췄으면 None
+        """
+        delivered = 0
+        for attempt in range(self.retry_policy.max_retries + 1):
+            response, reason, retry_after, retryable = self._send(params, stream=True)
+            if response is None:
+                if not retryable:
+                    print(reason)
+                    return None
+            else:
+                response.raw.decode_content = True
+                try:
+                    for position, item in enumerate(parse(response.raw)):
+                        if position < delivered:
+                            continue
+                        if on_item(item) is False:
+                            return None
+                        delivered += 1
+                    return delivered
+                except ET.ParseError as e:
+                    print(f"XML 파싱 실패: {e}")
+                    return None
+                except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+                    reason = f"응답 수신 실패: {e.__class__.__name__}"
+                finally:
+                    response.close()
+            if not self._backoff(attempt, reason, retry_after):
+                return None
+        return None
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Java 불필요한 한국어 NLP 라이브러리 우선 사용
+try:
+    from kiwipiepy import Kiwi
+    USE_KIWI = True
+except ImportError:
+    try:
+        from konlpy.tag import Okt
+        USE_KIWI = False
+    except ImportError:
+        USE_KIWI = None
+
+# 프로세스 풀 작업 하나에 묶어 보낼 문서 수 (Okt)
+CHUNK_SIZE = 32
+
+# 워커 프로세스마다 한 번만 만드는 Okt 인스턴스
+_okt = None
+
+
+def _init_okt():
+    global _okt
+    _okt = Okt()
+
+
+def _okt_morphs(text):
+    return _okt.morphs(text, stem=True)
+
+
+def _okt_pos(text):
+    return _okt.pos(text, stem=True)
+
+
+class KoreanTokenizer:
+    """
+    여러 문서를 한 번에 형태소 분석하는 토크나이저 (결과 순서 = 입력 순서)
+    - Kiwi: Kiwi 자체의 멀티스레드 배치 API 사용 (num_workers개 스레드)
+    - Okt: 문서를 프로세스 풀에 나눠 보내고, 워커마다 Okt를 한 번만 초기화
+
+    Args:
+        num_workers (int): 동시에 분석할 스레드/프로세스 수 (None이면 CPU 코어 수)
+    """
+    def __init__(self, num_workers=None):
+        if USE_KIWI is None:
+            raise RuntimeError("한국어 형태소 분석기가 없습니다. kiwipiepy 또는 konlpy를 설치하세요.")
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.backend = 'kiwi' if USE_KIWI else 'okt'
+        self._kiwi = None
+        self._pool = None
+        if not USE_KIWI:
+            # 메인 프로세스에서도 한 번 만들어서 Java 환경 문제를 바로 확인
+            Okt()
+
+    @property
+    def version(self):
+        """분석 결과에 영향을 주는 분석기 이름과 버전 (전처리 캐시 키에 사용)"""
+        if self.backend == 'kiwi':
+            import kiwipiepy
+            return f"kiwi-{kiwipiepy.__version__}"
+        import konlpy
+        return f"okt-{konlpy.__version__}"
+
+    def _get_kiwi(self):
+        # 모델 로딩에 시간이 걸리므로 실제로 분석할 때 한 번만 생성
+        # num_workers=0(단일 스레드 모드)에서는 배치 API를 쓸 수 없으므로 최소 1
+        if self._kiwi is None:
+            self._kiwi = Kiwi(num_workers=self.num_workers)
+        return self._kiwi
+
+    def _okt_map(self, fn, texts):
+        if self.num_workers <= 1:
+            if _okt is None:
+                _init_okt()
+            return [fn(text) for text in texts]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.num_workers, initializer=_init_okt)
+        return list(self._pool.map(fn, texts, chunksize=CHUNK_SIZE))
+
+    def _kiwi_tokenize(self, texts):
+        if not texts:
+            return []
+        return list(self._get_kiwi().tokenize(texts))
+
+    def morphs(self, texts):
+        """
+        Returns:
+            list[list[str]]: 문서별 형태소 리스트
+        """
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        if self.backend == 'kiwi':
+            return [[token.form for token in tokens] for tokens in self._kiwi_tokenize(texts)]
+        return self._okt_map(_okt_morphs, texts)
+
+    def pos(self, texts):
+        """
+        Returns:
+            list[list[tuple[str, str]]]: 문서별 (형태소, 품사) 리스트
+        """
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        if self.backend == 'kiwi':
+            return [[(token.form, token.tag) for token in tokens] for tokens in self._kiwi_tokenize(texts)]
+        return self._okt_map(_okt_pos, texts)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
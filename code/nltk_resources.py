@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+NLTK 리소스 준비 (실행 중에는 네트워크를 쓰지 않음)
+
+리소스가 필요한 경우 설치/배포 단계에서 한 번만 받아둠:
+
+    cd code && python nltk_resources.py punkt wordnet
+"""
+import os
+import sys
+import threading
+
+# 파이프라인이 실제로 사용하는 NLTK 리소스 (이름 → nltk.data 경로, 예: {'punkt': 'tokenizers/punkt'})
+# Step4의 한국어 분석은 Kiwi/Okt만 사용하므로 현재는 필요한 리소스가 없음
+# (이전에 매번 받던 punkt, wordnet, stopwords, averaged_perceptron_tagger는 어디서도 쓰이지 않음)
+REQUIRED_RESOURCES = {}
+
+NLTK_DATA_DIR = os.environ.get('NLTK_DATA', './nltk_data')
+
+# 프로세스당 한 번만 확인 (data_dir, 이름)
+_checked = set()
+_lock = threading.Lock()
+
+
+def ensure_nltk_resources(resources=None, data_dir=NLTK_DATA_DIR):
+    """
+    필요한 NLTK 리소스가 로컬에 있는지 확인 (다운로드하지 않음, 같은 리소스는 프로세스당 한 번만 확인)
+
+    Args:
+        resources (dict): 이름 → nltk.data 경로 (None이면 REQUIRED_RESOURCES)
+        data_dir (str): 리소스를 찾을 로컬 디렉터리 (nltk 기본 경로보다 먼저 찾음)
+
+    Raises:
+        RuntimeError: 리소스가 없을 때 (미리 받는 명령을 안내)
+    """
+    resources = REQUIRED_RESOURCES if resources is None else resources
+    with _lock:
+        pending = {name: path for name, path in resources.items() if (data_dir, name) not in _checked}
+        if not pending:
+            return
+
+        import nltk
+        if data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, data_dir)
+
+        missing = []
+        for name, path in pending.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                missing.append(name)
+            else:
+                _checked.add((data_dir, name))
+
+    if missing:
+        raise RuntimeError(
+            f"NLTK 리소스가 없습니다: {', '.join(missing)} "
+            f"(cd code && python nltk_resources.py {' '.join(missing)} 로 {data_dir}에 미리 받아두세요)"
+        )
+
+
+def download_nltk_resources(names, data_dir=NLTK_DATA_DIR):
+    """설치/배포 단계에서 리소스를 data_dir에 받음 (네트워크 사용)"""
+    import nltk
+    os.makedirs(data_dir, exist_ok=True)
+    for name in names:
+        if not nltk.download(name, download_dir=data_dir, quiet=True):
+            raise RuntimeError(f"NLTK 리소스 다운로드 실패: {name}")
+        print(f"✅ {name} → {data_dir}")
+
+
+if __name__ == "__main__":
+    download_nltk_resources(sys.argv[1:] or list(REQUIRED_RESOURCES))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import re
+
+# 전처리 로직을 바꾸면 올려서 corpus_cache의 이전 결과를 무효화
+PREPROCESSOR_VERSION = 1
+
+
+def wordnet_pos_tags_kor(treebank_tag):
+    """Converts POS tags from Korean treebank format to WordNet format."""
+    if treebank_tag.startswith('VA') or treebank_tag.startswith('VV'):
+        return 'v'  # verb
+    elif treebank_tag.startswith('N'):
+        return 'n'  # noun
+    elif treebank_tag.startswith('M'):
+        return 'r'  # adverb (관형사, 부사)
+    elif treebank_tag.startswith('XR') or treebank_tag.startswith('MM'):
+        return 'a'  # adjective (어근, 관형사)
+    else:
+        return 'n'  # default to noun
+
+
+class PatentPreprocessor:
+    """
+    특허 요약문 → 표제어 문서 변환 (형태소 분석은 문서당 한 번)
+    복합어 치환 → 한글만 남겨 (형태, 품사) 분석 → 불용어/복합어 하위 토큰/품사 필터 → 복합어·영어 키워드 재추가
+
+    Args:
+        stop_words (set): 불용어
+        eng_keywords (set): 남길 영어 키워드 (소문자)
+        phrase_matcher (PhraseMatcher): 복합 키워드 매처
+        tokenizer (KoreanTokenizer): 형태소 분석기
+    """
+    def __init__(self, stop_words, eng_keywords, phrase_matcher, tokenizer):
+        self.stop_words = stop_words
+        self.eng_keywords = eng_keywords
+        self.phrase_matcher = phrase_matcher
+        self.tokenizer = tokenizer
+
+    def prepare(self, summary):
+        """
+        형태소 분석 전 단계: 복합어 치환·수집, 영어 키워드 수집, 한글만 남기기
+
+        Returns:
+            (str, list[str], list[str]) | None: (한글 텍스트, 복합어, 영어 키워드), 문자열이 아니면 None
+        """
+        if not isinstance(summary, str):
+            return None
+
+        # 보호할 복합어(glued) 치환 + 등장 횟수만큼 수집 (IGNORECASE, 한 번의 스캔)
+        text, found_phrases = self.phrase_matcher.scan(summary)
+
+        # 영어 키워드를 등장 횟수만큼 수집
+        kept_eng = [w.lower() for w in re.findall(r'\b[a-zA-Z]+\b', text) if w.lower() in self.eng_keywords]
+
+        # 한글과 공백만 남기기 (숫자가 필요 없으면 제거)
+        kor_only = re.sub(r'[^가-힣\s]', ' ', text)
+        kor_only = re.sub(r'\s+', ' ', kor_only).strip()
+        return kor_only, found_phrases, kept_eng
+
+    def finish(self, prepared, tokens_with_pos):
+        """
+        형태소 분석 결과 (형태, 품사) 리스트에 필터를 적용해서 최종 문서 문자열 생성
+        """
+        if prepared is None:
+            return ""
+        _, found_phrases, kept_eng = prepared
+        # glued_lower(공백 없는 형태)만 components로 두면, "아웃바운드" 자체만 제거 대상이 됨
+        components = set(found_phrases)
+
+        lem = []
+        for token, tag in tokens_with_pos:
+            # 불용어, 이미 복합어로 수집된 토큰 제거
+            if token in self.stop_words or token in components:
+                continue
+            lower = token.lower()
+            # 영어 키워드 / 통째로 인식된 복합어 / 일반 명사·동사·형용사 태그
+            if lower in self.eng_keywords or lower in self.phrase_matcher.glued or wordnet_pos_tags_kor(tag):
+                lem.append(token)
+        lem.extend(kept_eng)
+
+        # cleanup: 복합어 일부로 분리된 하위 토큰(예: "아웃", "바운드") 제거
+        if found_phrases:
+            unique_phrases = set(found_phrases)
+            lem = [t for t in lem if not any(t.lower() in glued for glued in unique_phrases)]
+
+        # 복합어 전체(glued) 등장 횟수만큼 다시 추가
+        lem.extend(found_phrases)
+        return " ".join(lem).strip()
+
+    def lemmatize(self, summaries):
+        """
+        Args:
+            summaries (list[str]): 특허 요약문
+
+        Returns:
+            list[str]: 문서별 표제어를 공백으로 이은 문자열 (입력과 같은 순서)
+        """
+        prepared = [self.prepare(summary) for summary in summaries]
+        # 전체 문서를 한 번에 넘겨서 병렬로 (형태, 품사) 분석
+        pos_lists = self.tokenizer.pos([item[0] if item else "" for item in prepared])
+        return [self.finish(item, tokens) for item, tokens in zip(prepared, pos_lists)]
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+DB_PATH = './patents.db'
+
+# 한 특허가 여러 검색 키워드에 걸릴 때 '검색 키워드' 컬럼에서 쓰는 구분자 (출원인 컬럼과 동일)
+KEYWORD_SEPARATOR = '|'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patents (
+    application_number TEXT PRIMARY KEY,   -- 출원번호
+    keyword            TEXT,               -- 처음 매칭된 검색 키워드
+    application_date   TEXT,               -- 출원일
+    open_date          TEXT,               -- openDate
+    data               TEXT NOT NULL,      -- 특허 dict 전체 (JSON)
+    updated_at         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_patents_keyword ON patents(keyword);
+CREATE INDEX IF NOT EXISTS idx_patents_application_date ON patents(application_date);
+CREATE INDEX IF NOT EXISTS idx_patents_open_date ON patents(open_date);
+
+CREATE TABLE IF NOT EXISTS patent_keywords (
+    application_number TEXT NOT NULL,
+    keyword            TEXT NOT NULL,  -- 이 특허를 찾은 검색 키워드 (특허 하나에 여러 개)
+    PRIMARY KEY (application_number, keyword)
+);
+CREATE INDEX IF NOT EXISTS idx_patent_keywords_keyword ON patent_keywords(keyword);
+
+CREATE TABLE IF NOT EXISTS fetched_pages (
+    keyword     TEXT NOT NULL,
+    page        INTEGER NOT NULL,
+    num_of_rows INTEGER NOT NULL,
+    item_count  INTEGER NOT NULL,
+    complete    INTEGER NOT NULL,      -- 1: 페이지 전체 저장, 0: MAX_RESULTS 때문에 중간에서 멈춤
+    fetched_at  TEXT NOT NULL,
+    PRIMARY KEY (keyword, page, num_of_rows)
+);
+"""
+
+
+def split_keywords(value):
+    """'자율|주행' 형태의 검색 키워드 문자열을 리스트로 변환"""
+    if not isinstance(value, str):
+        return []
+    return [keyword for keyword in value.split(KEYWORD_SEPARATOR) if keyword]
+
+
+class PatentStore:
+    """
+    출원번호를 키로 하는 로컬 특허 저장소 (SQLite)
+    - 특허는 upsert로 저장되므로 같은 특허를 다시 받아도 중복되지 않음
+    - 여러 키워드에 걸린 특허는 한 행으로 저장하고, 매칭된 키워드 집합을 따로 기록
+    - 어떤 키워드/페이지를 이미 받았는지 기록해서 다음 실행에서는 빠진 부분만 크롤링
+
+    Args:
+        db_path (str): SQLite 파일 경로
+    """
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        has_keyword_table = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'patent_keywords'"
+        ).fetchone()
+        self.conn.executescript(SCHEMA)
+        if not has_keyword_table:
+            # 키워드 집합 테이블이 없던 예전 DB: 기존 keyword 컬럼으로 채워 넣음
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO patent_keywords (application_number, keyword) "
+                    "SELECT application_number, keyword FROM patents WHERE keyword != ''"
+                )
+
+    def upsert_patents(self, patents):
+        """
+        특허 dict 리스트 저장
+        - 같은 출원번호가 있으면 내용은 최신으로 덮어쓰고, '검색 키워드'는 키워드 집합에 추가
+        - '검색 키워드'에는 KEYWORD_SEPARATOR로 이어진 여러 키워드가 올 수 있음
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        keyword_rows = []
+        for patent in patents:
+            number = patent.get('출원번호')
+            if not number:
+                continue
+            keywords = split_keywords(patent.get('검색 키워드', ''))
+            data = {k: v for k, v in patent.items() if k != '검색 키워드'}
+            rows.append((
+                number,
+                keywords[0] if keywords else '',
+                patent.get('출원일', ''),
+                patent.get('openDate', ''),
+                json.dumps(data, ensure_ascii=False),
+                now
+            ))
+            keyword_rows.extend((number, keyword) for keyword in keywords)
+
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO patents (application_number, keyword, application_date, open_date, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(application_number) DO UPDATE SET
+                    application_date = excluded.application_date,
+                    open_date = excluded.open_date,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+                """,
+                rows
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO patent_keywords (application_number, keyword) VALUES (?, ?)",
+                keyword_rows
+            )
+        return len(rows)
+
+    def mark_fetched(self, keyword, page, num_of_rows, item_count, complete=True):
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO fetched_pages (keyword, page, num_of_rows, item_count, complete, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (keyword, page, num_of_rows, item_count, int(complete), datetime.now().isoformat(timespec='seconds'))
+            )
+
+    def fetched_pages(self, keywords, num_of_rows):
+        """끝까지 저장된 (키워드, 페이지) 조합 집합"""
+        keywords = list(keywords)
+        if not keywords:
+            return set()
+        placeholders = ','.join('?' * len(keywords))
+        rows = self.conn.execute(
+            f"SELECT keyword, page FROM fetched_pages "
+            f"WHERE complete = 1 AND num_of_rows = ? AND keyword IN ({placeholders})",
+            [num_of_rows] + keywords
+        ).fetchall()
+        return set(rows)
+
+    def count(self, keywords=None):
+        """저장된 고유 특허 수 (keywords를 주면 그중 하나라도 매칭된 특허만)"""
+        return len(self._select_rows(keywords))
+
+    def load_patents(self, keywords=None):
+        """
+        저장된 특허 dict 리스트 (저장 순서대로, 출원번호당 한 건)
+        '검색 키워드'에는 매칭된 키워드들을 KEYWORD_SEPARATOR로 이어서 넣음.
+        keywords를 주면 해당 키워드에 매칭된 특허만, 키워드도 그 안에서만 표시
+        """
+        rows = self._select_rows(keywords)
+        keyword_map = self._keyword_map(keywords)
+        patents = []
+        for number, data in rows:
+            patent = json.loads(data)
+            patent['검색 키워드'] = KEYWORD_SEPARATOR.join(keyword_map.get(number, []))
+            patents.append(patent)
+        return patents
+
+    def to_dataframe(self, keywords=None):
+        return pd.DataFrame(self.load_patents(keywords))
+
+    def _keyword_filter(self, keywords):
+        keywords = list(keywords)
+        placeholders = ','.join('?' * len(keywords))
+        return f"keyword IN ({placeholders})", keywords
+
+    def _select_rows(self, keywords=None):
+        if keywords is None:
+            return self.conn.execute("SELECT application_number, data FROM patents ORDER BY rowid").fetchall()
+        keywords = list(keywords)
+        if not keywords:
+            return []
+        condition, params = self._keyword_filter(keywords)
+        return self.conn.execute(
+            f"""
+            SELECT application_number, data FROM patents
+            WHERE application_number IN (SELECT application_number FROM patent_keywords WHERE {condition})
+            ORDER BY rowid
+            """,
+            params
+        ).fetchall()
+
+    def _keyword_map(self, keywords=None):
+        """출원번호 → 매칭된 키워드 리스트 (기록된 순서대로)"""
+        if keywords is None:
+            rows = self.conn.execute(
+                "SELECT application_number, keyword FROM patent_keywords ORDER BY rowid"
+            ).fetchall()
+        else:
+            keywords = list(keywords)
+            if not keywords:
+                return {}
+            condition, params = self._keyword_filter(keywords)
+            rows = self.conn.execute(
+                f"SELECT application_number, keyword FROM patent_keywords WHERE {condition} ORDER BY rowid",
+                params
+            ).fetchall()
+        keyword_map = {}
+        for number, keyword in rows:
+            keyword_map.setdefault(number, []).append(keyword)
+        return keyword_map
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pandas as pd
+
+# Step 사이에서 주고받는 특허 테이블 (Parquet, 컬럼 단위로 필요한 것만 읽음)
+PARQUET_NAME = 'extract_end.parquet'
+# 사람이 열어보기 위한 CSV 사본 (기존 파일명 유지)
+CSV_NAME = 'extract_end.csv'
+
+# 파일을 찾을 폴더 (현재 폴더 → 상위 폴더 순)
+SEARCH_DIRS = [".", "..", "/Users/shinseungmin/Documents/벌토픽_전체코드"]
+
+# 어떤 Step도 사용하지 않는 컬럼
+DROP_COLUMNS = ['Unnamed: 0', 'bigDrawing', 'drawing']
+
+# 숫자처럼 보이지만 문자열로 다뤄야 하는 번호 컬럼
+ID_COLUMNS = ['출원번호', 'indexNo', 'openNumber', 'publicationNumber', 'registerNumber']
+
+# YYYYMMDD 형태의 날짜 컬럼 → 쓸 때 한 번만 datetime으로 변환
+DATE_COLUMNS = ['출원일', 'openDate', '공개일', '등록일']
+
+
+def _parse_yyyymmdd(series):
+    # CSV를 거치면 20240202.0 처럼 float로 바뀌는 경우가 있어 정리 후 변환
+    text = series.astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
+    return pd.to_datetime(text, format='%Y%m%d', errors='coerce')
+
+
+def normalize_patent_frame(df):
+    """
+    컬럼 타입 정리: 미사용 컬럼 제거, 번호는 문자열, 날짜는 datetime, 출원연도(Int16) 계산
+    출원연도는 Step3_5와 같은 규칙으로 openDate가 있으면 openDate, 없으면 출원일에서 구함
+    """
+    df = df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns])
+    for col in ID_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('string').str.replace(r'\.0$', '', regex=True)
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = _parse_yyyymmdd(df[col])
+
+    if 'openDate' in df.columns:
+        df['출원연도'] = df['openDate'].dt.year.astype('Int16')
+    elif '출원일' in df.columns:
+        df['출원연도'] = df['출원일'].dt.year.astype('Int16')
+    elif '출원연도' in df.columns:
+        df['출원연도'] = pd.to_numeric(df['출원연도'], errors='coerce').astype('Int16')
+    return df
+
+
+def write_patent_table(df, directory=".", write_csv=True):
+    """
+    특허 DataFrame을 Parquet(+CSV 사본)으로 저장
+
+    Args:
+        df (DataFrame): 특허 데이터
+        directory (str): 저장할 폴더
+        write_csv (bool): 기존 도구/사람이 볼 수 있도록 extract_end.csv도 함께 저장
+    """
+    table = normalize_patent_frame(df.copy())
+    if write_csv:
+        csv_table = table.copy()
+        for col in DATE_COLUMNS:
+            if col in csv_table.columns:
+                csv_table[col] = csv_table[col].dt.strftime('%Y%m%d')
+        csv_table.to_csv(os.path.join(directory, CSV_NAME), index=False)
+    # CSV보다 나중에 써서 find_patent_table이 Parquet을 고르게 함
+    parquet_path = os.path.join(directory, PARQUET_NAME)
+    table.to_parquet(parquet_path, index=False, compression='zstd')
+    return parquet_path
+
+
+def find_patent_table():
+    """
+    읽을 특허 테이블 경로. 같은 폴더에 CSV가 Parquet보다 새로우면(직접 수정한 경우) CSV를 사용
+
+    Returns:
+        str | None: 파일 경로 (없으면 None)
+    """
+    for directory in SEARCH_DIRS:
+        parquet_path = os.path.join(directory, PARQUET_NAME)
+        csv_path = os.path.join(directory, CSV_NAME)
+        has_parquet = os.path.exists(parquet_path)
+        has_csv = os.path.exists(csv_path)
+        if has_parquet and (not has_csv or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+            return parquet_path
+        if has_csv:
+            return csv_path
+    return None
+
+
+def read_patent_table(columns=None, path=None):
+    """
+    특허 테이블 읽기 (필요한 컬럼만)
+
+    Args:
+        columns (list): 읽을 컬럼 (None이면 전체). 파일에 없는 컬럼은 무시
+        path (str): 파일 경로 (None이면 find_patent_table로 탐색)
+
+    Returns:
+        DataFrame | None: 파일이 없으면 None
+    """
+    path = path or find_patent_table()
+    if path is None:
+        return None
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(path, columns=columns, memory_map=True)
+
+    # CSV만 있는 경우: 같은 타입 규칙을 적용해서 Parquet과 동일한 모양으로 반환
+    usecols = None
+    if columns is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        wanted = set(columns)
+        # 출원연도는 날짜 컬럼에서 계산하므로 날짜 컬럼도 함께 읽음
+        if '출원연도' in wanted:
+            wanted.update(DATE_COLUMNS)
+        usecols = [c for c in header if c in wanted]
+    dtype = {col: str for col in ID_COLUMNS}
+    df = normalize_patent_frame(pd.read_csv(path, usecols=usecols, dtype=dtype))
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+
+def count_patent_rows(path=None):
+    """
+    특허 테이블 행 수 (Parquet은 메타데이터만 읽음)
+
+    Returns:
+        int | None: 파일이 없거나 CSV면 None
+    """
+    path = path or find_patent_table()
+    if path is None or not path.endswith('.parquet'):
+        return None
+    import pyarrow.parquet as pq
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def iter_patent_table(columns, batch_size=5000, path=None):
+    """
+    특허 테이블을 batch_size행씩 읽기 (전체 테이블을 메모리에 올리지 않음)
+
+    Args:
+        columns (list): 읽을 컬럼. 파일에 없는 컬럼은 무시
+        batch_size (int): 한 번에 읽을 행 수
+        path (str): 파일 경로 (None이면 find_patent_table로 탐색)
+
+    Yields:
+        DataFrame: 최대 batch_size행
+    """
+    path = path or find_patent_table()
+    if path is None:
+        return
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        available = set(parquet_file.schema_arrow.names)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=[c for c in columns if c in available]):
+            yield batch.to_pandas()
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if c in set(columns)]
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=batch_size,
+                             dtype={col: str for col in ID_COLUMNS if col in usecols}):
+        yield chunk
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import re
+
+PHRASE_PATH = 'data/phrase_data.txt'
+
+
+def load_phrases(path=PHRASE_PATH):
+    """
+    복합 키워드 파일 로드 → {소문자 원문: 공백을 없앤 소문자(glued)} (긴 것부터)
+
+    Args:
+        path (str): 한 줄에 하나씩 복합 키워드가 있는 파일
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw_phrases = [line.strip() for line in f if line.strip()]
+    raw_phrases.sort(key=len, reverse=True)
+    return {ph.lower(): ph.replace(' ', '').lower() for ph in raw_phrases}
+
+
+def _trie_pattern(words):
+    """
+    단어 목록을 접두사 트리 형태의 정규식으로 변환
+    ('라스트 마일', '라스트마일' → '라스트(?:\\ 마일|마일)')
+    분기마다 자식을 먼저 시도하므로 같은 위치에서는 가장 긴 단어가 매칭됨
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """
+    복합 키워드 사전 전체를 정규식 하나로 컴파일해서 문서당 한 번만 훑는 매처
+    - scan: 복합어를 glued 형태로 치환하면서 등장한 복합어(glued)를 등장 순서대로 수집
+    - find_glued: 이미 치환된 텍스트에서 glued 형태만 찾기
+
+    Args:
+        phrases (dict): {소문자 원문: glued} (load_phrases 결과)
+    """
+    def __init__(self, phrases):
+        self.phrases = dict(phrases)
+        self.glued = set(self.phrases.values())
+        # 원문과 glued 형태 모두 glued로 매핑 (원문에 처음부터 붙여 쓴 경우도 같은 복합어로 봄)
+        self._lookup = {glued: glued for glued in self.glued}
+        self._lookup.update(self.phrases)
+        self._pattern = self._compile(self._lookup)
+        self._glued_pattern = self._compile(self.glued)
+
+    @staticmethod
+    def _compile(words):
+        words = [w for w in words if w]
+        if not words:
+            return None
+        return re.compile(_trie_pattern(words), flags=re.IGNORECASE)
+
+    def _to_glued(self, matched):
+        lower = matched.lower()
+        return self._lookup.get(lower, lower.replace(' ', ''))
+
+    def scan(self, text):
+        """
+        복합어 치환 + 수집을 한 번에 수행
+
+        Returns:
+            (str, list[str]): 치환된 텍스트, 등장한 복합어(glued) 리스트 (등장 횟수만큼)
+        """
+        if self._pattern is None or not text:
+            return text, []
+        found = []
+
+        def replace(match):
+            glued = self._to_glued(match.group(0))
+            found.append(glued)
+            return glued
+
+        return self._pattern.sub(replace, text), found
+
+    def find(self, text):
+        """치환 없이 등장한 복합어(glued) 리스트만 반환"""
+        if self._pattern is None or not text:
+            return []
+        return [self._to_glued(m) for m in self._pattern.findall(text)]
+
+    def find_glued(self, text):
+        """glued 형태로 등장한 복합어 리스트 (등장 횟수만큼)"""
+        if self._glued_pattern is None or not text:
+            return []
+        return [m.lower() for m in self._glued_pattern.findall(text)]
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import threading
+import time
+
+PROGRESS_PATH = "progress.json"
+
+IDLE_PROGRESS = {"stage": "대기 중", "current": 0, "total": 1, "message": "진행 대기 중"}
+
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 rename해서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 함"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".progress-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_progress(path=PROGRESS_PATH):
+    """다른 프로세스가 쓴 progress.json 읽기 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ProgressReporter:
+    """
+    모든 Step이 공유하는 진행상황 보고기
+    - 같은 프로세스의 읽는 쪽은 latest()/wait_for_update()로 메모리에서 바로 읽음
+    - progress.json은 시간/개수 기준으로 묶어서 가끔만, 원자적으로 기록
+
+    Args:
+        path (str): 진행상황 파일 경로
+        min_interval (float): 파일 기록 최소 간격(초)
+        min_delta (int): 마지막 기록 이후 current가 이만큼 변하면 간격과 무관하게 기록
+    """
+    def __init__(self, path=PROGRESS_PATH, min_interval=0.5, min_delta=500):
+        self.path = path
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self._condition = threading.Condition()
+        self._latest = None
+        self._version = 0
+        self._written_version = 0
+        self._last_write_time = 0.0
+        self._last_write_current = None
+        self._subscribers = []
+
+    def update(self, stage, current, total, message, force=False):
+        """
+        진행상황 갱신. 메모리 상태와 구독자에게는 항상 반영하고, 파일은 throttle 조건을 만족할 때만 기록
+
+        Args:
+            force (bool): True면 throttle 없이 바로 파일 기록 (단계 시작/완료 시 사용)
+        """
+        progress = {"stage": stage, "current": current, "total": total, "message": message}
+        with self._condition:
+            self._latest = progress
+            self._version += 1
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(progress)
+            except Exception as e:
+                print(f"⚠️ 진행상황 구독자 오류: {e}")
+
+        if force or self._should_write(current):
+            self.flush()
+
+    def _should_write(self, current):
+        if self._last_write_current is None:
+            return True
+        if time.monotonic() - self._last_write_time >= self.min_interval:
+            return True
+        if isinstance(current, (int, float)) and isinstance(self._last_write_current, (int, float)):
+            return abs(current - self._last_write_current) >= self.min_delta
+        return current != self._last_write_current
+
+    def flush(self):
+        """아직 파일에 기록되지 않은 최신 진행상황을 기록"""
+        with self._condition:
+            if self._latest is None or self._written_version == self._version:
+                return
+            progress, version = dict(self._latest), self._version
+            self._written_version = version
+            self._last_write_time = time.monotonic()
+            self._last_write_current = progress["current"]
+        try:
+            write_json_atomic(self.path, progress)
+        except OSError as e:
+            print(f"⚠️ 진행상황 파일 기록 실패: {e}")
+
+    def latest(self):
+        """같은 프로세스에서 마지막으로 보고된 진행상황 (없으면 None)"""
+        with self._condition:
+            return dict(self._latest) if self._latest is not None else None
+
+    def wait_for_update(self, last_version=0, timeout=None):
+        """
+        last_version 이후 새 보고가 올 때까지 대기 (파일 폴링 대신 사용)
+
+        Returns:
+            (version, progress) - timeout이 지나면 기존 version과 마지막 진행상황
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != last_version, timeout=timeout)
+            latest = dict(self._latest) if self._latest is not None else None
+            return self._version, latest
+
+    def subscribe(self, callback):
+        with self._condition:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._condition:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+_reporter = ProgressReporter()
+
+
+def get_reporter():
+    """프로세스 전체에서 공유하는 기본 ProgressReporter"""
+    return _reporter
+
+
+def report(stage, current, total, message, force=False):
+    _reporter.update(stage, current, total, message, force=force)
+
+
+def current_progress(path=PROGRESS_PATH):
+    """같은 프로세스의 진행상황을 우선 사용하고, 없으면 progress.json, 그것도 없으면 대기 상태"""
+    return _reporter.latest() or read_progress(path) or dict(IDLE_PROGRESS)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+# UMAP도 이 크기 미만이면 근사 탐색 대신 전체 거리로 정확한 kNN을 구함
+SMALL_DATA_SIZE = 4096
+
+# 정확한 kNN을 구할 때 한 번에 계산할 행 수 (거리 행렬 메모리 제한)
+KNN_CHUNK = 1024
+
+
+def exact_cosine_knn(embeddings, n_neighbors):
+    """
+    코사인 거리 기준 정확한 kNN (자기 자신 포함, 가까운 순)
+
+    Returns:
+        (ndarray[n, k] int64, ndarray[n, k] float32): 이웃 인덱스, 거리
+    """
+    X = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    X = X / norms
+    n = len(X)
+    k = min(n_neighbors, n)
+    indices = np.empty((n, k), dtype=np.int64)
+    dists = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, KNN_CHUNK):
+        block = 1.0 - X[start:start + KNN_CHUNK] @ X.T
+        rows = np.arange(len(block))
+        # 자기 자신은 거리 0으로 고정 (부동소수점 오차로 다른 점에 밀리지 않도록)
+        block[rows, start + rows] = 0.0
+        np.maximum(block, 0.0, out=block)
+        part = np.argpartition(block, k - 1, axis=1)[:, :k]
+        part_dists = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(part_dists, axis=1, kind='stable')
+        indices[start:start + len(block)] = np.take_along_axis(part, order, axis=1)
+        dists[start:start + len(block)] = np.take_along_axis(part_dists, order, axis=1)
+    return indices, dists
+
+
+class ReductionCache:
+    """
+    같은 임베딩에 대한 UMAP 축소를 공유하는 캐시
+    - kNN 그래프는 가장 큰 n_neighbors로 한 번만 계산하고, 작은 n_neighbors는 앞쪽 이웃만 잘라서 재사용
+      (n_components, min_dist가 달라도 kNN은 같으므로 임베딩 최적화 단계만 다시 실행)
+    - (n_neighbors, n_components, min_dist) 조합별 축소 결과도 저장
+
+    Args:
+        embeddings (ndarray): 문서 임베딩 [n, d]
+        metric (str): UMAP 거리 (cosine)
+        random_state (int): UMAP 시드
+        knn (tuple): 다른 프로세스에서 이미 계산한 (indices, dists, search_index) (shared_knn 결과)
+    """
+    def __init__(self, embeddings, metric='cosine', random_state=42, knn=None):
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.metric = metric
+        self.random_state = random_state
+        self._knn = knn             # (indices, dists, search_index)
+        self._reductions = {}
+        self.knn_builds = 0
+
+    def knn(self, n_neighbors):
+        """n_neighbors개 이웃 (필요하면 더 큰 k로 다시 계산)"""
+        if self._knn is None or self._knn[0].shape[1] < n_neighbors:
+            if len(self.embeddings) < SMALL_DATA_SIZE and self.metric == 'cosine':
+                indices, dists = exact_cosine_knn(self.embeddings, n_neighbors)
+                search_index = None
+            else:
+                from umap.umap_ import nearest_neighbors
+                indices, dists, search_index = nearest_neighbors(
+                    self.embeddings, n_neighbors, self.metric, {}, False,
+                    np.random.RandomState(self.random_state), low_memory=True
+                )
+            self._knn = (indices, dists, search_index)
+            self.knn_builds += 1
+        indices, dists, search_index = self._knn
+        return indices[:, :n_neighbors], dists[:, :n_neighbors], search_index
+
+    def search_index(self, n_neighbors):
+        """
+        새 문서 변환(UMAP.transform)용 NNDescent 검색 인덱스
+        작은 데이터는 정확한 kNN으로 학습해서 인덱스가 없으므로, 처음 필요할 때 한 번만 만들어 kNN과 함께 보관
+        """
+        search_index = self.knn(n_neighbors)[2]
+        if search_index is None:
+            from umap.umap_ import nearest_neighbors
+            _, _, search_index = nearest_neighbors(
+                self.embeddings, self._knn[0].shape[1], self.metric, {}, False,
+                np.random.RandomState(self.random_state), low_memory=True
+            )
+            self._knn = (self._knn[0], self._knn[1], search_index)
+        return search_index
+
+    def shared_knn(self, n_neighbors):
+        """n_neighbors 이상으로 계산된 kNN 전체 (워커 프로세스의 ReductionCache(knn=...)에 넘김)"""
+        self.knn(n_neighbors)
+        return self._knn
+
+    def umap_model(self, n_neighbors, n_components, min_dist):
+        """공유 kNN을 사용하는 (아직 학습하지 않은) UMAP"""
+        import umap
+        indices, dists, search_index = self.knn(n_neighbors)
+        precomputed = (indices, dists) if search_index is None else (indices, dists, search_index)
+        return umap.UMAP(
+            n_neighbors=n_neighbors,
+            n_components=n_components,
+            min_dist=min_dist,
+            metric=self.metric,
+            random_state=self.random_state,
+            precomputed_knn=precomputed,
+            # 작은 데이터에서도 전체 거리 재계산 대신 위의 kNN을 사용
+            force_approximation_algorithm=True
+        )
+
+    def reduce(self, n_neighbors, n_components, min_dist):
+        """
+        Returns:
+            (UMAP, ndarray[n, n_components]): 학습된 UMAP과 축소된 임베딩
+        """
+        key = (n_neighbors, n_components, min_dist)
+        if key not in self._reductions:
+            model = self.umap_model(n_neighbors, n_components, min_dist)
+            reduced = model.fit_transform(self.embeddings)
+            self._reductions[key] = (model, reduced)
+        return self._reductions[key]
+
+
+class CachedUMAP:
+    """
+    BERTopic의 umap_model 자리에 넣는 래퍼 (fit/transform)
+    학습 임베딩에 대해서는 ReductionCache의 결과를 그대로 돌려주고, 새 문서는 학습된 UMAP으로 변환
+
+    Args:
+        cache (ReductionCache): 같은 임베딩으로 만든 캐시
+    """
+    def __init__(self, cache, n_neighbors=15, n_components=5, min_dist=0.0):
+        self.cache = cache
+        self.n_neighbors = n_neighbors
+        self.n_components = n_components
+        self.min_dist = min_dist
+        self.model_ = None
+        self.embedding_ = None
+
+    def _is_cached_input(self, X):
+        X = np.asarray(X)
+        return X.shape == self.cache.embeddings.shape and np.array_equal(X, self.cache.embeddings)
+
+    def fit(self, X, y=None):
+        if not self._is_cached_input(X):
+            raise ValueError("CachedUMAP은 ReductionCache를 만든 임베딩으로만 학습할 수 있습니다.")
+        self.model_, self.embedding_ = self.cache.reduce(self.n_neighbors, self.n_components, self.min_dist)
+        return self
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).embedding_
+
+    def transform(self, X):
+        if self._is_cached_input(X):
+            return self.embedding_
+        if getattr(self.model_, '_knn_search_index', None) is None:
+            # 정확한 kNN으로 학습한 UMAP(작은 데이터)은 검색 인덱스 없이 transform하면 NotImplementedError
+            search_index = self.cache.search_index(self.n_neighbors)
+            self.model_.knn_search_index = self.model_._knn_search_index = search_index
+        return self.model_.transform(X)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+# 한국어 특화 SBERT (Hugging Face 429 등으로 로드 실패 시 다국어 모델로 대체)
+DEFAULT_MODEL = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+FALLBACK_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# 프로세스 전체에서 모델 이름당 한 번만 로드 (web_api/Streamlit처럼 같은 프로세스에서 여러 번 실행되는 경우)
+_models = {}
+_lock = threading.Lock()
+
+
+def get_sentence_model(model_name=DEFAULT_MODEL, fallback=FALLBACK_MODEL):
+    """
+    SentenceTransformer 싱글턴
+
+    Args:
+        model_name (str): 로드할 모델
+        fallback (str): model_name 로드에 실패했을 때 사용할 모델 (None이면 예외 그대로 발생)
+
+    Returns:
+        (str, SentenceTransformer): 실제로 로드된 모델 이름과 모델
+    """
+    with _lock:
+        if model_name in _models:
+            return _models[model_name]
+        from sentence_transformers import SentenceTransformer
+        try:
+            loaded = (model_name, SentenceTransformer(model_name))
+        except Exception as e:
+            if fallback is None:
+                raise
+            print(f"{model_name} 모델 로드 실패, 대체 모델 사용: {e}")
+            if fallback not in _models:
+                _models[fallback] = (fallback, SentenceTransformer(fallback))
+            loaded = _models[fallback]
+        _models[model_name] = loaded
+        return loaded
+
+
+def encode_documents(docs, model_name=DEFAULT_MODEL, fallback=FALLBACK_MODEL, show_progress_bar=True):
+    """
+    문서 임베딩을 한 번만 계산 (디스크 캐시에 있는 문서는 재사용)
+    결과 행렬은 BERTopic.fit_transform(docs, embeddings=...)와 시각화에 그대로 넘김
+
+    Returns:
+        (SentenceTransformer, ndarray[n, d] float32): 모델과 임베딩 행렬
+    """
+    loaded_name, model = get_sentence_model(model_name, fallback)
+    with EmbeddingCache(loaded_name) as cache:
+        embeddings, _ = cache.embed(
+            list(docs),
+            lambda texts: model.encode(texts, show_progress_bar=show_progress_bar, convert_to_numpy=True)
+        )
+        print(f"임베딩 캐시: {cache.hits}개 재사용, {cache.misses}개 새로 인코딩")
+    return model, np.ascontiguousarray(embeddings, dtype=np.float32)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+def to_matrix(vectors, dimensions=None):
+    """
+    임베딩 리스트를 연속된 float32 행렬로 변환
+    임베딩이 없는(None) 행은 0 벡터로 채우고, 유효한 행 마스크를 함께 반환
+
+    Returns:
+        (ndarray[n, d] float32, ndarray[n] bool)
+    """
+    vectors = list(vectors)
+    valid = np.array([v is not None for v in vectors], dtype=bool)
+    if dimensions is None:
+        first = next((v for v in vectors if v is not None), None)
+        dimensions = len(first) if first is not None else 0
+    if not vectors:
+        return np.zeros((0, dimensions), dtype=np.float32), valid
+    zero = [0.0] * dimensions
+    # 행마다 복사하지 않고 한 번에 변환
+    matrix = np.asarray([zero if v is None else v for v in vectors], dtype=np.float32)
+    return matrix, valid
+
+
+def normalize_rows(matrix):
+    """행마다 L2 정규화 (길이 0인 행은 0 그대로)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SimilarityScorer:
+    """
+    기준 벡터(하나 또는 여러 개)와 문서 임베딩 사이의 코사인 유사도를 행렬 곱 한 번으로 계산
+
+    Args:
+        reference_vectors: 기준 벡터 하나(list/1차원 배열) 또는 여러 개(2차원)
+    """
+    def __init__(self, reference_vectors):
+        references = np.asarray(reference_vectors, dtype=np.float32)
+        if references.ndim == 1:
+            references = references[np.newaxis, :]
+        self.references = normalize_rows(references)
+
+    def similarity_matrix(self, embeddings, valid=None):
+        """
+        문서 × 기준 벡터 코사인 유사도 행렬
+
+        Args:
+            embeddings: float32 행렬 또는 임베딩 리스트 (None이 있으면 그 행은 유사도 0)
+            valid (ndarray[bool]): 행렬을 줄 때 유효한 행 마스크 (False인 행은 유사도 0)
+
+        Returns:
+            ndarray[n_docs, n_references] float32
+        """
+        if isinstance(embeddings, np.ndarray):
+            matrix = embeddings
+        else:
+            matrix, valid = to_matrix(embeddings, self.references.shape[1])
+        if len(matrix) == 0 or matrix.shape[1] == 0:
+            return np.zeros((len(matrix), len(self.references)), dtype=np.float32)
+        matrix = np.asarray(matrix, dtype=np.float32)
+        # 문서 행렬을 정규화해서 복사하지 않고, 곱한 결과를 문서 노름으로 나눔
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        scores = (matrix @ self.references.T) / norms[:, np.newaxis]
+        if valid is not None:
+            scores[~valid] = 0.0
+        return scores
+
+    def score(self, embeddings, valid=None, reduce='max'):
+        """
+        문서별 유사도 점수 (기준 벡터가 여러 개면 reduce로 합침)
+
+        Args:
+            reduce (str): 'max' 또는 'mean'
+        """
+        scores = self.similarity_matrix(embeddings, valid)
+        if reduce == 'mean':
+            return scores.mean(axis=1)
+        return scores.max(axis=1)
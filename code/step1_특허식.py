@@ -1,10 +1,11 @@
 import os
-import openai
-from openai import OpenAI
 from dotenv import load_dotenv
 
 class Step1:
     def __init__(self):
+        # openai SDK는 Step1을 실제로 실행할 때만 로드
+        from openai import OpenAI
+
         # 환경변수에서 API 키 읽기, 없으면 기본값 사용
         load_dotenv()
         api_key = os.getenv('OPENAI_API_KEY')
@@ -1,132 +1,221 @@
-import requests
-import xml.etree.ElementTree as ET
-import pandas as pd
 import ast
-import sqlite3
-import json
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from openai import OpenAI
+from kipris_client import KIPRIS_URL, KiprisClient, RetryPolicy, iter_items
+from patent_store import KEYWORD_SEPARATOR, PatentStore, split_keywords
+from patent_table import write_patent_table
+import progress_reporter
+
+# ------------------ 설정 ------------------
+
+# 제외할 특허 상태
+EXCLUDE_STATUSES = ['거절', '무효', '소멸', '포기', '불수리', '심사청구취하']
+
+COLUMN_NAME_MAP = {
+    'applicationNumber': '출원번호',
+    'inventionTitle': '발명명칭',
+    'applicantName': '출원인',
+    'registerStatus': '등록상태',
+    'applicationDate': '출원일',
+    'registerDate': '등록일',
+    'publicationDate': '공개일',
+    'ipcNumber': 'IPC분류',
+    'inventorName': '발명자',
+    'abstract': '요약',
+    "claim": "청구항",  # ← 추가
+    "claimStatement": "청구항",  # ← 추가 가능
+    "claimText": "청구항"
+}
+
+MAX_RESULTS = 5000 # 전체 긁어오는 특허수 조절변수
+MAX_PAGES = 1
+NUM_OF_ROWS = 500  # 키워드 하나당 긁어오는 특허수 조절하는곳
+PAGE_QUEUE_SIZE = 200  # 작업 스레드 → 수집기 사이에 페이지마다 대기시킬 최대 특허 수 (0이면 제한 없음)
+# ----------------------------------------------------------------------------------
+
+# 작업 스레드가 페이지를 끝냈음을 알리는 표시
+_PAGE_DONE = object()
+_PAGE_FAILED = object()
 
-class Step2:
-    def cra(self,x):
-        import os  # 함수 내부에서 명시적으로 import
-        
-        # extract.csv 파일이 이미 존재하는지 확인
-        if os.path.exists('./extract_end.csv'):
-            print("extract.csv 파일이 이미 존재합니다. 크롤링 과정을 건너뜁니다.")
-            return
-
-        query=x
-        KEYWORDS = ast.literal_eval(query)
-        # ------------------ 설정 ------------------
-        #API_KEY = os.getenv('KIPRIS_API_KEY', 'FlDibi21AbaJM8ifjFmXv5OUEuAMpjJYqq6/HGOpye0=')  # 환경변수에서 읽기
-        load_dotenv()
-        API_KEY=os.getenv('KIPRIS_API_KEY')
 
-        # 제외할 특허 상태
-        EXCLUDE_STATUSES = ['거절', '무효', '소멸', '포기', '불수리', '심사청구취하']
-
-        column_name_map = {
-            'applicationNumber': '출원번호',
-            'inventionTitle': '발명명칭',
-            'applicantName': '출원인',
-            'registerStatus': '등록상태',
-            'applicationDate': '출원일',
-            'registerDate': '등록일',
-            'publicationDate': '공개일',
-            'ipcNumber': 'IPC분류',
-            'inventorName': '발명자',
-            'abstract': '요약',
-            "claim": "청구항",  # ← 추가
-            "claimStatement": "청구항",  # ← 추가 가능
-            "claimText": "청구항"
+class Step2:
+    def __init__(self, max_workers=8, requests_per_second=10.0, url=None, retry_policy=None, timeout=(5, 30)):
+        """
+        Args:
+            max_workers (int): 동시에 보낼 최대 요청 수 (1이면 기존처럼 순차 크롤링)
+            requests_per_second (float): 호스트별 초당 요청 수 제한
+            url (str): 검색 API 주소 (None이면 KIPRIS 기본 주소, 벤치마크에서는 로컬 서버)
+            retry_policy (RetryPolicy): 429/5xx 재시도 정책 (None이면 기본값)
+            timeout (tuple): 요청별 (연결, 읽기) 타임아웃 초
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.client = KiprisClient(
+            url=url or KIPRIS_URL,
+            pool_size=self.max_workers,
+            timeout=timeout,
+            retry_policy=retry_policy or RetryPolicy(),
+            requests_per_second=requests_per_second
+        )
+
+    @staticmethod
+    def _parse(stream):
+        return iter_items(stream, COLUMN_NAME_MAP)
+
+    def fetch_page(self, keyword, page, api_key, on_item):
+        """
+        키워드 × 페이지 하나를 요청해서 특허 dict를 하나씩 on_item에 넘김 (페이지를 리스트로 모으지 않음)
+
+        Returns:
+            int | None: 페이지를 끝까지 받았으면 특허 수, 실패하거나 on_item이 False로 멈췄으면 None
+        """
+        params = {
+            'word': keyword,
+            'year': '0',
+            'ServiceKey': api_key,
+            'numOfRows': NUM_OF_ROWS,
+            'page': page
         }
-
-
-        MAX_RESULTS = 5000 # 전체 긁어오는 특허수 조절변수
-        MAX_PAGES=1
-        url = 'http://plus.kipris.or.kr/kipo-api/kipi/patUtiModInfoSearchSevice/getWordSearch'
-        
-        # ----------------------------------------------------------------------------------
-
-        all_patents = []
-        print(f"STEP1 에서 만든 검색식: {KEYWORDS}\n")
-        # 🔍 키워드별 검색
-        for keyword in KEYWORDS:
-            print(f"\n🔍 키워드 '{keyword}' 검색 중...")
-
-            
-            for page in range(1,MAX_PAGES+1):
-                #print('test')
-                params = {
-                    'word': keyword,
-                    'year': '0',
-                    'ServiceKey': API_KEY,
-                    'numOfRows': 500,  # 키워드 하나당 긁어오는 특허수 조절하는곳
-                    'page':page
-                }
-
-                response = requests.get(url, params=params)
-                if response.status_code != 200:
-                    print(f"요청 실패: {response.status_code}")
-                    continue
-
+        # 응답 본문을 통째로 버퍼링하지 않고 소켓에서 바로 item 단위로 파싱 (본문 수신 실패도 client가 재시도)
+        return self.client.get_items(params, self._parse, on_item)
+
+    def _stream_page(self, keyword, page, api_key, items, stop):
+        """
+        작업 스레드: 페이지의 특허 dict를 크기 제한 큐에 하나씩 넣고 마지막에 _PAGE_DONE/_PAGE_FAILED를 넣음
+        큐가 차면 수집기가 꺼낼 때까지 소켓 읽기를 멈추므로 먼저 끝난 페이지가 메모리에 쌓이지 않음
+        """
+        def put(item):
+            while not stop.is_set():
                 try:
-                    root = ET.fromstring(response.content)
-                    items = root.findall('.//item')
-                    #print(f"{len(items)}건 수집됨.")
-
-                    for item in items:
-                        patent_data = {}
-                        for elem in item:
-                            tag = elem.tag
-                            text = elem.text.strip() if elem.text else ''
-                            label = column_name_map.get(tag, tag)
-                            patent_data[label] = text
-
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        count = self.fetch_page(keyword, page, api_key, put)
+        put(_PAGE_DONE if count is not None else _PAGE_FAILED)
+
+    @staticmethod
+    def _next_item(items, future):
+        """수집기: 작업 스레드가 큐에 넣은 다음 특허 dict (페이지가 끝나면 _PAGE_DONE/_PAGE_FAILED)"""
+        while True:
+            try:
+                return items.get(timeout=0.5)
+            except queue.Empty:
+                if future.done():
+                    # 작업 스레드가 예외로 끝난 경우 그 예외를 다시 발생시킴
+                    future.result()
+                    return _PAGE_FAILED
+
+    def collect(self, keywords, api_key, store=None):
+        """
+        모든 키워드 × 페이지 요청을 스레드 풀로 동시에 보내고,
+        결과는 (키워드, 페이지) 순서대로 합쳐서 순차 크롤링과 같은 결과를 만든다.
+        각 페이지의 특허는 작업 스레드에서 크기 제한 큐(PAGE_QUEUE_SIZE)를 거쳐 하나씩 넘어오므로
+        페이지 크기(NUM_OF_ROWS)나 동시 요청 수와 관계없이 대기 중인 특허 수가 제한됨
+
+        Args:
+            keywords (list): 검색 키워드 리스트
+            api_key (str): KIPRIS API 키
+            store (PatentStore): 주어지면 이미 받은 페이지는 건너뛰고, 받은 페이지는 바로 저장
+
+        Returns:
+            list: 이번 실행에서 새로 수집한 특허 dict 리스트 (출원번호당 한 건,
+                  '검색 키워드'에는 매칭된 키워드들이 '|'로 이어져 있음)
+        """
+        jobs = [(keyword, page) for keyword in keywords for page in range(1, MAX_PAGES + 1)]
+        collected = 0
+        if store is not None:
+            done = store.fetched_pages(keywords, NUM_OF_ROWS)
+            jobs = [job for job in jobs if job not in done]
+            collected = store.count(keywords)
+            print(f"📦 저장소에 {collected}건 보유, 받아야 할 페이지 {len(jobs)}개")
+        all_patents = []
+        seen = {}  # 출원번호 → 이번 실행에서 수집한 특허 dict
+        if not jobs or collected >= MAX_RESULTS:
+            return all_patents
+
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=PAGE_QUEUE_SIZE) for _ in jobs]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._stream_page, keyword, page, api_key, items, stop)
+                       for (keyword, page), items in zip(jobs, queues)]
+            try:
+                for (keyword, page), items, future in zip(jobs, queues, futures):
+                    print(f"\n🔍 키워드 '{keyword}' {page}페이지 검색 중...")
+                    page_patents = []
+                    while True:
+                        patent_data = self._next_item(items, future)
+                        if patent_data is _PAGE_DONE or patent_data is _PAGE_FAILED:
+                            break
                         status = patent_data.get('registerStatus', '')
                         if status in EXCLUDE_STATUSES:
                             continue  # 건너뛰기
 
+                        # 다른 키워드로 이미 수집된 특허는 새 행을 만들지 않고 키워드만 추가
+                        number = patent_data.get('출원번호')
+                        if number and number in seen:
+                            duplicate = seen[number]
+                            if keyword not in split_keywords(duplicate['검색 키워드']):
+                                duplicate['검색 키워드'] += KEYWORD_SEPARATOR + keyword
+                            page_patents.append(duplicate)
+                            continue
+
                         patent_data['검색 키워드'] = keyword
+                        if number:
+                            seen[number] = patent_data
+                        page_patents.append(patent_data)
                         all_patents.append(patent_data)
+                        collected += 1
+
+                        # 진행상황 저장 (파일 기록은 reporter가 묶어서 처리)
+                        progress_reporter.report("특허 수집", collected, MAX_RESULTS,
+                                                 f"특허 {collected}/{MAX_RESULTS}개 수집 중")
 
-                        # 진행상황 저장
-                        progress = {
-                            "stage": "특허 수집",
-                            "current": len(all_patents),
-                            "total": MAX_RESULTS,
-                            "message": f"특허 {len(all_patents)}/{MAX_RESULTS}개 수집 중"
-                        }
-                        with open("progress.json", "w", encoding="utf-8") as f:
-                            json.dump(progress, f, ensure_ascii=False)
-
-                        if len(all_patents) >= MAX_RESULTS:
+                        if collected >= MAX_RESULTS:
                             break
 
-                except ET.ParseError as e:
-                    print(f" XML 파싱 실패: {e}")
-                    continue
+                    if store is not None:
+                        store.upsert_patents(page_patents)
+                        if patent_data is _PAGE_DONE or collected >= MAX_RESULTS:
+                            # 끝까지 못 받은 페이지는 기록하지 않으므로 다음 실행에서 다시 요청됨
+                            store.mark_fetched(keyword, page, NUM_OF_ROWS, len(page_patents),
+                                               complete=collected < MAX_RESULTS)
+
+                    if collected >= MAX_RESULTS:
+                        break
+            finally:
+                # 아직 시작하지 않은 요청은 취소하고, 큐에 넣으려고 기다리는 작업 스레드는 멈춤
+                for pending in futures:
+                    pending.cancel()
+                stop.set()
 
-                if len(all_patents) >= MAX_RESULTS:
-                    break
+        return all_patents
 
-            if len(all_patents) >= MAX_RESULTS:
-                break
+    def cra(self,x):
+        query=x
+        KEYWORDS = ast.literal_eval(query)
+        #API_KEY = os.getenv('KIPRIS_API_KEY', 'FlDibi21AbaJM8ifjFmXv5OUEuAMpjJYqq6/HGOpye0=')  # 환경변수에서 읽기
+        load_dotenv()
+        API_KEY=os.getenv('KIPRIS_API_KEY')
 
-        print(f"\n 최종 수집 특허 수: {len(all_patents)}건")
+        print(f"STEP1 에서 만든 검색식: {KEYWORDS}\n")
+        # 🔍 키워드별 검색 (저장소에 없는 키워드 × 페이지만 동시에 전송)
+        with PatentStore() as store:
+            new_patents = self.collect(KEYWORDS, API_KEY, store=store)
+            if not new_patents:
+                print("새로 받을 특허가 없습니다. 저장소의 특허로 extract_end 테이블을 다시 만듭니다.")
+            df = store.to_dataframe(KEYWORDS)
+
+        print(f"\n 신규 수집 특허 수: {len(new_patents)}건, 최종 특허 수: {len(df)}건")
         # 마지막 진행상황 저장 (완료)
-        progress = {
-            "stage": "특허 수집 완료",
-            "current": len(all_patents),
-            "total": MAX_RESULTS,
-            "message": f"특허 수집 완료: {len(all_patents)}개"
-        }
-        with open("progress.json", "w", encoding="utf-8") as f:
-            json.dump(progress, f, ensure_ascii=False)
-        df = pd.DataFrame(all_patents)
+        progress_reporter.report("특허 수집 완료", len(df), MAX_RESULTS,
+                                 f"특허 수집 완료: {len(df)}개", force=True)
         #print(df)
 
-        #df.to_csv("/Users/shinseungmin/Documents/벌토픽_전체코드/code/extract.csv")
-        df.to_csv('./extract_end.csv')
\ No newline at end of file
+        #df.to_csv("/Users/shinseungmin/Documents/벌토픽_전체코드/code/extract.csv")
+        # 다음 Step들이 읽을 Parquet 테이블 (+ 확인용 extract_end.csv)
+        write_patent_table(df)
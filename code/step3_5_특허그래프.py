@@ -1,6 +1,7 @@
 import pandas as pd
 import ast
 import os
+from patent_table import find_patent_table, read_patent_table
 
 class Step3_5:
     def __init__(self):
@@ -22,81 +23,26 @@ class Step3_5:
         try:
             import os  # 함수 내부에서 명시적으로 import
             
-            # CSV 파일 존재 확인 (여러 경로 시도)
-            csv_paths = ["./extract_end.csv", "../extract_end.csv", "/Users/shinseungmin/Documents/벌토픽_전체코드/extract_end.csv"]
-            csv_path = None
-            
-            for path in csv_paths:
-                if os.path.exists(path):
-                    csv_path = path
-                    break
-            
-            if csv_path is None:
-                print("❌ extract_end.csv 파일을 찾을 수 없습니다.")
+            table_path = find_patent_table()
+            if table_path is None:
+                print("❌ extract_end 특허 테이블을 찾을 수 없습니다.")
                 print(f"현재 디렉토리: {os.getcwd()}")
                 return None
-                
-            print(f"📁 CSV 파일 읽는 중: {csv_path}")
-            # CSV 읽기
-            df = pd.read_csv(csv_path)
-            print(f"📊 CSV 데이터 로드 완료 - 행 수: {len(df)}")
-            
-            # 📌 날짜 전처리: openDate 우선 사용, 없으면 출원일 사용
+
+            print(f"📁 특허 테이블 읽는 중: {table_path}")
+            # 그래프에 필요한 컬럼만 읽기 (출원연도는 Step2에서 저장할 때 openDate 우선 규칙으로 계산됨)
+            df = read_patent_table(columns=["검색 키워드", "출원연도"], path=table_path)
+            print(f"📊 특허 데이터 로드 완료 - 행 수: {len(df)}")
+
+            # 📌 날짜 전처리: 저장 시점에 openDate(없으면 출원일)로부터 출원연도가 계산되어 있음
             print(f"원본 데이터 수: {len(df)}")
-            
-            # openDate 컬럼이 있는지 확인
-            if 'openDate' in df.columns:
-                print(f"openDate 컬럼의 NaN 개수: {df['openDate'].isna().sum()}")
-                # openDate가 있는 데이터만 필터링
-                df_with_date = df.dropna(subset=['openDate']).copy()
-                print(f"openDate가 있는 데이터 수: {len(df_with_date)}")
-                
-                if len(df_with_date) > 0:
-                    # openDate 형식 변환 (20240202.0 -> 2024)
-                    df_with_date["openDate"] = df_with_date["openDate"].astype(str).str.replace('.0', '').str.strip()
-                    df_with_date["출원연도"] = pd.to_datetime(
-                        df_with_date["openDate"], format='%Y%m%d', errors="coerce"
-                    ).dt.year
-                    
-                    # 유효한 연도만 남기기
-                    df = df_with_date.dropna(subset=['출원연도'])
-                    print(f"openDate로부터 유효한 출원연도가 있는 데이터 수: {len(df)}")
-                else:
-                    print("❌ openDate가 있는 데이터가 없습니다.")
-                    return None
-            else:
-                # openDate가 없으면 기존 출원연도 또는 출원일자 컬럼 사용
-                print("openDate 컬럼이 없으므로 기존 출원연도/출원일자 데이터를 사용합니다.")
-                if '출원연도' in df.columns:
-                    # 이미 출원연도 컬럼이 있는 경우
-                    df = df.dropna(subset=['출원연도'])
-                    print(f"출원연도가 있는 데이터 수: {len(df)}")
-                    if len(df) == 0:
-                        print("❌ 출원연도가 있는 데이터가 없습니다.")
-                        return None
-                elif '출원일자' in df.columns:
-                    # 출원일자 컬럼을 출원연도로 변환
-                    df = df.dropna(subset=['출원일자'])
-                    # 출원일자를 연도로 변환 (필요시 구현)
-                    df['출원연도'] = pd.to_datetime(df['출원일자'], errors='coerce').dt.year
-                    df = df.dropna(subset=['출원연도'])
-                    print(f"출원일자로부터 변환된 출원연도가 있는 데이터 수: {len(df)}")
-                    if len(df) == 0:
-                        print("❌ 출원일자로부터 변환된 출원연도가 없습니다.")
-                        return None
-                elif '출원일' in df.columns:
-                    df = df.dropna(subset=['출원일'])
-                    # 출원일을 연도로 변환 (필요시 구현)
-                    df['출원연도'] = pd.to_datetime(df['출원일'], errors='coerce').dt.year
-                    df = df.dropna(subset=['출원연도'])
-                    print(f"출원일로부터 변환된 출원연도가 있는 데이터 수: {len(df)}")
-                    if len(df) == 0:
-                        print("❌ 출원일로부터 변환된 출원연도가 없습니다.")
-                        return None
-                else:
-                    print("❌ 날짜 관련 컬럼을 찾을 수 없습니다.")
-                    return None
-            
+            if '출원연도' not in df.columns:
+                print("❌ 날짜 관련 컬럼을 찾을 수 없습니다.")
+                return None
+            print(f"출원연도가 없는 데이터 수: {df['출원연도'].isna().sum()}")
+            df = df.dropna(subset=['출원연도'])
+            print(f"유효한 출원연도가 있는 데이터 수: {len(df)}")
+
             # 최종 데이터 검증
             if len(df) == 0:
                 print("❌ 날짜 전처리 후 데이터가 없습니다.")
@@ -122,22 +68,24 @@ class Step3_5:
                 print(f"🔍 키워드 필터링: {KEYWORDS}")
                 
                 # 모든 키워드에 해당하는 특허 데이터 통합
-                all_matched_patents = pd.DataFrame()
+                # (Step2에서 특허당 한 행으로 저장하고 '검색 키워드'에 매칭 키워드를 '|'로 이어두므로
+                #  키워드별 마스크를 OR로 합치기만 하면 중복 없이 통합됨)
+                keyword_column = df["검색 키워드"].astype(str)
+                matched_mask = pd.Series(False, index=df.index)
                 total_count = 0
 
                 for kw in KEYWORDS:
                     # 키워드 필터링
-                    mask = df["검색 키워드"].astype(str).str.contains(kw, case=False, na=False)
-                    filtered_df = df[mask].copy()
+                    mask = keyword_column.str.contains(kw, case=False, na=False)
 
                     # 데이터 건수 확인
                     count = mask.sum()
                     total_count += count
                     print(f"**{kw}** → {count}건")
 
-                    if not filtered_df.empty:
-                        # 모든 매칭된 특허를 하나로 합침
-                        all_matched_patents = pd.concat([all_matched_patents, filtered_df], ignore_index=True)
+                    matched_mask |= mask
+
+                all_matched_patents = df[matched_mask].copy()
                 
                 if len(all_matched_patents) == 0:
                     print("❌ 키워드에 매칭된 데이터가 없습니다!")
@@ -148,9 +96,6 @@ class Step3_5:
                 print(f"데이터 연도 범위: {all_matched_patents['출원연도'].min()} ~ {all_matched_patents['출원연도'].max()}")
                 
                 # 데이터 처리 계속 진행
-                # 중복 제거 (같은 특허가 여러 키워드에 매칭될 수 있음)
-                all_matched_patents = all_matched_patents.drop_duplicates()
-                
                 # 통합된 데이터로 연도별 건수 집계 (단일 컬럼)
                 year_counts = all_matched_patents.groupby("출원연도").size().reset_index(name="전체 특허 출원 건수")
 
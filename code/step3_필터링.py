@@ -1,73 +1,89 @@
-import openai
-from openai import OpenAI
-from tqdm import tqdm
-from sklearn.metrics.pairwise import cosine_similarity
-import pandas as pd
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from embedding_client import BatchEmbedder
+from embedding_cache import EmbeddingCache
+from similarity_scorer import SimilarityScorer
+from patent_table import read_patent_table, write_patent_table
+import progress_reporter
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+SIMILARITY_THRESHOLD = 0.0  # 이 값 이상인 특허만 남김
+RECENT_YEARS = 20           # 최근 몇 년 출원만 남길지
 
 class Step3:
+    def __init__(self, batch_size=256, max_workers=4, requests_per_second=None):
+        """
+        Args:
+            batch_size (int): 임베딩 요청 하나에 담을 특허 수
+            max_workers (int): 동시에 보낼 임베딩 요청 수
+            requests_per_second (float): 초당 임베딩 요청 수 제한
+        """
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+
     def filter(self):
-        return
-        import os  # 함수 내부에서 명시적으로 import
-        
-        # extract_end.csv 파일이 이미 존재하는지 확인
-        if os.path.exists('./extract_end.csv'):
-            print("extract_end.csv 파일이 이미 존재합니다. 필터링 과정을 건너뜁니다.")
+        df = read_patent_table()
+        if df is None:
+            print("❌ extract_end 특허 테이블을 찾을 수 없습니다. 필터링 과정을 건너뜁니다.")
             return
-            
-        data = 'extract.csv'
-        df=pd.read_csv(data)
+
+        # 이미 유사도 필터링을 거친 테이블인지 확인
+        if '유사도' in df.columns:
+            print("이미 유사도 필터링된 특허 테이블입니다. 필터링 과정을 건너뜁니다.")
+            return
+
         print(df.shape)  # 합쳐진 데이터 크기 확인
         df['combined'] = df['발명명칭'].fillna('') + ' ' + df['astrtCont'].fillna('') + ' '# + df['청구항'].fillna('')
 
-        # OpenAI client 사용
-        
+        # OpenAI client 사용 (openai SDK는 Step3를 실제로 실행할 때만 로드)
+        from openai import OpenAI
+
         load_dotenv()
         api_key = os.getenv('OPENAI_API_KEY')
-        
+
         if not api_key:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다. OPENAI_API_KEY 환경변수를 설정해주세요.")
+        # OPENAI_BASE_URL 환경변수를 주면 로컬 stub 임베딩 서버로도 실행 가능
         client = OpenAI(api_key=api_key)
+        embedder = BatchEmbedder(
+            client,
+            model=EMBEDDING_MODEL,
+            batch_size=self.batch_size,
+            max_workers=self.max_workers,
+            requests_per_second=self.requests_per_second
+        )
 
         # 기준 문장
         reference_text = """
         자율주행 로봇, AMR, AGV, 자율이동 로봇, SLAM, 경로 인식, 충돌회피, Autonomous Mobile Robot, 스마트 물류 로봇
         """
 
-        # 임베딩 함수
-        def get_embedding(text):
-            response = client.embeddings.create(
-                input=text,
-                model="text-embedding-3-small"
+        # 기준 벡터
+        reference_vector = embedder.embed_one(reference_text)
+        if reference_vector is None:
+            raise RuntimeError("기준 문장 임베딩에 실패했습니다.")
+
+        # 임베딩 (캐시에 없는 특허만, 여러 특허를 묶어서 요청)
+        def report(done, total):
+            progress_reporter.report("특허 필터링", done, total, f"특허 임베딩 {done}/{total}개 완료")
+
+        with EmbeddingCache(EMBEDDING_MODEL) as cache:
+            embeddings, valid = cache.embed(
+                df['combined'].tolist(),
+                lambda texts: embedder.embed_matrix(texts, progress_callback=report)
             )
-            return response.data[0].embedding
+            print(f"임베딩 캐시: {cache.hits}개 재사용, {cache.misses}개 새로 임베딩")
 
-        # 기준 벡터
-        reference_vector = get_embedding(reference_text)
-
-        # 임베딩 및 유사도 계산
-        embeddings = []
-        similarities = []
-
-        for text in tqdm(df['combined']):
-            try:
-                emb = get_embedding(text)
-                sim = cosine_similarity([reference_vector], [emb])[0][0]
-            except:
-                emb = None
-                sim = 0
-            embeddings.append(emb)
-            similarities.append(sim)
+        # 유사도 계산 (전체 임베딩을 float32 행렬로 모아 한 번에 계산, 임베딩 실패 행은 0)
+        scorer = SimilarityScorer(reference_vector)
+        similarities = scorer.score(embeddings, valid)
         # 유사도 컬럼 추가
         df['유사도'] = similarities
 
-        # 필터링 (유사도 0.7 이상만)
-        df = df[df['유사도'] >= 0.0]
-
-        # 저장
-        df.to_csv('./extract_end.csv', index=False)
+        # 필터링 (유사도 SIMILARITY_THRESHOLD 이상만)
+        df = df[df['유사도'] >= SIMILARITY_THRESHOLD]
 
         # # 결과 출력
         # print("필터링 전 데이터 개수:", len(df))
@@ -76,22 +92,17 @@ class Step3:
         # print(f"관련 특허 비율: {len(filtered_df)/len(df)*100:.2f}%")
         #print("필터링 완료! 관련 특허만 saved.")
 
-        # 업로드한 파일 경로
-        #file_path = '/Users/shinseungmin/Documents/벌토픽_전체코드/code/extract_end.csv'  # 업로드한 경로에 맞게 수정
-
-        #df = pd.read_csv(file_path)
-
-        # 출원일자에서 년도 추출
-        df['출원년도'] = df['출원일'].astype(str).str[:4].astype(int)
+        # 출원일자에서 년도 추출 (출원일은 특허 테이블에서 이미 날짜 타입)
+        df['출원년도'] = df['출원일'].dt.year
 
-        # 최근 10년 필터링
+        # 최근 RECENT_YEARS년 필터링
         current_year = datetime.now().year
-        df = df[df['출원년도'] >= (current_year - 20)]
+        df = df[df['출원년도'] >= (current_year - RECENT_YEARS)]
 
         # 저장
-        output_path = 'extract_end.csv'
-        df.to_csv(output_path, index=False)
+        write_patent_table(df.drop(columns=['combined', '출원년도']))
+        progress_reporter.report("특허 필터링 완료", len(df), len(df), f"특허 필터링 완료: {len(df)}개", force=True)
 
         # 결과 출력
         #rint(f"최근 10년 데이터 개수: {len(recent_10_years)}")
-        #print("파일이 /content/최근10년_특허 수정.csv 에 저장되었습니다.")
\ No newline at end of file
+        #print("파일이 /content/최근10년_특허 수정.csv 에 저장되었습니다.")
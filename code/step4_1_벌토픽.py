@@ -1,39 +1,33 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
-import os
-from sentence_transformers import SentenceTransformer
-from umap import UMAP
-from hdbscan import HDBSCAN
-from bertopic import BERTopic
+from patent_table import read_patent_table
+from topic_model_store import load_topic_run, save_topic_model, docs_fingerprint
+from topic_distribution import write_topic_distribution
+
+GTM_EMBEDDING_MODEL = 'jhgan/ko-sroberta-multitask'
+GTM_PARAMS = {"n_neighbors": 15, "n_components": 5, "min_dist": 0.0, "min_cluster_size": 15, "nr_topics": "auto"}
 
 class Step4_1_GTM:
     def GTM1(self):
         """
-        BERTopic 결과를 CSV 파일로 변환하여 저장하기
+        BERTopic 결과(문서별 대표 토픽, 상위 토픽 확률)를 문서 ID 기준 Arrow 파일로 저장하기
         """
         try:
-            # 필터링된 특허 데이터 읽기
-            filter_file_path = './extract_end.csv'
-            if os.path.exists(filter_file_path):
-                print("✅ 필터링된 데이터 사용")
-                filtered_df = pd.read_csv(filter_file_path)
-                if filtered_df.empty:
-                    print("❌ 필터링된 데이터가 비어있습니다.")
-                    return False
-                # 필터링된 데이터에서는 'text' 컬럼 사용
-                lemmatized_patents = filtered_df['lemmatized_text'].dropna().tolist()
-                patent_prep = filtered_df['text'].dropna().tolist()
+            # 필터링된 특허 데이터 읽기 (필요한 컬럼만, 문서 ID는 출원번호)
+            filtered_df = read_patent_table(columns=['lemmatized_text', '출원번호'])
+            if filtered_df is None:
+                print("❌ 데이터가 없습니다.")
+                return False
+            print("✅ 필터링된 데이터 사용")
+            if filtered_df.empty:
+                print("❌ 필터링된 데이터가 비어있습니다.")
+                return False
+            # 전처리 텍스트가 없는 행은 문서 ID와 함께 제외 (ID와 토픽 순서가 어긋나지 않게)
+            filtered_df = filtered_df.dropna(subset=['lemmatized_text'])
+            lemmatized_patents = filtered_df['lemmatized_text'].tolist()
+            if '출원번호' in filtered_df.columns:
+                doc_ids = filtered_df['출원번호'].fillna('').astype(str).tolist()
             else:
-                # 대안으로 extract_end.csv 사용
-                filtered_df = pd.read_csv('./extract_end.csv')
-                
-                if filtered_df.empty:
-                    print("❌ 데이터가 없습니다.")
-                    return False
-                    
-                # 전처리된 텍스트 리스트 생성
-                lemmatized_patents = filtered_df['lemmatized_text'].dropna().tolist()
-                patent_prep = filtered_df['text'].dropna().tolist()
+                doc_ids = [str(i) for i in filtered_df.index]
             
             if not lemmatized_patents:
                 print("❌ 전처리된 텍스트가 없습니다.")
@@ -41,59 +35,17 @@ class Step4_1_GTM:
             
             print(f"✅ {len(lemmatized_patents)}개의 문서로 토픽 모델링 시작")
             
-            # BERTopic 모델 설정
-            embedding_model = SentenceTransformer('jhgan/ko-sroberta-multitask')
-            
-            # UMAP 차원 축소
-            umap_model = UMAP(
-                n_neighbors=15,
-                n_components=5,
-                min_dist=0.0,
-                metric='cosine',
-                random_state=42
-            )
-            
-            # HDBSCAN 클러스터링
-            hdbscan_model = HDBSCAN(
-                min_cluster_size=15,
-                metric='euclidean',
-                cluster_selection_method='eom',
-                prediction_data=True
-            )
-            
-            # BERTopic 모델 생성
-            topic_model = BERTopic(
-                embedding_model=embedding_model,
-                umap_model=umap_model,
-                hdbscan_model=hdbscan_model,
-                nr_topics="auto",
-                calculate_probabilities=True,
-                verbose=True
-            )
-            
-            # 토픽 모델 훈련
-            topics, probabilities = topic_model.fit_transform(lemmatized_patents)
-
-            # --------------------------------------------------------------
-            # DataFrame 생성: 문서 ID(또는 텍스트)와 토픽 확률 분포를 하나의 테이블로 결합
-            # --------------------------------------------------------------
-
-            # 확률 분포 행렬(probabilities)을 DataFrame으로 변환
-            n_topics = probabilities.shape[1]
-            prob_df = pd.DataFrame(
-                probabilities,
-                columns=[f"Topic_{i}" for i in range(n_topics)]
-            )
-
-            # 문서 식별용 컬럼(Document)을 확률 분포 DataFrame 앞에 추가
-            prob_df.insert(0, "Document", patent_prep)
-
-            # 대표 토픽(최댓값을 가진 토픽 인덱스) 컬럼 추가
-            prob_df["Dominant_Topic"] = topics
+            # 같은 문서/설정으로 학습해 저장한 실행이 있으면 다시 학습하지 않고 토픽과 확률만 읽음
+            fingerprint = docs_fingerprint(lemmatized_patents, extra=[GTM_EMBEDDING_MODEL, GTM_PARAMS])
+            stored = load_topic_run(name="gtm", fingerprint=fingerprint)
+            if stored is not None and stored.probabilities is not None:
+                print(f"⚡ 저장된 토픽 모델 사용: topic_models/gtm/{stored.run_id}")
+                topics, probabilities = stored.topics, stored.probabilities
+            else:
+                topics, probabilities = self._fit(lemmatized_patents, fingerprint)
 
-            # CSV 파일로 저장
-            output_path = "BERTopic_topic_distribution.csv"
-            prob_df.to_csv(output_path, index=False)
+            # 문서 ID + 대표 토픽 + 상위 k개 토픽 확률(float32)만 저장 (문서 텍스트, 밀집 확률 행렬 CSV는 만들지 않음)
+            output_path = write_topic_distribution(doc_ids, topics, probabilities)
 
             print(f"BERTopic 토픽 분포가 '{output_path}' 파일로 저장되었습니다.")
             return True
@@ -102,6 +54,56 @@ class Step4_1_GTM:
             print(f"❌ GTM1 메서드 실행 중 오류 발생: {str(e)}")
             return False
 
+    def _fit(self, lemmatized_patents, fingerprint):
+        """
+        BERTopic을 학습하고 결과를 topic_models/gtm에 저장
+
+        Returns:
+            (list[int], np.ndarray): 문서별 토픽, 문서 × 토픽 확률
+        """
+        from sentence_models import encode_documents
+        from umap import UMAP
+        from hdbscan import HDBSCAN
+        from bertopic import BERTopic
+
+        # BERTopic 모델 설정 (모델은 프로세스당 한 번 로드, 임베딩은 한 번만 계산)
+        embedding_model, embeddings = encode_documents(lemmatized_patents, model_name=GTM_EMBEDDING_MODEL, fallback=None)
+        
+        # UMAP 차원 축소
+        umap_model = UMAP(
+            n_neighbors=GTM_PARAMS["n_neighbors"],
+            n_components=GTM_PARAMS["n_components"],
+            min_dist=GTM_PARAMS["min_dist"],
+            metric='cosine',
+            random_state=42
+        )
+        
+        # HDBSCAN 클러스터링
+        hdbscan_model = HDBSCAN(
+            min_cluster_size=GTM_PARAMS["min_cluster_size"],
+            metric='euclidean',
+            cluster_selection_method='eom',
+            prediction_data=True
+        )
+        
+        # BERTopic 모델 생성
+        topic_model = BERTopic(
+            embedding_model=embedding_model,
+            umap_model=umap_model,
+            hdbscan_model=hdbscan_model,
+            nr_topics=GTM_PARAMS["nr_topics"],
+            calculate_probabilities=True,
+            verbose=True
+        )
+        
+        # 토픽 모델 훈련
+        topics, probabilities = topic_model.fit_transform(lemmatized_patents, embeddings=embeddings)
+
+        run_id = save_topic_model(topic_model, topics, probabilities, name="gtm", fingerprint=fingerprint,
+                                  params=GTM_PARAMS, docs=lemmatized_patents, embeddings=embeddings)
+        print(f"💾 토픽 모델 저장: topic_models/gtm/{run_id}")
+        return topics, probabilities
+
     def GTM2(self):
         """
         GTM2 메서드 - 추가 GTM 관련 기능이 있다면 여기에 구현
@@ -9,6 +9,7 @@ except ImportError:
 import altair as alt
 from sklearn.preprocessing import StandardScaler
 import os
+from topic_distribution import DISTRIBUTION_PATH, TopicDistribution
 
 class Step4_2_GTM:
     def __init__(self, csv_path=None):
@@ -16,10 +17,10 @@ class Step4_2_GTM:
         GTM 모델을 활용한 토픽 시각화 클래스
         
         Args:
-            csv_path (str): BERTopic 결과 CSV 파일 경로
+            csv_path (str): BERTopic 결과 파일 경로 (Step4_1이 저장한 .arrow, 이전 형식 CSV도 읽음)
         """
         if csv_path is None:
-            self.csv_path = "BERTopic_topic_distribution.csv"
+            self.csv_path = DISTRIBUTION_PATH
         else:
             self.csv_path = csv_path
             
@@ -31,13 +32,16 @@ class Step4_2_GTM:
         
     def load_and_preprocess_data(self):
         """
-        CSV 파일 읽기 및 전처리
+        토픽 분포 파일 읽기 및 전처리
         """
         if not os.path.exists(self.csv_path):
-            print(f"❌ CSV 파일을 찾을 수 없습니다: {self.csv_path}")
+            print(f"❌ 토픽 분포 파일을 찾을 수 없습니다: {self.csv_path}")
             return False
+
+        if self.csv_path.endswith('.arrow'):
+            return self._load_distribution()
             
-        # CSV 파일 읽기
+        # 이전 형식 CSV 파일 읽기
         self.data_full = pd.read_csv(self.csv_path)
         
         # "Dominant_Topic" 컬럼에서 -1(잡음)인 행을 제거하여 시각화에서 제외
@@ -49,6 +53,23 @@ class Step4_2_GTM:
         
         print(f"✅ 데이터 로드 완료: {len(self.data_filtered)}개 문서, {len(prob_cols)}개 토픽")
         return True
+
+    def _load_distribution(self):
+        """
+        Step4_1의 Arrow 토픽 분포 읽기 (memory map, 대표 토픽/상위 토픽 확률은 복사 없이 numpy 뷰)
+        GTM 입력은 잡음(-1)을 뺀 문서만 (문서, 토픽) float32 행렬로 펼침
+        """
+        distribution = TopicDistribution(self.csv_path)
+        self.data_full = pd.DataFrame({
+            "doc_id": distribution.doc_ids.to_pandas(),
+            "Dominant_Topic": distribution.dominant_topic,
+        })
+        keep = distribution.dominant_topic != -1
+        self.data_filtered = self.data_full[keep].reset_index(drop=True)
+        self.prob_matrix = distribution.dense(keep)  # shape = (n_documents_filtered, n_topics)
+
+        print(f"✅ 데이터 로드 완료: {len(self.data_filtered)}개 문서, {distribution.n_topics}개 토픽")
+        return True
         
     def create_gtm_modes(self, k=6, m=5, s=0.2, regul=0.1, niter=200):
         """
@@ -968,79 +968,57 @@ import os
 os.environ["USE_TF"] = "0"
 os.environ["USE_TORCH"] = "1"
 
-# Compatibility patch for scipy.linalg.triu issue
-import numpy as np
-import scipy.linalg
-if not hasattr(scipy.linalg, 'triu'):
-    scipy.linalg.triu = np.triu
-
-# Compatibility patch for huggingface_hub
-try:
-    from huggingface_hub import cached_download
-except ImportError:
-    from huggingface_hub import hf_hub_download as cached_download
-    import huggingface_hub
-    huggingface_hub.cached_download = cached_download
-
-from tqdm import tqdm
-import itertools
-from umap import UMAP
-from hdbscan import HDBSCAN
-from bertopic import BERTopic
-from gensim.corpora import Dictionary
-from gensim.models.coherencemodel import CoherenceModel
-import os
-import json
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib as mpl
-from matplotlib.patches import Patch
-from bertopic import BERTopic
-import umap.umap_ as umap
-import torch
-import random
-from torch import nn
-import torch.nn.functional as F
-import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
-from tqdm import tqdm, tqdm_notebook
-from torch.optim import AdamW
-from transformers.optimization import get_cosine_schedule_with_warmup
-from kobert_transformers import get_kobert_model
-import nltk
-from itertools import product
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-from nltk import pos_tag
-from sklearn.preprocessing import normalize
-import pandas as pd
-# Java 불필요한 한국어 NLP 라이브러리 사용
-try:
-    from kiwipiepy import Kiwi
-    USE_KIWI = True
-except ImportError:
+import re
+from phrase_matcher import PhraseMatcher, load_phrases
+from patent_preprocessor import PatentPreprocessor, PREPROCESSOR_VERSION
+from corpus_cache import CorpusCache, corpus_fingerprint
+
+
+def _patch_compat():
+    """BERTopic 관련 라이브러리를 로드하기 전에 적용하는 호환 패치"""
+    # Compatibility patch for scipy.linalg.triu issue
+    import numpy as np
+    import scipy.linalg
+    if not hasattr(scipy.linalg, 'triu'):
+        scipy.linalg.triu = np.triu
+
+    # Compatibility patch for huggingface_hub
     try:
-        from konlpy.tag import Okt
-        USE_KIWI = False
+        from huggingface_hub import cached_download
     except ImportError:
-        USE_KIWI = None
-from transformers import BertModel, BertTokenizer
-from transformers import AutoModel
-from bertopic import BERTopic
-from bertopic.vectorizers import ClassTfidfTransformer
-from sklearn.feature_extraction.text import CountVectorizer
-try:
-    from ugtm import eGTM
-except ImportError:
-    eGTM = None
-    print("Warning: ugtm not available due to compatibility issues")
-import umap
-import hdbscan
-import re
+        from huggingface_hub import hf_hub_download as cached_download
+        import huggingface_hub
+        huggingface_hub.cached_download = cached_download
+
 
 class Step4:
-    def ber(self):
+    def ber(self, search_budget=None, incremental=False):
+        # 무거운 ML 라이브러리(torch, BERTopic, UMAP, matplotlib 등)는 Step4를 실제로 실행할 때만 로드
+        # (main/web_api/app/test는 이 모듈을 import하므로 시작할 때마다 로드하지 않도록 함)
+        _patch_compat()
+        import random
+        import numpy as np
+        import torch
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Patch
+        import umap
+        import hdbscan
+        from bertopic import BERTopic
+        from bertopic.vectorizers import ClassTfidfTransformer
+        from sklearn.feature_extraction.text import CountVectorizer
+        # Java 불필요한 한국어 NLP 라이브러리 사용 (Kiwi 우선, 없으면 Okt)
+        from korean_tokenizer import KoreanTokenizer, USE_KIWI
+        from patent_table import read_patent_table, count_patent_rows
+        from sentence_models import encode_documents
+        from topic_online import ONLINE_MIN_DOCS
+        from reduction_cache import ReductionCache, CachedUMAP
+        from topic_grid_search import TopicGridSearch, PARAM_NAMES
+        from topic_coherence import CoherenceEvaluator
+        from topic_budget_search import BudgetedTopicSearch
+        from topic_model_store import save_topic_model, load_topic_run, docs_fingerprint
+        from topic_incremental import IncrementalTopicAssigner
+        from nltk_resources import ensure_nltk_resources
         
         
         autonomous_robot_topics = {
@@ -1071,42 +1049,33 @@ class Step4:
         }
         #return autonomous_robot_topics
         
-        nltk.download('punkt')
-        nltk.download('wordnet')
-        nltk.download('stopwords')
-        nltk.download('averaged_perceptron_tagger')
-
-        file_path = './extract_end.csv'
-        patent = pd.read_csv(file_path)
+        # NLTK 리소스는 로컬에서 프로세스당 한 번만 확인 (실행 중 다운로드/네트워크 없음)
+        ensure_nltk_resources()
+
+        # 특허가 아주 많으면 전체 임베딩/UMAP/확률 행렬을 메모리에 올리지 않는 온라인 모드로 진행
+        n_rows = count_patent_rows()
+        if n_rows and n_rows >= ONLINE_MIN_DOCS and not search_budget:
+            print(f"📚 특허 {n_rows}건: 온라인 토픽 모델링으로 진행합니다.")
+            return self.ber_online()
+
+        # 요약/제목 컬럼만 읽기
+        patent = read_patent_table(columns=['astrtCont', '발명명칭'])
+        if patent is None:
+            print("❌ extract_end 특허 테이블을 찾을 수 없습니다.")
+            return {}
 
         summ = patent['astrtCont']+patent['발명명칭']
         #summ=patent['청구항']
         #print(summ)
-        # 표제어 추출기 설정
-        lemmatizer = WordNetLemmatizer()
-
-
-        def wordnet_pos_tags_kor(treebank_tag):
-            """Converts POS tags from Korean treebank format to WordNet format."""
-            if treebank_tag.startswith('VA') or treebank_tag.startswith('VV'):
-                return 'v'  # verb
-            elif treebank_tag.startswith('N'):
-                return 'n'  # noun
-            elif treebank_tag.startswith('M'):
-                return 'r'  # adverb (관형사, 부사)
-            elif treebank_tag.startswith('XR') or treebank_tag.startswith('MM'):
-                return 'a'  # adjective (어근, 관형사)
-            else:
-                return 'n'  # default to noun
 
-        # 한국어 NLP 라이브러리 초기화
+        # 한국어 NLP 라이브러리 초기화 (여러 문서를 묶어서 병렬로 분석)
         if USE_KIWI:
-            kiwi = Kiwi()
-            print("✅ Kiwi 형태소 분석기 사용 (Java 불필요)")
+            tokenizer = KoreanTokenizer()
+            print(f"✅ Kiwi 형태소 분석기 사용 (Java 불필요, {tokenizer.num_workers}개 스레드)")
         elif USE_KIWI == False:
             try:
-                okt = Okt()
-                print("✅ KoNLPy Okt 형태소 분석기 사용")
+                tokenizer = KoreanTokenizer()
+                print(f"✅ KoNLPy Okt 형태소 분석기 사용 ({tokenizer.num_workers}개 프로세스)")
             except Exception as e:
                 print(f"⚠️ KoNLPy 초기화 실패 (Java 환경 문제): {e}")
                 print("💡 해결 방법:")
@@ -1125,16 +1094,10 @@ class Step4:
         with open('data/eng_data.txt', 'r', encoding='utf-8') as f:
             eng_keywords = set(line.strip().lower() for line in f if line.strip())
 
-        # 0.3) 복합 키워드(raw_phrases) 로드 → 소문자 키, 소문자 값(glued)으로 통일
-        with open('data/phrase_data.txt', 'r', encoding='utf-8') as f:
-            raw_phrases = [line.strip() for line in f if line.strip()]
-
-        # 길이가 긴 순서대로 정렬한 뒤, 키와 값을 모두 소문자로 바꿔서 저장
-        raw_phrases.sort(key=len, reverse=True)
-        concat_phrases = {
-            ph.lower(): ph.replace(' ', '').lower()
-            for ph in raw_phrases
-        }
+        # 0.3) 복합 키워드(raw_phrases) 로드 → 소문자 키, 소문자 값(glued)으로 통일 (긴 것부터)
+        concat_phrases = load_phrases('data/phrase_data.txt')
+        # 사전 전체를 정규식 하나로 컴파일 → 문서당 한 번만 훑음
+        phrase_matcher = PhraseMatcher(concat_phrases)
 
         # ───────────────────────────────────────────────────────────────
         # 1) 원본 “청구항” 리스트(summ)에서 실제로 등장한 복합어·영어 키워드만 추려내기
@@ -1152,9 +1115,7 @@ class Step4:
             lower = summary.lower()
 
             # 1.1) 복합어 등장 체크 (소문자 키 기준, IGNORECASE 안전장치)
-            for ph_lower, glued_lower in concat_phrases.items():
-                if re.search(re.escape(ph_lower), lower, flags=re.IGNORECASE):
-                    used_phrases.add(glued_lower)
+            used_phrases.update(phrase_matcher.find(lower))
 
             # 1.2) 영어 키워드 등장 체크
             for w in re.findall(r'\b[a-zA-Z]+\b', lower):
@@ -1163,143 +1124,17 @@ class Step4:
                     used_eng.add(lw)
 
         # ───────────────────────────────────────────────────────────────
-        # 2) 전처리 함수: 복합어 치환 → 불용어 제거 → 형태소 분석용 토큰화
+        # 2) 전처리: 복합어 치환 → 형태소 분석(문서당 한 번, 형태·품사 함께) → 불용어/품사 필터
         # ───────────────────────────────────────────────────────────────
-
-        def preprocess_patent_summaries(summaries):
-            preprocessed_summaries = []
-
-            for summary in summaries:
-                if not isinstance(summary, str):
-                    preprocessed_summaries.append("")
-                    continue
-
-                text = summary
-
-                # 2.1) 보호할 복합어(glued) 치환 (key=ph_lower, value=glued_lower 모두 소문자)
-                #     → IGNORECASE로 대소문자 무시하며 치환
-                for ph_lower, glued_lower in concat_phrases.items():
-                    text = re.sub(re.escape(ph_lower), glued_lower, text, flags=re.IGNORECASE)
-
-                # 2.2) 치환된 복합어를 등장 횟수만큼 수집 (사후 처리 위해)
-                found_phrases = []
-                for ph_lower, glued_lower in concat_phrases.items():
-                    # text도 소문자 변환해서 검사하면 안전하지만, 이미 위 치환에서 한 번 처리됨
-                    count = len(re.findall(re.escape(glued_lower), text, flags=re.IGNORECASE))
-                    if count:
-                        found_phrases.extend([glued_lower] * count)
-
-                # 2.3) 영어 키워드를 등장 횟수만큼 수집
-                raw_eng = re.findall(r'\b[a-zA-Z]+\b', text)
-                kept_eng = []
-                for w in raw_eng:
-                    lw = w.lower()
-                    if lw in eng_keywords:
-                        kept_eng.append(lw)
-
-                # 2.4) 한글과 공백만 남기기 (숫자가 필요 없으면 제거)
-                kor_only = re.sub(r'[^가-힣\s]', ' ', text)
-                kor_only = re.sub(r'\s+', ' ', kor_only).strip()
-
-                # 2.5) 형태소 분석 → 불용어 제거
-                if USE_KIWI:
-                    # Kiwi는 tokenize() 메서드를 사용하고 form을 추출
-                    tokens = [token.form for token in kiwi.tokenize(kor_only)]
-                else:
-                    tokens = okt.morphs(kor_only, stem=True)
-                tokens = [t for t in tokens if t not in stop_words]
-
-                components = set()
-                for ph_lower, glued_lower in concat_phrases.items():
-                    if re.search(re.escape(glued_lower), text, flags=re.IGNORECASE):
-                        # ⟶ ph_lower에 공백이 있었다면 ph_lower.split()으로 분리된 단어들을 components에 추가하는 기존 방식 대신
-                        #     glued_lower(공백 없는 형태)만 components로 두면, “아웃바운드” 자체만 제거 대상이 됨.
-                        components.add(glued_lower)
-
-                # 2.7) components에 포함된 토큰 제거
-                tokens = [t for t in tokens if t not in components]
-
-                # 2.8) 보호된 복합어·영어 키워드 횟수만큼 재추가
-                tokens.extend(found_phrases)
-                tokens.extend(kept_eng)
-
-                preprocessed_summaries.append(" ".join(tokens))
-
-            return preprocessed_summaries
-
-        def extract_lemmatized_tokens(pre_docs):
-            """
-            pre_docs : preprocess_patent_summaries를 통과한 문장 문자열 리스트
-
-            내부에서 전역 변수 concat_phrases, eng_keywords를 참조하여,
-            Okt가 분리한 복합어 하위 토큰 제거 후, 복합어 전체만 남김.
-            """
-            lemmatized_docs = []
-
-            for doc in pre_docs:
-                text = doc if isinstance(doc, str) else ""
-
-                # 3.1) 형태소 태깅
-                if USE_KIWI:
-                    # Kiwi의 경우 pos() 메서드 사용
-                    tokens_with_pos = [(token.form, token.tag) for token in kiwi.tokenize(text)]
-                else:
-                    tokens_with_pos = okt.pos(text, stem=True)
-
-                # 3.2) 복합어(glued) 등장 횟수만큼 수집
-                found_phrases = []
-                for ph_lower, glued_lower in concat_phrases.items():
-                    count = len(re.findall(re.escape(glued_lower), text, flags=re.IGNORECASE))
-                    if count:
-                        found_phrases.extend([glued_lower] * count)
-
-                # 3.3) 중간 표제어 수집
-                lem = []
-                for token, tag in tokens_with_pos:
-                    # 3.3.1) 영어 키워드(소문자)인 경우
-                    if token.lower() in eng_keywords:
-                        lem.append(token)
-                        continue
-
-                    # 3.3.2) Okt가 통째로 인식한 복합어인 경우 (예: "아웃바운드")
-                    #        ⟶ concat_phrases.values()는 모두 소문자 glue 형태임.
-                    if token.lower() in concat_phrases.values():
-                        lem.append(token)
-                        continue
-
-                    # 3.3.3) 일반 명사/동사/형용사/영문 알파벳 태그인 경우
-                    if wordnet_pos_tags_kor(tag):
-                        lem.append(token)
-                        continue
-
-                    # 그 외는 버림
-
-                # 3.4) cleanup: 복합어 일부로 분리된 하위 토큰(예: "아웃", "바운드") 제거
-                cleaned = []
-                for token in lem:
-                    is_subpart = False
-                    for glued_lower in found_phrases:
-                        # token이 glued_lower(예: "아웃바운드") 하위 문자열인지 검사
-                        if token.lower() in glued_lower:
-                            is_subpart = True
-                            break
-                    if not is_subpart:
-                        cleaned.append(token)
-
-                # 3.5) 복합어 전체(glued) 등장 횟수만큼 다시 추가
-                cleaned.extend(found_phrases)
-
-                # 3.6) 최종 저장
-                lemmatized_docs.append(" ".join(cleaned).strip())
-
-            return lemmatized_docs
-
-        # 특허 요약문 전처리
-        patent_prep = preprocess_patent_summaries(summ)
-        #print(patent_prep)
-
-        # 4.4) 표제어(lemma) 추출: 복합어 분리 방지 로직
-        lemmatized_patents = extract_lemmatized_tokens(patent_prep)
+        preprocessor = PatentPreprocessor(stop_words, eng_keywords, phrase_matcher, tokenizer)
+
+        # 특허 요약문 전처리 + 표제어(lemma) 추출: 복합어 분리 방지 로직
+        # (이전 실행 결과를 재사용하고, 원문이 바뀐 문서만 다시 전처리. 사전 파일을 수정하면 전부 다시 전처리)
+        fingerprint = corpus_fingerprint(tokenizer.version, PREPROCESSOR_VERSION)
+        with CorpusCache(fingerprint) as corpus_cache:
+            lemmatized_patents = corpus_cache.lemmatize(summ, preprocessor.lemmatize)
+            print(f"전처리 캐시: {corpus_cache.hits}개 재사용, {corpus_cache.misses}개 새로 전처리")
+        tokenizer.close()
         #print(f'len:{len(lemmatized_patents)}')
         
         # 데이터 검증: 빈 데이터 확인
@@ -1316,6 +1151,29 @@ class Step4:
         
         print(f"✅ {len(lemmatized_patents)}개의 전처리된 문서로 토픽 모델링을 진행합니다.")
 
+        # 증분 모드: 마지막으로 저장한 실행에 새 문서만 배정 (임베딩은 캐시, 새 문서만 인코딩)
+        # 토픽 분포가 임계값 이상 바뀌었거나 새 문서가 많으면 아래에서 전체를 다시 학습
+        stored = load_topic_run(name="step4") if incremental and not search_budget else None
+        if stored is not None:
+            try:
+                assigner = IncrementalTopicAssigner(stored)
+                new_indices = assigner.new_documents(lemmatized_patents)
+                if new_indices:
+                    new_docs = [lemmatized_patents[i] for i in new_indices]
+                    _, new_embeddings = encode_documents(new_docs)
+                    assigner.assign(new_docs, new_embeddings)
+                drift = assigner.drift()
+            except ValueError as e:
+                print(f"⚠️ 증분 배정을 할 수 없어 다시 학습합니다: {e}")
+            else:
+                print(f"🧩 새 문서 {len(new_indices)}개를 저장된 실행 {stored.run_id}에 배정 "
+                      f"(누적 {drift['n_new']}개, -1 비율 {drift['outlier_rate']:.0%}, {drift['reason']})")
+                if not drift["refit"]:
+                    return stored.topics_dict()
+                print("🔄 토픽 분포가 바뀌어 전체를 다시 학습합니다.")
+        elif incremental:
+            print("⚠️ 저장된 토픽 모델이 없어 전체를 학습합니다.")
+
         # 4.5) all_tokens 생성
         all_tokens = set()
         for doc in lemmatized_patents:
@@ -1365,159 +1223,139 @@ class Step4:
 
         mpl.rcParams['font.family'] = pret_name
         mpl.rcParams['axes.unicode_minus'] = False   # 한글 사용 시 마이너스 깨짐 방지
-        from sentence_transformers import SentenceTransformer
-        # Hugging Face 429 에러 임시 해결책 - 다른 모델 사용
-        try:
-            embedding_model = SentenceTransformer("snunlp/KR-SBERT-V40K-klueNLI-augSTS")
-        except Exception as e:
-            print(f"KR-SBERT 모델 로드 실패, 대체 모델 사용: {e}")
-            # 대체 모델 사용
-            embedding_model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
-
+        # 한국어 특화 SBERT (프로세스당 한 번만 로드, 실패하면 다국어 모델로 대체)
         # lemmatized_patents: 이미 전처리가 끝난 특허 텍스트 리스트 (예: ["문서1", "문서2", ...])
-        embeddings = embedding_model.encode(
-            lemmatized_patents,
-            show_progress_bar=True,
-            convert_to_numpy=True
-        )
+        # 임베딩은 여기서 한 번만 계산하고 (캐시에 없는 문서만 인코딩) 모든 fit_transform과 시각화에 재사용
+        embedding_model, embeddings = encode_documents(lemmatized_patents)
         # embeddings.shape == (문서 수, 임베딩 차원)
 
         # ─── 3. 2D 전용 UMAP 투영 ────────────────────────────────────────────────────
-        umap_2d = umap.UMAP(
+        # kNN 그래프는 한 번만 계산해서 아래 본 모델의 UMAP과 공유
+        reduction_cache = ReductionCache(embeddings, metric='cosine', random_state=42)
+        _, umap_embeddings_2d = reduction_cache.reduce(
             n_neighbors=15,
             n_components=2,  # 2차원으로 축소 (시각화용)
-            metric='cosine',
-            min_dist=0.1,
-            random_state=42
+            min_dist=0.1
         )
-        umap_embeddings_2d = umap_2d.fit_transform(embeddings)
         # umap_embeddings_2d.shape == (문서 수, 2)
 
-        # ─── 4. BERTopic으로부터 토픽(label) 정보 가져오기 ──────────────────────────────
-        # 이미 학습된 topic_model 객체가 메모리에 올라와 있어야 합니다.
-        # 예: topic_model = BERTopic(...); topics, probabilities = topic_model.fit_transform(lemmatized_patents)
-
-        topic_model = BERTopic(
-            embedding_model=embedding_model,
-            umap_model=umap_2d  # 기존에 만든 umap_2d 사용
-        )
-        #print(f'check:{lemmatized_patents}')
-        topics, probabilities = topic_model.fit_transform(lemmatized_patents)
-        # topics: 길이 == 문서 수, 예) [0, 2, 1, 1, -1, 3, …]
-
-        # ─── 5. 사용자 지정 토픽별 색상 매핑 ─────────────────────────────────────────
-        # 토픽 0~5와 노이즈(-1)를 위한 색상 딕셔너리
-        topic_to_color = {
-            0: "#8dd3c7",  # Topic 0 → 연한 청록
-            1: "#4eb3d3",  # Topic 1 → 중간 톤 파랑
-            2: "#08589e",  # Topic 2 → 진한 남색
-            3: "#fdb462",  # Topic 3 → 연한 주황
-            4: "#fb8072",  # Topic 4 → 부드러운 코랄 레드
-            5: "#b30000",  # Topic 5 → 진한 붉은 주황
-            -1: (0.50, 0.50, 0.50, 0.6)  # Topic -1 (노이즈) → 연회색 투명
-        }
+        # ─── 4. 토픽(label) 정보: 아래에서 학습하는 본 BERTopic 모델의 topics로 색칠 ──────────
+        # (시각화만을 위해 별도 BERTopic을 학습하지 않음)
+        def plot_umap_topics(topics):
+            """topics: 길이 == 문서 수, 예) [0, 2, 1, 1, -1, 3, …]"""
+            # ─── 5. 사용자 지정 토픽별 색상 매핑 ─────────────────────────────────────────
+            # 토픽 0~5와 노이즈(-1)를 위한 색상 딕셔너리
+            topic_to_color = {
+                0: "#8dd3c7",  # Topic 0 → 연한 청록
+                1: "#4eb3d3",  # Topic 1 → 중간 톤 파랑
+                2: "#08589e",  # Topic 2 → 진한 남색
+                3: "#fdb462",  # Topic 3 → 연한 주황
+                4: "#fb8072",  # Topic 4 → 부드러운 코랄 레드
+                5: "#b30000",  # Topic 5 → 진한 붉은 주황
+                -1: (0.50, 0.50, 0.50, 0.6)  # Topic -1 (노이즈) → 연회색 투명
+            }
 
-        # 문서별 할당된 토픽 번호로 색상 리스트 생성
-        point_colors = [topic_to_color.get(t, 'lightgray') for t in topics]
-
-        # ─── 6. 2D UMAP 위에 토픽별 산점도 그리기 ────────────────────────────────────
-        plt.figure(figsize=(14, 10))
-        plt.scatter(
-            umap_embeddings_2d[:, 0],  # x축 좌표
-            umap_embeddings_2d[:, 1],  # y축 좌표
-            c=point_colors,  # 토픽별 사용자 지정 색상
-            s=70,  # 점 크기
-            alpha=0.6,  # 투명도
-            edgecolor='none'
-        )
+            # 문서별 할당된 토픽 번호로 색상 리스트 생성
+            point_colors = [topic_to_color.get(t, 'lightgray') for t in topics]
+
+            # ─── 6. 2D UMAP 위에 토픽별 산점도 그리기 ────────────────────────────────────
+            plt.figure(figsize=(14, 10))
+            plt.scatter(
+                umap_embeddings_2d[:, 0],  # x축 좌표
+                umap_embeddings_2d[:, 1],  # y축 좌표
+                c=point_colors,  # 토픽별 사용자 지정 색상
+                s=70,  # 점 크기
+                alpha=0.6,  # 투명도
+                edgecolor='none'
+            )
 
-        # ─── 7. 토픽 중심(centroid)에 “Topic {번호}”만 표시 ──────────────────────────────
-        for t in [0, 1, 2, 3, 4, 5]:
-            # 해당 토픽 t에 속한 문서들의 인덱스만 모읍니다.
-            indices = [i for i, topic_id in enumerate(topics) if topic_id == t]
-            if len(indices) == 0:
-                continue  # 해당 토픽에 문서가 없으면 건너뜁니다.
-
-            cluster_points = umap_embeddings_2d[indices]
-            centroid = cluster_points.mean(axis=0)
-
-            # “Topic {번호}”만 표시
-            label_text = f"Topic {t}"
-
-            plt.text(
-                centroid[0], centroid[1], label_text,
-                fontsize=12,
-                weight='bold',
-                color='black',
-                ha='center',
-                va='center',
-                bbox=dict(
-                    facecolor='white',
-                    alpha=0.7,
-                    edgecolor='gray',
-                    linewidth=0.5,
-                    boxstyle='round,pad=0.3'
+            # ─── 7. 토픽 중심(centroid)에 “Topic {번호}”만 표시 ──────────────────────────────
+            for t in [0, 1, 2, 3, 4, 5]:
+                # 해당 토픽 t에 속한 문서들의 인덱스만 모읍니다.
+                indices = [i for i, topic_id in enumerate(topics) if topic_id == t]
+                if len(indices) == 0:
+                    continue  # 해당 토픽에 문서가 없으면 건너뜁니다.
+
+                cluster_points = umap_embeddings_2d[indices]
+                centroid = cluster_points.mean(axis=0)
+
+                # “Topic {번호}”만 표시
+                label_text = f"Topic {t}"
+
+                plt.text(
+                    centroid[0], centroid[1], label_text,
+                    fontsize=12,
+                    weight='bold',
+                    color='black',
+                    ha='center',
+                    va='center',
+                    bbox=dict(
+                        facecolor='white',
+                        alpha=0.7,
+                        edgecolor='gray',
+                        linewidth=0.5,
+                        boxstyle='round,pad=0.3'
+                    )
                 )
-            )
 
-        # ─── 8. 범례(Legend) 생성 ──────────────────────────────────────────────────
-        legend_handles = [
-            Patch(facecolor=topic_to_color[-1], edgecolor='none', label="Topic –1 (Noise)"),
-            Patch(facecolor=topic_to_color[0], edgecolor='none', label="Topic 0"),
-            Patch(facecolor=topic_to_color[1], edgecolor='none', label="Topic 1"),
-            Patch(facecolor=topic_to_color[2], edgecolor='none', label="Topic 2"),
-            Patch(facecolor=topic_to_color[3], edgecolor='none', label="Topic 3"),
-            Patch(facecolor=topic_to_color[4], edgecolor='none', label="Topic 4"),
-            Patch(facecolor=topic_to_color[5], edgecolor='none', label="Topic 5")
-        ]
-        plt.legend(
-            handles=legend_handles,
-            title="토픽 번호",
-            bbox_to_anchor=(1.02, 1),
-            loc='upper left',
-            borderaxespad=0.3,
-            fontsize=11,
-            title_fontsize=12
-        )
+            # ─── 8. 범례(Legend) 생성 ──────────────────────────────────────────────────
+            legend_handles = [
+                Patch(facecolor=topic_to_color[-1], edgecolor='none', label="Topic –1 (Noise)"),
+                Patch(facecolor=topic_to_color[0], edgecolor='none', label="Topic 0"),
+                Patch(facecolor=topic_to_color[1], edgecolor='none', label="Topic 1"),
+                Patch(facecolor=topic_to_color[2], edgecolor='none', label="Topic 2"),
+                Patch(facecolor=topic_to_color[3], edgecolor='none', label="Topic 3"),
+                Patch(facecolor=topic_to_color[4], edgecolor='none', label="Topic 4"),
+                Patch(facecolor=topic_to_color[5], edgecolor='none', label="Topic 5")
+            ]
+            plt.legend(
+                handles=legend_handles,
+                title="토픽 번호",
+                bbox_to_anchor=(1.02, 1),
+                loc='upper left',
+                borderaxespad=0.3,
+                fontsize=11,
+                title_fontsize=12
+            )
 
-        # ─── 9. 제목 및 축 레이블 등 꾸미기 ─────────────────────────────────────────
-        plt.title(
-            "UMAP 2D 문서 임베딩과 BERTopic 토픽 분포",
-            fontsize=20,
-            pad=20
-        )
-        plt.xlabel("UMAP Dimension 1", fontsize=14)
-        plt.ylabel("UMAP Dimension 2", fontsize=14)
+            # ─── 9. 제목 및 축 레이블 등 꾸미기 ─────────────────────────────────────────
+            plt.title(
+                "UMAP 2D 문서 임베딩과 BERTopic 토픽 분포",
+                fontsize=20,
+                pad=20
+            )
+            plt.xlabel("UMAP Dimension 1", fontsize=14)
+            plt.ylabel("UMAP Dimension 2", fontsize=14)
 
-        # 축 눈금 제거
-        plt.xticks([])
-        plt.yticks([])
+            # 축 눈금 제거
+            plt.xticks([])
+            plt.yticks([])
 
-        plt.tight_layout()
+            plt.tight_layout()
 
-        # Jupyter Notebook(.ipynb) 환경에서는 plt.show() 한 줄만으로 인라인 렌더링됩니다.
-        # plt.show()
+            # Jupyter Notebook(.ipynb) 환경에서는 plt.show() 한 줄만으로 인라인 렌더링됩니다.
+            # plt.show()
 
-        # ─── 10. 벡터 형식 저장 (기존 파일 덮어쓰기) ─────────────────────────────────────────
-        import time
-        umap_file = "umap2d_topics_custom_color_pret.png"
+            # ─── 10. 벡터 형식 저장 (기존 파일 덮어쓰기) ─────────────────────────────────────────
+            import time
+            umap_file = "umap2d_topics_custom_color_pret.png"
         
-        # 파일이 이미 존재하면 건너뛰기
-        if os.path.exists(umap_file):
-            print(f"⏭️ UMAP 시각화 파일이 이미 존재합니다. 건너뜁니다: {umap_file}")
-        else:
-            print(f"📊 UMAP 시각화 파일을 새로 생성합니다: {umap_file}")
-            plt.savefig(umap_file, dpi=300)
-            
-            # 파일이 제대로 생성되었는지 확인
+            # 파일이 이미 존재하면 건너뛰기
             if os.path.exists(umap_file):
-                file_size = os.path.getsize(umap_file)
-                print(f"✅ UMAP 시각화 저장 완료: {umap_file} ({file_size} bytes)")
+                print(f"⏭️ UMAP 시각화 파일이 이미 존재합니다. 건너뜁니다: {umap_file}")
             else:
-                print(f"❌ UMAP 시각화 파일 저장 실패: {umap_file}")
+                print(f"📊 UMAP 시각화 파일을 새로 생성합니다: {umap_file}")
+                plt.savefig(umap_file, dpi=300)
+            
+                # 파일이 제대로 생성되었는지 확인
+                if os.path.exists(umap_file):
+                    file_size = os.path.getsize(umap_file)
+                    print(f"✅ UMAP 시각화 저장 완료: {umap_file} ({file_size} bytes)")
+                else:
+                    print(f"❌ UMAP 시각화 파일 저장 실패: {umap_file}")
             
-        plt.close()  # 메모리 정리
-        # plt.savefig("umap2d_topics_custom_color_pret.svg", dpi=300)
+            plt.close()  # 메모리 정리
+            # plt.savefig("umap2d_topics_custom_color_pret.svg", dpi=300)
 
 
 
@@ -1596,15 +1434,7 @@ class Step4:
         # cTF-IDF 모델 설정
         ctfidf_model = ClassTfidfTransformer(bm25_weighting=True, reduce_frequent_words=False)   #bm25_weighting=True, reduce_frequent_words=True)
 
-        from sentence_transformers import SentenceTransformer, util
-        # 2) 한국어 특화 SBERT 로드
-        # Hugging Face 429 에러 임시 해결책 - 다른 모델 사용
-        try:
-            embedding_model = SentenceTransformer("snunlp/KR-SBERT-V40K-klueNLI-augSTS")
-        except Exception as e:
-            print(f"KR-SBERT 모델 로드 실패, 대체 모델 사용: {e}")
-            # 대체 모델 사용
-            embedding_model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+        # 2) 한국어 특화 SBERT: 위에서 로드한 embedding_model과 embeddings를 그대로 사용
         # ===============================================
         # 그리드서치 실행 여부 설정
         # ===============================================
@@ -1618,16 +1448,28 @@ class Step4:
             "min_cluster_size": 40
         }
         
-        if USE_GRID_SEARCH:
+        if search_budget:
+            # 시간 예산(초)이 주어지면 전체 그리드(6×3×2×6 = 216회 학습) 대신
+            # 부분 코퍼스 successive halving + TPE 샘플러로 예산 안에서 탐색
+            search_space = {
+                "n_neighbors": [10, 15, 20, 30, 40, 50],
+                "n_components": [5, 8, 10],
+                "min_dist": [0, 0.01],
+                "min_cluster_size": [15, 20, 25, 30, 40, 50]
+            }
+            budget_search = BudgetedTopicSearch(
+                lemmatized_patents,
+                reduction_cache,
+                vectorizer_model=vectorizer_model,
+                ctfidf_model=ctfidf_model,
+                hdbscan_model=hdbscan_model,
+                topic_model_kwargs={"language": "korean", "nr_topics": 6, "top_n_words": 15}
+            )
+            best = budget_search.run(search_space, search_budget)
+            if best:
+                PRESET_PARAMS = {name: best[name] for name in PARAM_NAMES}
+        elif USE_GRID_SEARCH:
             print("🔍 그리드서치를 실행합니다...")
-            #def grid():
-            # 환경 변수 및 시드 설정
-            os.environ["TOKENIZERS_PARALLELISM"] = "false"
-            seed = 42
-            #print(f'len:{len(lemmatized_patents)}')
-            # 문서 토큰화 준비
-            texts = [doc.split() for doc in lemmatized_patents]
-            dictionary = Dictionary(texts)
 
             #하이퍼파라미터 그리드 정의
             # param_grid = {
@@ -1643,129 +1485,220 @@ class Step4:
                 "min_dist": [0.01],
                 "min_cluster_size": [40]
             }
-        else:
-            print("⚡ 미리 설정된 파라미터로 바로 진행합니다...")
-            print(f"   - n_neighbors: {PRESET_PARAMS['n_neighbors']}")
-            print(f"   - n_components: {PRESET_PARAMS['n_components']}")
-            print(f"   - min_dist: {PRESET_PARAMS['min_dist']}")
-            print(f"   - min_cluster_size: {PRESET_PARAMS['min_cluster_size']}")
-            
-            # 그리드서치 없이 바로 BERTopic 모델 훈련으로 건너뛰기
-            # UMAP 모델 설정 (미리 설정된 파라미터 사용)
-            umap_model = umap.UMAP(
-                n_neighbors=PRESET_PARAMS["n_neighbors"], 
-                n_components=PRESET_PARAMS["n_components"], 
-                min_dist=PRESET_PARAMS["min_dist"], 
-                metric='cosine', 
-                random_state=seed
-            )
-            
-            # HDBSCAN 모델 설정 (미리 설정된 파라미터 사용)
-            hdbscan_model = hdbscan.HDBSCAN(
-                min_cluster_size=PRESET_PARAMS["min_cluster_size"], 
-                min_samples=2, 
-                metric='euclidean', 
-                cluster_selection_method='eom', 
-                prediction_data=True
-            )
-            
-            # BERTopic 모델 초기화 및 훈련 (미리 설정된 파라미터 사용)
-            topic_model = BERTopic(
-                language="korean",
-                calculate_probabilities=True,
-                nr_topics=6,
-                top_n_words=15,
+
+            # (n_neighbors, n_components, min_dist)마다 UMAP 한 번에 모든 min_cluster_size를 병렬로 평가
+            # 결과는 grid_search_results.jsonl에 추가만 하므로, 중단 후 다시 실행하면 남은 조합만 평가
+            grid_search = TopicGridSearch(
+                lemmatized_patents,
+                reduction_cache,
                 vectorizer_model=vectorizer_model,
-                embedding_model=embedding_model,
-                umap_model=umap_model,
-                hdbscan_model=hdbscan_model,
                 ctfidf_model=ctfidf_model,
-                verbose=True
+                hdbscan_model=hdbscan_model,
+                topic_model_kwargs={"language": "korean", "nr_topics": 6, "top_n_words": 15}
             )
+            best = grid_search.run(param_grid)
+            if best:
+                PRESET_PARAMS = {name: best[name] for name in PARAM_NAMES}
+        else:
+            print("⚡ 미리 설정된 파라미터로 바로 진행합니다...")
+
+        print(f"   - n_neighbors: {PRESET_PARAMS['n_neighbors']}")
+        print(f"   - n_components: {PRESET_PARAMS['n_components']}")
+        print(f"   - min_dist: {PRESET_PARAMS['min_dist']}")
+        print(f"   - min_cluster_size: {PRESET_PARAMS['min_cluster_size']}")
+        
+        # 탐색한 최적 조합(또는 미리 설정된 파라미터)으로 BERTopic 모델 훈련
+        # UMAP 모델 설정 (미리 설정된 파라미터 사용)
+        # (2D 투영과 같은 kNN 그래프 재사용)
+        umap_model = CachedUMAP(
+            reduction_cache,
+            n_neighbors=PRESET_PARAMS["n_neighbors"], 
+            n_components=PRESET_PARAMS["n_components"], 
+            min_dist=PRESET_PARAMS["min_dist"]
+        )
+        
+        # HDBSCAN 모델 설정 (미리 설정된 파라미터 사용)
+        hdbscan_model = hdbscan.HDBSCAN(
+            min_cluster_size=PRESET_PARAMS["min_cluster_size"], 
+            min_samples=2, 
+            metric='euclidean', 
+            cluster_selection_method='eom', 
+            prediction_data=True
+        )
+        
+        # BERTopic 모델 초기화 및 훈련 (미리 설정된 파라미터 사용)
+        topic_model = BERTopic(
+            language="korean",
+            calculate_probabilities=True,
+            nr_topics=6,
+            top_n_words=15,
+            vectorizer_model=vectorizer_model,
+            embedding_model=embedding_model,
+            umap_model=umap_model,
+            hdbscan_model=hdbscan_model,
+            ctfidf_model=ctfidf_model,
+            verbose=True
+        )
+        
+        # 주제 모델 훈련 (위에서 계산한 임베딩 재사용)
+        topics, probabilities = topic_model.fit_transform(lemmatized_patents, embeddings=embeddings)
+
+        # 학습 결과(토픽 단어, 확률, 대표 문서, c-TF-IDF, 임베딩)를 실행 ID로 저장
+        # → UI/web_api/GTM 단계는 다시 학습하지 않고 topic_model_store.load_topic_run으로 바로 읽음
+        run_id = save_topic_model(
+            topic_model, topics, probabilities, name="step4",
+            fingerprint=docs_fingerprint(lemmatized_patents, extra=PRESET_PARAMS), params=PRESET_PARAMS,
+            docs=lemmatized_patents, embeddings=embeddings
+        )
+        print(f"💾 토픽 모델 저장: topic_models/step4/{run_id}")
+
+        # 본 모델의 토픽으로 2D UMAP 산점도 저장
+        plot_umap_topics(topics)
+        
+        # 실제 토픽 모델 결과로 차트 데이터 생성
+        top_n = 12
+        topic_terms = {}
+        topic_scores = {}
+        
+        all_topics = list(topic_model.get_topics().keys())
+        print(f"🔍 전체 토픽 번호들: {all_topics}")
+        
+        # 실제 생성된 토픽들을 기반으로 차트 데이터 생성
+        for topic_num in all_topics:
+            if topic_num != -1:  # 노이즈 토픽 제외
+                terms_scores = topic_model.get_topic(topic_num)  # [(term, score), ...]
+                if terms_scores:
+                    top_terms_scores = terms_scores[:top_n]
+                    terms = [term for term, score in top_terms_scores]
+                    scores = [score for term, score in top_terms_scores]
+                    topic_terms[topic_num] = terms
+                    topic_scores[topic_num] = scores
+                    print(f"✅ Topic {topic_num}: {len(terms)}개 키워드 - {terms[:5]}...")
+                else:
+                    topic_terms[topic_num] = []
+                    topic_scores[topic_num] = []
+        
+        # Chrome 의존성 문제 해결을 위해 matplotlib으로 차트 생성
+        fig_mpl, axes = plt.subplots(2, 3, figsize=(15, 10))
+        fig_mpl.suptitle('Topic 0~5: Top 10 words 분포', fontsize=20, y=0.98)
+        
+        colors_mpl = {
+            0: "#8dd3c7", 1: "#4eb3d3", 2: "#08589e", 
+            3: "#fdb462", 4: "#fb8072", 5: "#b30000"
+        }
+        
+        # 실제 토픽 수에 맞춰 차트 생성
+        for i, topic_num in enumerate(sorted([t for t in all_topics if t != -1])[:6]):
+            row = i // 3
+            col = i % 3
+            ax = axes[row, col]
             
-            # 주제 모델 훈련
-            topics, probabilities = topic_model.fit_transform(lemmatized_patents)
-            
-            # 실제 토픽 모델 결과로 차트 데이터 생성
-            top_n = 12
-            topic_terms = {}
-            topic_scores = {}
-            
-            all_topics = list(topic_model.get_topics().keys())
-            print(f"🔍 전체 토픽 번호들: {all_topics}")
-            
-            # 실제 생성된 토픽들을 기반으로 차트 데이터 생성
-            for topic_num in all_topics:
-                if topic_num != -1:  # 노이즈 토픽 제외
-                    terms_scores = topic_model.get_topic(topic_num)  # [(term, score), ...]
-                    if terms_scores:
-                        top_terms_scores = terms_scores[:top_n]
-                        terms = [term for term, score in top_terms_scores]
-                        scores = [score for term, score in top_terms_scores]
-                        topic_terms[topic_num] = terms
-                        topic_scores[topic_num] = scores
-                        print(f"✅ Topic {topic_num}: {len(terms)}개 키워드 - {terms[:5]}...")
-                    else:
-                        topic_terms[topic_num] = []
-                        topic_scores[topic_num] = []
-            
-            # Chrome 의존성 문제 해결을 위해 matplotlib으로 차트 생성
-            fig_mpl, axes = plt.subplots(2, 3, figsize=(15, 10))
-            fig_mpl.suptitle('Topic 0~5: Top 10 words 분포', fontsize=20, y=0.98)
-            
-            colors_mpl = {
-                0: "#8dd3c7", 1: "#4eb3d3", 2: "#08589e", 
-                3: "#fdb462", 4: "#fb8072", 5: "#b30000"
-            }
+            terms = topic_terms.get(topic_num, [])
+            scores = topic_scores.get(topic_num, [])
             
-            # 실제 토픽 수에 맞춰 차트 생성
-            for i, topic_num in enumerate(sorted([t for t in all_topics if t != -1])[:6]):
-                row = i // 3
-                col = i % 3
-                ax = axes[row, col]
-                
-                terms = topic_terms.get(topic_num, [])
-                scores = topic_scores.get(topic_num, [])
+            if terms:
+                # 내림차순으로 정렬 (높은 점수가 위쪽에)
+                y_pos = range(len(terms))
+                ax.barh(y_pos, scores[::-1], color=colors_mpl.get(i, "#cccccc"), alpha=0.8)
+                ax.set_yticks(y_pos)
+                ax.set_yticklabels(terms[::-1], fontsize=10)
+                ax.set_xlabel('c-TF-IDF', fontsize=12)
+                ax.set_title(f'Topic {topic_num}: Top 10 words', fontsize=14, pad=10)
+                ax.grid(axis='x', alpha=0.3)
+            else:
+                ax.set_title(f'Topic {topic_num}: No data', fontsize=14, pad=10)
                 
-                if terms:
-                    # 내림차순으로 정렬 (높은 점수가 위쪽에)
-                    y_pos = range(len(terms))
-                    ax.barh(y_pos, scores[::-1], color=colors_mpl.get(i, "#cccccc"), alpha=0.8)
-                    ax.set_yticks(y_pos)
-                    ax.set_yticklabels(terms[::-1], fontsize=10)
-                    ax.set_xlabel('c-TF-IDF', fontsize=12)
-                    ax.set_title(f'Topic {topic_num}: Top 10 words', fontsize=14, pad=10)
-                    ax.grid(axis='x', alpha=0.3)
-                else:
-                    ax.set_title(f'Topic {topic_num}: No data', fontsize=14, pad=10)
-                    
-            plt.tight_layout()
-            
-            # Topic words chart 파일 저장 (파일이 없을 때만 생성)
-            chart_file = "topic_words_chart.png"
+        plt.tight_layout()
+        
+        # Topic words chart 파일 저장 (파일이 없을 때만 생성)
+        chart_file = "topic_words_chart.png"
+        
+        # 파일이 이미 존재하면 건너뛰기
+        if os.path.exists(chart_file):
+            print(f"⏭️ 토픽 차트 파일이 이미 존재합니다. 건너뜁니다: {chart_file}")
+        else:
+            print(f"📈 토픽 차트 파일을 새로 생성합니다: {chart_file}")
+            plt.savefig(chart_file, dpi=300, bbox_inches='tight')
             
-            # 파일이 이미 존재하면 건너뛰기
+            # 파일이 제대로 생성되었는지 확인
             if os.path.exists(chart_file):
-                print(f"⏭️ 토픽 차트 파일이 이미 존재합니다. 건너뜁니다: {chart_file}")
+                file_size = os.path.getsize(chart_file)
+                print(f"✅ 토픽 차트 저장 완료: {chart_file} ({file_size} bytes)")
             else:
-                print(f"📈 토픽 차트 파일을 새로 생성합니다: {chart_file}")
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                
-                # 파일이 제대로 생성되었는지 확인
-                if os.path.exists(chart_file):
-                    file_size = os.path.getsize(chart_file)
-                    print(f"✅ 토픽 차트 저장 완료: {chart_file} ({file_size} bytes)")
-                else:
-                    print(f"❌ 토픽 차트 파일 저장 실패: {chart_file}")
-                
-            plt.close(fig_mpl)
+                print(f"❌ 토픽 차트 파일 저장 실패: {chart_file}")
             
-            # 토픽 결과 처리 후 반환
-            topics_dict = {}
-            for topic_num in all_topics:
-                if topic_num != -1:  # 노이즈 토픽 제외
-                    words = [word for word, _ in topic_model.get_topic(topic_num)]
-                    topics_dict[topic_num] = words
-
-            print(f"🎯 최종 반환할 토픽 수: {len(topics_dict)}개")
-            return topics_dict
+        plt.close(fig_mpl)
+        
+        # 토픽 결과 처리 후 반환
+        topics_dict = {}
+        for topic_num in all_topics:
+            if topic_num != -1:  # 노이즈 토픽 제외
+                words = [word for word, _ in topic_model.get_topic(topic_num)]
+                topics_dict[topic_num] = words
+
+        # 토픽별 c_v coherence (그리드서치와 같은 계산기)
+        coherence = CoherenceEvaluator([doc.split() for doc in lemmatized_patents]).coherence_per_topic(
+            {str(topic_num): words for topic_num, words in topics_dict.items()}
+        )
+        if coherence:
+            print(f"📏 평균 Coherence(c_v): {sum(coherence.values()) / len(coherence):.4f}")
+
+        print(f"🎯 최종 반환할 토픽 수: {len(topics_dict)}개")
+        return topics_dict
+
+    def ber_online(self, batch_size=None, n_topics=6):
+        """
+        대용량 코퍼스용 온라인 토픽 모델링 (특허 테이블을 batch_size행씩 읽어 전처리/임베딩/partial_fit)
+        메모리에는 배치 하나와 문서별 해시/토픽만 올리므로 10만 건 이상에서도 사용량이 일정함
+        (전체 임베딩이 필요한 2D UMAP 산점도와 토픽 차트는 만들지 않음)
+
+        Args:
+            batch_size (int): 한 번에 처리할 문서 수 (None이면 topic_online.ONLINE_BATCH_SIZE)
+            n_topics (int): 토픽 수
+
+        Returns:
+            dict: 토픽 번호 → 단어 리스트 (ber와 같은 형식)
+        """
+        _patch_compat()
+        from korean_tokenizer import KoreanTokenizer
+        from patent_table import iter_patent_table
+        from sentence_models import encode_documents
+        from topic_online import OnlineTopicModel, ONLINE_BATCH_SIZE
+        from nltk_resources import ensure_nltk_resources
+
+        ensure_nltk_resources()
+        batch_size = batch_size or ONLINE_BATCH_SIZE
+
+        with open('data/stopwords.txt', 'r', encoding='utf-8') as f:
+            stop_words = set(f.read().splitlines())
+        with open('data/eng_data.txt', 'r', encoding='utf-8') as f:
+            eng_keywords = set(line.strip().lower() for line in f if line.strip())
+        phrase_matcher = PhraseMatcher(load_phrases('data/phrase_data.txt'))
+        tokenizer = KoreanTokenizer()
+        preprocessor = PatentPreprocessor(stop_words, eng_keywords, phrase_matcher, tokenizer)
+        fingerprint = corpus_fingerprint(tokenizer.version, PREPROCESSOR_VERSION)
+
+        def batches():
+            # 첫 패스에서 전처리/임베딩한 결과는 디스크 캐시에 남으므로 다음 패스는 캐시에서 읽기만 함
+            with CorpusCache(fingerprint) as corpus_cache:
+                for chunk in iter_patent_table(['astrtCont', '발명명칭'], batch_size):
+                    summ = chunk['astrtCont'] + chunk['발명명칭']
+                    docs = [doc for doc in corpus_cache.lemmatize(summ, preprocessor.lemmatize) if doc.strip()]
+                    if docs:
+                        _, embeddings = encode_documents(docs, show_progress_bar=False)
+                        yield docs, embeddings
+
+        try:
+            online_model = OnlineTopicModel(n_topics=n_topics).fit(batches)
+        finally:
+            tokenizer.close()
+        if not len(online_model.topics):
+            print("❌ 유효한 전처리된 특허 데이터가 없습니다.")
+            return {}
+
+        run_id = online_model.save(name="step4")
+        print(f"💾 온라인 토픽 모델 저장: topic_models/step4/{run_id} ({len(online_model.topics)}개 문서)")
+        topics_dict = online_model.topics_dict()
+        for topic_num, words in topics_dict.items():
+            print(f"✅ Topic {topic_num}: {words[:5]}...")
+        return topics_dict
@@ -1,17 +1,17 @@
 from dotenv import load_dotenv
 import os
 import re
-from langchain_community.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from tabulate import tabulate  # pip install tabulate
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 class Step5:
     def last(self,x):
         import os  # 함수 내부에서 명시적으로 import
         import glob  # 파일 검색을 위한 import
+        # langchain/docx는 Step5를 실제로 실행할 때만 로드
+        from langchain_community.chat_models import ChatOpenAI
+        from langchain.prompts import ChatPromptTemplate
+        from docx import Document
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
         
         # 보고서 폴더 존재 확인 및 스킵 로직
         docx_folder = "reports_docx.v8"
@@ -1,5 +1,4 @@
 import streamlit as st
-import json
 import glob
 import os
 from datetime import datetime
@@ -9,6 +8,8 @@ import pandas as pd
 import time
 import sys
 import importlib
+import progress_reporter
+from patent_table import find_patent_table, read_patent_table, write_patent_table
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 
@@ -370,14 +371,7 @@ def show_navigation():
 
 def update_progress(step, message):
     """진행 상황 업데이트"""
-    progress_data = {
-        "stage": f"Step {step}",
-        "current": step,
-        "total": 6,
-        "message": message
-    }
-    with open("progress.json", "w", encoding="utf-8") as f:
-        json.dump(progress_data, f, ensure_ascii=False)
+    progress_reporter.report(f"Step {step}", step, 6, message, force=True)
     
     # step_progress는 숫자만 저장 (3_5는 3으로 처리)
     if step == "3_5":
@@ -388,47 +382,20 @@ def update_progress(step, message):
 def filter_data_by_date(start_year, end_year):
     """날짜 범위로 특허 데이터 필터링"""
     try:
-        # CSV 파일 존재 확인 (여러 경로 시도)
-        csv_paths = ["./extract_end.csv", "../extract_end.csv", "/Users/shinseungmin/Documents/벌토픽_전체코드/extract_end.csv"]
-        csv_path = None
-        
-        for path in csv_paths:
-            if os.path.exists(path):
-                csv_path = path
-                break
-        
-        if csv_path is None:
-            print("❌ extract_end.csv 파일을 찾을 수 없습니다.")
+        # 특허 테이블 읽기 (필터링 결과를 다시 저장하므로 전체 컬럼)
+        table_path = find_patent_table()
+        if table_path is None:
+            print("❌ extract_end 특허 테이블을 찾을 수 없습니다.")
             return 0
             
-        df = pd.read_csv(csv_path)
-        print(f"📁 필터링용 CSV 파일: {csv_path} ({len(df)}건)")
-        
-        # step3_5_특허그래프.py와 동일한 날짜 처리 방식
-        if 'openDate' in df.columns:
-            # openDate가 있는 경우
-            df = df.dropna(subset=['openDate'])
-            if len(df) > 0:
-                df["openDate"] = df["openDate"].astype(str).str.replace('.0', '').str.strip()
-                df["출원연도"] = pd.to_datetime(
-                    df["openDate"], format='%Y%m%d', errors="coerce"
-                ).dt.year
-                df = df.dropna(subset=['출원연도'])
-        else:
-            # openDate가 없는 경우 기존 컬럼들 사용
-            if '출원연도' in df.columns:
-                df = df.dropna(subset=['출원연도'])
-            elif '출원일자' in df.columns:
-                df = df.dropna(subset=['출원일자'])
-                df['출원연도'] = pd.to_datetime(df['출원일자'], errors='coerce').dt.year
-                df = df.dropna(subset=['출원연도'])
-            elif '출원일' in df.columns:
-                df = df.dropna(subset=['출원일'])
-                df['출원연도'] = pd.to_datetime(df['출원일'], errors='coerce').dt.year
-                df = df.dropna(subset=['출원연도'])
-            else:
-                print("❌ 날짜 관련 컬럼을 찾을 수 없습니다.")
-                return 0
+        df = read_patent_table(path=table_path)
+        print(f"📁 필터링용 특허 테이블: {table_path} ({len(df)}건)")
+        
+        # 출원연도는 저장 시점에 step3_5_특허그래프.py와 같은 규칙(openDate 우선)으로 계산되어 있음
+        if '출원연도' not in df.columns:
+            print("❌ 날짜 관련 컬럼을 찾을 수 없습니다.")
+            return 0
+        df = df.dropna(subset=['출원연도'])
         
         print(f"📅 날짜 처리 후 데이터 수: {len(df)}건")
         
@@ -436,7 +403,7 @@ def filter_data_by_date(start_year, end_year):
         filtered_df = df[(df["출원연도"] >= start_year) & (df["출원연도"] <= end_year)]
         
         # 필터링된 데이터 저장
-        filtered_df.to_csv("./extract_end.csv", index=False)
+        write_patent_table(filtered_df)
         
         print(f"📅 날짜 필터링 완료: {start_year}-{end_year}, {len(filtered_df)}건 남음")
         return len(filtered_df)
@@ -1235,24 +1202,14 @@ def get_topic_title_from_report(topic_num):
 def get_topic_patents(topic_num):
     """토픽에 해당하는 특허 정보를 반환"""
     try:
-        import pandas as pd
-        import os
-        
-        # CSV 파일 존재 확인 (여러 경로 시도)
-        csv_paths = ["./extract_end.csv", "../extract_end.csv", "/Users/shinseungmin/Documents/벌토픽_전체코드/extract_end.csv"]
-        csv_path = None
-        
-        for path in csv_paths:
-            if os.path.exists(path):
-                csv_path = path
-                break
-        
-        if csv_path is None:
-            print("❌ extract_end.csv 파일을 찾을 수 없습니다.")
+        # 특허 테이블에서 화면에 필요한 컬럼만 읽기
+        table_path = find_patent_table()
+        if table_path is None:
+            print("❌ extract_end 특허 테이블을 찾을 수 없습니다.")
             return []
             
-        df = pd.read_csv(csv_path)
-        print(f"📁 특허 정보 로드: {csv_path} ({len(df)}건)")
+        df = read_patent_table(columns=['출원인', '발명의명칭', '요약', '출원일자', 'IPC분류'], path=table_path)
+        print(f"📁 특허 정보 로드: {table_path} ({len(df)}건)")
         
         # 토픽 키워드 가져오기
         if 'topic_results' in st.session_state and st.session_state.topic_results:
@@ -2120,42 +2077,14 @@ def show_home_page():
         # 날짜 범위 미리보기
         if start_year and end_year and start_year <= end_year:
             try:
-                # CSV 파일 존재 확인 (여러 경로 시도)
-                csv_paths = ["./extract_end.csv", "../extract_end.csv", "/Users/shinseungmin/Documents/벌토픽_전체코드/extract_end.csv"]
-                csv_path = None
+                # 미리보기에는 출원연도 컬럼만 필요
+                df = read_patent_table(columns=['출원연도'])
                 
-                for path in csv_paths:
-                    if os.path.exists(path):
-                        csv_path = path
-                        break
-                
-                if csv_path is None:
-                    st.error("❌ extract_end.csv 파일을 찾을 수 없습니다.")
+                if df is None:
+                    st.error("❌ extract_end 특허 테이블을 찾을 수 없습니다.")
                 else:
-                    df = pd.read_csv(csv_path)
-                    
-                    # step3_5_특허그래프.py와 동일한 날짜 처리 방식 적용
-                    if 'openDate' in df.columns:
-                        # openDate가 있는 경우
-                        df = df.dropna(subset=['openDate'])
-                        if len(df) > 0:
-                            df["openDate"] = df["openDate"].astype(str).str.replace('.0', '').str.strip()
-                            df["출원연도"] = pd.to_datetime(
-                                df["openDate"], format='%Y%m%d', errors="coerce"
-                            ).dt.year
-                            df = df.dropna(subset=['출원연도'])
-                    else:
-                        # openDate가 없는 경우 기존 컬럼들 사용
-                        if '출원연도' in df.columns:
-                            df = df.dropna(subset=['출원연도'])
-                        elif '출원일자' in df.columns:
-                            df = df.dropna(subset=['출원일자'])
-                            df['출원연도'] = pd.to_datetime(df['출원일자'], errors='coerce').dt.year
-                            df = df.dropna(subset=['출원연도'])
-                        elif '출원일' in df.columns:
-                            df = df.dropna(subset=['출원일'])
-                            df['출원연도'] = pd.to_datetime(df['출원일'], errors='coerce').dt.year
-                            df = df.dropna(subset=['출원연도'])
+                    if '출원연도' in df.columns:
+                        df = df.dropna(subset=['출원연도'])
                     
                     if len(df) > 0 and '출원연도' in df.columns:
                         total_count = len(df)
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+import itertools
+import math
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from progress_reporter import report
+from reduction_cache import ReductionCache
+from topic_coherence import CoherenceEvaluator
+from topic_grid_search import PARAM_NAMES, MIN_TOPICS, MIN_COHERENCE, TopicModelEvaluator
+
+# successive halving: 단계마다 상위 1/ETA 조합만 남기고 문서 수는 ETA배로
+ETA = 3
+# 가장 작은 부분 코퍼스의 최소 문서 수 (너무 작으면 HDBSCAN/coherence 결과가 의미 없음)
+MIN_SUBSAMPLE_DOCS = 300
+# 모델 기반 샘플링 전에 무작위로 평가할 조합 수
+N_STARTUP = 8
+# 상위 몇 %를 "좋은 조합"으로 볼지, 한 번 제안할 때 비교할 후보 수
+TPE_GAMMA = 0.25
+TPE_CANDIDATES = 32
+
+
+def search_score(record):
+    """조합 순위에 쓰는 점수 (토픽이 너무 적거나 학습에 실패한 조합은 가장 낮게)"""
+    if record["status"] not in ("ok", "low_coherence"):
+        return -math.inf
+    score = record.get("mean_coherence", -math.inf)
+    return -math.inf if score is None or math.isnan(score) else score
+
+
+class TPESampler:
+    """
+    이산 하이퍼파라미터용 TPE(Tree-structured Parzen Estimator) 샘플러
+    - 처음 n_startup개는 무작위, 이후에는 관측을 상위 gamma(좋은 조합)와 나머지로 나눠
+      파라미터별 범주 분포 l(x), g(x)를 만들고 l(x)에서 뽑은 후보 중 l(x)/g(x)가 가장 큰 조합을 제안
+    - 이미 평가한 조합은 제안하지 않음
+
+    Args:
+        space (dict): 파라미터 이름 → 후보 값 리스트 (PARAM_NAMES 순서로 조합을 만듦)
+        seed (int): 난수 시드
+    """
+    def __init__(self, space, seed=42, n_startup=N_STARTUP, gamma=TPE_GAMMA, n_candidates=TPE_CANDIDATES):
+        self.values = [list(space[name]) for name in PARAM_NAMES]
+        self.rng = np.random.default_rng(seed)
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.observations = []
+        self.size = math.prod(len(values) for values in self.values)
+
+    def observe(self, config, score):
+        self.observations.append((config, score))
+
+    def _random(self, exclude):
+        for _ in range(100):
+            config = tuple(values[self.rng.integers(len(values))] for values in self.values)
+            if config not in exclude:
+                return config
+        # 남은 조합이 적으면 전체에서 직접 고름
+        remaining = [config for config in itertools.product(*self.values) if config not in exclude]
+        return remaining[self.rng.integers(len(remaining))] if remaining else None
+
+    def _densities(self, observations):
+        # 값마다 1의 사전 가중치를 줘서 한 번도 안 나온 값도 확률이 0이 되지 않게 함
+        densities = []
+        for i, values in enumerate(self.values):
+            counts = np.ones(len(values))
+            for config, _ in observations:
+                counts[values.index(config[i])] += 1
+            densities.append(counts / counts.sum())
+        return densities
+
+    def suggest(self, exclude):
+        """
+        Args:
+            exclude (set[tuple]): 이미 평가한 조합
+
+        Returns:
+            tuple | None: 다음에 평가할 조합 (모두 평가했으면 None)
+        """
+        if len(exclude) >= self.size:
+            return None
+        if len(self.observations) < self.n_startup:
+            return self._random(exclude)
+
+        ranked = sorted(self.observations, key=lambda item: item[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good = self._densities(ranked[:n_good])
+        bad = self._densities(ranked[n_good:])
+
+        best, best_ratio = None, -math.inf
+        for _ in range(self.n_candidates):
+            indices = [self.rng.choice(len(values), p=density) for values, density in zip(self.values, good)]
+            config = tuple(values[j] for values, j in zip(self.values, indices))
+            if config in exclude:
+                continue
+            ratio = sum(math.log(g[j]) - math.log(b[j]) for g, b, j in zip(good, bad, indices))
+            if ratio > best_ratio:
+                best, best_ratio = config, ratio
+        return best if best is not None else self._random(exclude)
+
+
+class BudgetedTopicSearch:
+    """
+    시간 예산 안에서 BERTopic 하이퍼파라미터를 찾는 탐색기 (전체 그리드 대신 사용)
+    - successive halving: 무작위로 고정한 부분 코퍼스(1/ETA², 1/ETA, 전체 …)에서 조합을 평가하고
+      단계마다 평균 coherence 상위 1/ETA만 더 큰 코퍼스로 올림 (min_cluster_size는 코퍼스 비율만큼 축소)
+    - 첫 단계에 올릴 조합은 TPESampler가 지금까지의 결과를 보고 제안
+    - coherence는 항상 전체 코퍼스 통계로 계산하고, 전체 코퍼스 단계는 Step4의 ReductionCache를 그대로 사용
+    - 예산(초)은 소프트 한도: 코퍼스 비율별로 가장 오래 걸린 학습 시간을 기록해서 남은 시간 안에 끝나지 않을
+      것으로 보이는 학습(또는 단계 전체)은 시작하지 않음. 이미 시작한 학습은 중간에 멈추지 않으므로
+      예상보다 오래 걸린 학습만큼 예산을 넘을 수 있음
+
+    Args:
+        docs (list[str]): 전처리된 문서
+        reduction_cache (ReductionCache): 문서 임베딩으로 만든 축소 캐시 (Step4와 공유)
+        vectorizer_model, ctfidf_model, hdbscan_model: 본 모델과 같은 설정의 템플릿 (조합마다 clone)
+        topic_model_kwargs (dict): 그 밖의 BERTopic 인자
+        eta (int): 단계마다 남길 비율의 역수
+        seed (int): 부분 코퍼스 선택과 샘플러 시드
+    """
+    def __init__(self, docs, reduction_cache, vectorizer_model, ctfidf_model, hdbscan_model,
+                 topic_model_kwargs=None, eta=ETA, min_subsample_docs=MIN_SUBSAMPLE_DOCS, seed=42,
+                 min_topics=MIN_TOPICS, min_coherence=MIN_COHERENCE):
+        self.docs = list(docs)
+        self.cache = reduction_cache
+        self.templates = (vectorizer_model, ctfidf_model, hdbscan_model)
+        self.topic_model_kwargs = dict(topic_model_kwargs or {})
+        self.eta = eta
+        self.seed = seed
+        self.min_topics = min_topics
+        self.min_coherence = min_coherence
+        self.fractions = self._fractions(len(self.docs), min_subsample_docs)
+        # 부분 코퍼스는 같은 순열의 앞부분 → 작은 코퍼스가 큰 코퍼스에 포함됨
+        self._order = np.random.default_rng(seed).permutation(len(self.docs))
+        self.coherence = CoherenceEvaluator([doc.split() for doc in self.docs])
+        self._evaluators = {}
+        self.results = {}           # (조합, 비율) → 결과
+        self.n_fits = 0
+        self.fit_seconds = {}       # 비율 → 학습 한 번에 걸린 시간(초) 리스트
+
+    def _fractions(self, n_docs, min_docs):
+        fractions = [1.0]
+        while n_docs * fractions[0] / self.eta >= min_docs:
+            fractions.insert(0, fractions[0] / self.eta)
+        return fractions
+
+    def _evaluator(self, fraction, memory_dir):
+        if fraction not in self._evaluators:
+            if fraction == 1.0:
+                docs, cache = self.docs, self.cache
+            else:
+                indices = np.sort(self._order[:int(round(len(self.docs) * fraction))])
+                docs = [self.docs[i] for i in indices]
+                cache = ReductionCache(self.cache.embeddings[indices], metric=self.cache.metric,
+                                       random_state=self.cache.random_state)
+            self._evaluators[fraction] = TopicModelEvaluator(
+                docs, cache, *self.templates, self.topic_model_kwargs,
+                self.min_topics, self.min_coherence, memory_dir, coherence=self.coherence
+            )
+        return self._evaluators[fraction]
+
+    def _evaluate(self, config, fraction, memory_dir):
+        key = (config, fraction)
+        if key not in self.results:
+            n_neighbors, n_components, min_dist, min_cluster_size = config
+            scaled = max(2, int(round(min_cluster_size * fraction)))
+            started = time.monotonic()
+            record = self._evaluator(fraction, memory_dir).evaluate((n_neighbors, n_components, min_dist), scaled)
+            self.fit_seconds.setdefault(fraction, []).append(time.monotonic() - started)
+            record.update(min_cluster_size=min_cluster_size, effective_min_cluster_size=scaled, fraction=fraction)
+            self.results[key] = record
+            self.n_fits += 1
+        return self.results[key]
+
+    def expected_seconds(self, fraction):
+        """
+        fraction 코퍼스에서 학습 한 번에 걸릴 것으로 예상되는 시간(초)
+        - 같은 축소를 재사용한 학습은 훨씬 빨라서 평균은 너무 낙관적 → 지금까지 가장 오래 걸린 학습 시간
+        - 그 비율에서 학습한 적이 없으면 바로 아래 비율의 값을 문서 수 비율만큼 늘려서 추정 (기록이 없으면 0)
+        """
+        if self.fit_seconds.get(fraction):
+            return max(self.fit_seconds[fraction])
+        smaller = [f for f, seconds in self.fit_seconds.items() if f < fraction and seconds]
+        if not smaller:
+            return 0.0
+        nearest = max(smaller)
+        return max(self.fit_seconds[nearest]) * fraction / nearest
+
+    def best(self):
+        """
+        가장 큰 코퍼스 단계에서 조건을 만족한 조합 중 평균 coherence가 가장 높은 결과
+        (예산 안에 전체 코퍼스까지 못 간 경우 그 아래 단계 결과)
+        """
+        for fraction in reversed(self.fractions):
+            passed = [record for (_, f), record in self.results.items() if f == fraction and record["status"] == "ok"]
+            if passed:
+                return max(passed, key=lambda record: record["mean_coherence"])
+        return None
+
+    def run(self, space, budget_seconds):
+        """
+        Args:
+            space (dict): PARAM_NAMES별 후보 값 리스트
+            budget_seconds (float): 탐색에 쓸 시간(초, 소프트 한도 - 클래스 설명 참고)
+
+        Returns:
+            dict | None: 최적 조합의 결과 (fraction은 평가한 코퍼스 비율)
+        """
+        started = time.monotonic()
+        deadline = started + budget_seconds
+        sampler = TPESampler(space, seed=self.seed)
+        tried = set()
+        skipped_rungs = set()
+        n_rungs = len(self.fractions)
+        print(f"🔍 예산 {budget_seconds:.0f}초, 코퍼스 비율 {[round(f, 3) for f in self.fractions]}, "
+              f"전체 {sampler.size}개 조합 중 탐색")
+
+        def out_of_time():
+            elapsed = time.monotonic() - started
+            report("search", min(int(elapsed), int(budget_seconds)), int(budget_seconds),
+                   f"하이퍼파라미터 탐색 중 ({self.n_fits}회 학습, {elapsed:.0f}/{budget_seconds:.0f}초)")
+            return time.monotonic() >= deadline
+
+        def no_time_for(fraction):
+            # 남은 시간이 이 비율의 예상 학습 시간보다 짧으면 시작하지 않음
+            return out_of_time() or time.monotonic() + self.expected_seconds(fraction) > deadline
+
+        memory_dir = tempfile.mkdtemp(prefix="hdbscan-")
+        try:
+            while len(tried) < sampler.size and not no_time_for(self.fractions[0]):
+                # 한 bracket: 첫 단계에 ETA^(단계 수 - 1)개 조합 → 단계마다 1/ETA만 다음 단계로
+                survivors = []
+                for _ in range(self.eta ** (n_rungs - 1)):
+                    if no_time_for(self.fractions[0]):
+                        break
+                    config = sampler.suggest(tried)
+                    if config is None:
+                        break
+                    tried.add(config)
+                    record = self._evaluate(config, self.fractions[0], memory_dir)
+                    sampler.observe(config, search_score(record))
+                    survivors.append(config)
+
+                for rung in range(1, n_rungs):
+                    previous = self.fractions[rung - 1]
+                    scores = {
+                        config: search_score(self.results[(config, previous)])
+                        for config in survivors if (config, previous) in self.results
+                    }
+                    ranked = sorted((config for config, score in scores.items() if score > -math.inf),
+                                    key=scores.get, reverse=True)
+                    survivors = ranked[:max(1, len(ranked) // self.eta)]
+                    if survivors and no_time_for(self.fractions[rung]):
+                        # 이 단계 학습 한 번도 예산 안에 끝나지 않을 것 → 더 큰 단계도 건너뜀
+                        if rung not in skipped_rungs:
+                            skipped_rungs.add(rung)
+                            print(f"⏱️ 남은 시간 부족: 코퍼스 비율 {self.fractions[rung]:.2f} 단계부터 건너뜀 "
+                                  f"(예상 {self.expected_seconds(self.fractions[rung]):.0f}초/학습)")
+                        break
+                    for config in survivors:
+                        if no_time_for(self.fractions[rung]):
+                            break
+                        self._evaluate(config, self.fractions[rung], memory_dir)
+        finally:
+            shutil.rmtree(memory_dir, ignore_errors=True)
+
+        elapsed = time.monotonic() - started
+        report("search", int(budget_seconds), int(budget_seconds),
+               f"하이퍼파라미터 탐색 완료 ({self.n_fits}회 학습, {elapsed:.0f}초)", force=True)
+        best = self.best()
+        if best:
+            print(
+                f"예산 탐색 완료 ({self.n_fits}회 학습, {elapsed:.0f}초). 최적 조합: "
+                f"{best['n_neighbors']}, {best['n_components']}, "
+                f"{best['min_dist']}, {best['min_cluster_size']} "
+                f"(코퍼스 비율 {best['fraction']:.2f}, 평균 Coherence: {best['mean_coherence']:.4f})"
+            )
+        else:
+            print("조건을 만족하는 결과가 없습니다.")
+        return best
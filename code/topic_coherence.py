@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from scipy import sparse
+
+# gensim CoherenceModel(coherence='c_v')의 기본 설정
+WINDOW_SIZE = 110
+EPSILON = 1e-12
+
+
+class CoherenceEvaluator:
+    """
+    c_v coherence 계산기 (gensim CoherenceModel(coherence='c_v')와 같은 값)
+    - 문서 창(sliding window)별 단어 등장 행렬을 코퍼스당 한 번만 만들고,
+      토픽 단어의 등장/동시등장 수는 희소 행렬 곱 한 번으로 계산
+    - 여러 토픽을 한 번에 넘기면 모든 토픽 단어의 통계를 같이 계산해서 NPMI·코사인을 행렬로 처리
+
+    gensim과 같은 규칙:
+    - window_size보다 짧은 문서는 문서 전체가 창 하나, 긴 문서는 길이 - window_size + 1개의 창
+    - 사전에 없는 단어도 창 위치는 차지함
+    - 긴 문서에서 창을 한 칸 밀 때 왼쪽 끝 단어는 창 안에 또 있어도 빠진 것으로 침
+      (gensim WordOccurrenceAccumulator의 창 갱신 방식을 그대로 따름)
+
+    Args:
+        texts (list[list[str]]): 토큰화된 문서
+        dictionary (gensim.corpora.Dictionary): 단어 → id 사전 (None이면 texts의 단어로 만듦)
+        window_size (int): boolean sliding window 크기
+    """
+    def __init__(self, texts, dictionary=None, window_size=WINDOW_SIZE):
+        if dictionary is not None:
+            self.token2id = dict(dictionary.token2id)
+        else:
+            self.token2id = {}
+            for text in texts:
+                for word in text:
+                    self.token2id.setdefault(word, len(self.token2id))
+        self.window_size = window_size
+        vocab_size = max(self.token2id.values(), default=-1) + 1
+
+        # 짧은 문서: 창 하나 = 문서의 고유 단어
+        short_rows, short_cols = [], []
+        # 긴 문서: 단어가 나온 위치마다 창에 들어오는 창 번호(add)와 빠지는 창 번호(remove, 없으면 -1)
+        long_words, long_adds, long_removes, long_doc_starts = [], [], [], []
+        n_short = 0
+        n_long_windows = 0
+        for text in texts:
+            ids = np.fromiter((self.token2id.get(word, -1) for word in text), dtype=np.int64, count=len(text))
+            if len(ids) <= window_size:
+                known = np.unique(ids[ids >= 0])
+                short_rows.append(np.full(len(known), n_short, dtype=np.int64))
+                short_cols.append(known)
+                n_short += 1
+            else:
+                n_windows = len(ids) - window_size + 1
+                positions = np.nonzero(ids >= 0)[0]
+                long_words.append(ids[positions])
+                long_adds.append(n_long_windows + np.maximum(positions - window_size + 1, 0))
+                long_removes.append(np.where(positions + 1 < n_windows, n_long_windows + positions + 1, -1))
+                long_doc_starts.append(n_long_windows)
+                n_long_windows += n_windows
+
+        rows = np.concatenate(short_rows) if short_rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(short_cols) if short_cols else np.empty(0, dtype=np.int64)
+        self._short = sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=(n_short, vocab_size)
+        )
+
+        words = np.concatenate(long_words) if long_words else np.empty(0, dtype=np.int64)
+        order = np.argsort(words, kind='stable')
+        self._long_words = words[order]
+        self._long_adds = np.concatenate(long_adds)[order] if long_adds else np.empty(0, dtype=np.int64)
+        self._long_removes = np.concatenate(long_removes)[order] if long_removes else np.empty(0, dtype=np.int64)
+        self._long_doc_starts = np.asarray(long_doc_starts, dtype=np.int64)
+        self._n_long_windows = n_long_windows
+        self._long_cache = {}
+
+        self.num_windows = n_short + n_long_windows
+
+    def _long_windows(self, word_id):
+        """긴 문서의 창 중 word_id가 들어 있는 창 번호"""
+        if word_id not in self._long_cache:
+            lo, hi = np.searchsorted(self._long_words, [word_id, word_id + 1])
+            if lo == hi:
+                windows = np.empty(0, dtype=np.int64)
+            else:
+                # 창마다 마지막 add가 마지막 remove보다 늦거나 같으면 창 안에 있음
+                # (같은 창에서는 remove 후 add, 문서가 바뀌면 모두 remove)
+                adds = np.full(self._n_long_windows, -1, dtype=np.int64)
+                adds[self._long_adds[lo:hi]] = self._long_adds[lo:hi]
+                removes = np.full(self._n_long_windows, -1, dtype=np.int64)
+                removes[self._long_doc_starts] = self._long_doc_starts
+                word_removes = self._long_removes[lo:hi]
+                word_removes = word_removes[word_removes >= 0]
+                removes[word_removes] = word_removes
+                last_add = np.maximum.accumulate(adds)
+                last_remove = np.maximum.accumulate(removes)
+                windows = np.nonzero((last_add >= 0) & (last_add >= last_remove))[0]
+            self._long_cache[word_id] = windows
+        return self._long_cache[word_id]
+
+    def _counts(self, word_ids):
+        """
+        Returns:
+            ndarray[k, k]: 동시등장 창 수 (대각선 = 단어 등장 창 수)
+        """
+        short = self._short[:, word_ids]
+        if self._n_long_windows:
+            long_windows = [self._long_windows(word_id) for word_id in word_ids]
+            rows = np.concatenate(long_windows)
+            cols = np.repeat(np.arange(len(word_ids)), [len(w) for w in long_windows])
+            long = sparse.csc_matrix(
+                (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=(self._n_long_windows, len(word_ids))
+            )
+            occurrence = sparse.vstack([short, long], format='csc')
+        else:
+            occurrence = short
+        return (occurrence.T @ occurrence).toarray()
+
+    def _npmi(self, counts):
+        n = self.num_windows
+        occurrences = np.diag(counts)
+        joint = counts / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_ratio = np.log((joint + EPSILON) / np.outer(occurrences / n, occurrences / n))
+            return log_ratio / -np.log(joint + EPSILON)
+
+    def c_v(self, topics):
+        """
+        Args:
+            topics (list[list[str]]): 토픽별 단어 (모두 사전에 있어야 함)
+
+        Returns:
+            list[float]: 토픽별 c_v coherence
+        """
+        topic_ids = [[self.token2id[word] for word in words] for words in topics]
+        vocab = np.unique(np.concatenate([np.asarray(ids, dtype=np.int64) for ids in topic_ids])) if topic_ids else []
+        if not len(vocab):
+            return [np.nan] * len(topics)
+        npmi = self._npmi(self._counts(vocab))
+
+        scores = []
+        for ids in topic_ids:
+            # 중복 단어는 gensim처럼 같은 문맥 벡터 위치에 누적
+            unique, counts = np.unique(np.searchsorted(vocab, ids), return_counts=True)
+            sub = npmi[np.ix_(unique, unique)]
+            # 단어 하나의 문맥 벡터 (행), 토픽 전체 단어 집합의 문맥 벡터
+            context = sub * counts
+            topic_context = (counts @ sub) * counts
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cosine = (context @ topic_context) / (np.linalg.norm(context, axis=1) * np.linalg.norm(topic_context))
+            scores.append(float((cosine * counts).sum() / len(ids)))
+        return scores
+
+    def coherence_per_topic(self, topic_words):
+        """
+        Args:
+            topic_words (dict[str, list[str]]): 토픽 번호 → 상위 단어
+
+        Returns:
+            dict[str, float]: 토픽 번호 → c_v coherence
+        """
+        # 사전에 없는 단어(BERTopic이 채운 빈 문자열 등)는 제외
+        topics = {
+            topic_id: [word for word in words if word in self.token2id]
+            for topic_id, words in topic_words.items()
+        }
+        topics = {topic_id: words for topic_id, words in topics.items() if len(words) >= 2}
+        return dict(zip(topics, self.c_v(list(topics.values()))))
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+# Step4_1 → Step4_2로 넘기는 문서별 토픽 분포 (Arrow IPC, 압축 없음 → memory map으로 복사 없이 읽음)
+DISTRIBUTION_PATH = 'topic_distribution.arrow'
+
+# 문서마다 남길 확률 상위 토픽 수 (나머지 토픽은 0으로 봄)
+TOP_K = 10
+
+# 확률 행렬에서 한 번에 상위 k개를 고르는 행 수 (float64 원본 전체를 float32로 복사하지 않도록)
+TOP_K_CHUNK = 10000
+
+
+def top_k_probabilities(probabilities, k=TOP_K):
+    """
+    문서 × 토픽 확률에서 문서마다 확률이 높은 k개 토픽만 남김
+
+    Args:
+        probabilities (np.ndarray): (문서, 토픽) 확률
+        k (int): 남길 토픽 수 (토픽 수보다 크면 토픽 수)
+
+    Returns:
+        (np.ndarray[n, k] int16, np.ndarray[n, k] float32, int): 토픽 열 번호(확률 내림차순), 확률, 전체 토픽 수
+    """
+    n_docs, n_topics = probabilities.shape
+    k = min(k, n_topics)
+    indices = np.empty((n_docs, k), dtype=np.int16)
+    values = np.empty((n_docs, k), dtype=np.float32)
+    for start in range(0, n_docs, TOP_K_CHUNK):
+        chunk = np.asarray(probabilities[start:start + TOP_K_CHUNK], dtype=np.float32)
+        top = np.argpartition(-chunk, k - 1, axis=1)[:, :k] if k < n_topics else np.tile(np.arange(n_topics), (len(chunk), 1))
+        top_values = np.take_along_axis(chunk, top, axis=1)
+        order = np.argsort(-top_values, axis=1, kind='stable')
+        indices[start:start + len(chunk)] = np.take_along_axis(top, order, axis=1)
+        values[start:start + len(chunk)] = np.take_along_axis(top_values, order, axis=1)
+    return indices, values, n_topics
+
+
+def to_dense(indices, values, n_topics, rows=None):
+    """
+    상위 k개 토픽 확률을 (문서, 토픽) float32 행렬로 (GTM처럼 밀집 입력이 필요한 곳에서 사용)
+
+    Args:
+        rows (np.ndarray): 일부 문서만 필요할 때 행 번호 또는 bool 마스크
+    """
+    if rows is not None:
+        indices, values = indices[rows], values[rows]
+    dense = np.zeros((len(indices), n_topics), dtype=np.float32)
+    # 열 번호 -1(노이즈 문서의 배정 확률만 있는 경우)은 건너뜀
+    doc_rows, slots = np.nonzero(indices >= 0)
+    dense[doc_rows, indices[doc_rows, slots]] = values[doc_rows, slots]
+    return dense
+
+
+def write_topic_distribution(doc_ids, topics, probabilities, path=DISTRIBUTION_PATH, k=TOP_K):
+    """
+    문서 ID별 대표 토픽과 상위 k개 토픽 확률을 Arrow IPC 파일로 저장 (문서 텍스트는 저장하지 않음)
+    - 컬럼: doc_id(문자열), dominant_topic(int32), topics(int16 × k), probabilities(float32 × k)
+    - 전체 토픽 수는 스키마 메타데이터(n_topics)에 기록
+
+    Args:
+        doc_ids (list[str]): 문서 ID (출원번호 등)
+        topics (list[int]): 문서별 대표 토픽 (-1은 노이즈)
+        probabilities (np.ndarray): BERTopic fit_transform의 확률
+            (calculate_probabilities=False의 1차원 배정 확률이면 대표 토픽 열에 그 확률 하나만 저장)
+
+    Returns:
+        str: 저장한 경로
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    probabilities = np.asarray(probabilities)
+    if probabilities.ndim == 1:
+        topics = np.asarray(topics, dtype=np.int32)
+        indices = topics.astype(np.int16).reshape(-1, 1)
+        values = probabilities.astype(np.float32).reshape(-1, 1)
+        n_topics = int(topics.max()) + 1 if len(topics) else 0
+    else:
+        indices, values, n_topics = top_k_probabilities(probabilities, k)
+    k = indices.shape[1]
+    table = pa.table({
+        "doc_id": pa.array([str(doc_id) for doc_id in doc_ids], type=pa.string()),
+        "dominant_topic": pa.array(np.asarray(topics, dtype=np.int32)),
+        "topics": pa.FixedSizeListArray.from_arrays(pa.array(indices.ravel()), k),
+        "probabilities": pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), k),
+    }).replace_schema_metadata({"n_topics": str(n_topics), "top_k": str(k)})
+    # 한 덩어리로 써야 읽을 때 컬럼 전체를 복사 없이 numpy로 볼 수 있음
+    feather.write_feather(table, path, compression='uncompressed', chunksize=max(len(table), 1))
+    return path
+
+
+def _column_numpy(column):
+    # 한 덩어리면 memory map된 버퍼를 그대로 numpy로 (복사 없음), 여러 덩어리면 이어붙임, 빈 파일은 빈 배열
+    if column.num_chunks == 0:
+        return np.empty(0, dtype=column.type.to_pandas_dtype())
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    return np.concatenate([chunk.to_numpy(zero_copy_only=True) for chunk in column.chunks])
+
+
+def _list_chunk_numpy(chunk, k):
+    # FixedSizeList의 값 버퍼를 (행, k) 뷰로 (복사 없음)
+    flat = chunk.values.to_numpy(zero_copy_only=True)[chunk.offset * k:(chunk.offset + len(chunk)) * k]
+    return flat.reshape(-1, k)
+
+
+def _list_numpy(column, k):
+    if column.num_chunks == 0:
+        return np.empty((0, k), dtype=column.type.value_type.to_pandas_dtype())
+    if column.num_chunks == 1:
+        return _list_chunk_numpy(column.chunk(0), k)
+    return np.concatenate([_list_chunk_numpy(chunk, k) for chunk in column.chunks])
+
+
+class TopicDistribution:
+    """
+    write_topic_distribution으로 저장한 파일 (memory map, 숫자 컬럼은 복사 없이 numpy 뷰로 제공)
+
+    Attributes:
+        doc_ids (pyarrow.Array): 문서 ID
+        dominant_topic (np.ndarray[n] int32): 대표 토픽
+        topics (np.ndarray[n, k] int16): 확률 상위 토픽 열 번호
+        probabilities (np.ndarray[n, k] float32): 그 확률
+        n_topics (int): 전체 토픽 수
+    """
+    def __init__(self, path=DISTRIBUTION_PATH):
+        import pyarrow.feather as feather
+        self.table = feather.read_table(path, memory_map=True)
+        metadata = self.table.schema.metadata or {}
+        self.n_topics = int(metadata.get(b"n_topics", 0))
+        k = int(metadata.get(b"top_k", 1))
+        self.doc_ids = self.table.column("doc_id")
+        self.dominant_topic = _column_numpy(self.table.column("dominant_topic"))
+        self.topics = _list_numpy(self.table.column("topics"), k)
+        self.probabilities = _list_numpy(self.table.column("probabilities"), k)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def dense(self, rows=None):
+        """(문서, 토픽) float32 확률 행렬 (상위 k개 밖의 토픽은 0)"""
+        return to_dense(self.topics, self.probabilities, self.n_topics, rows)
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from progress_reporter import report
+from reduction_cache import ReductionCache, CachedUMAP
+from topic_coherence import CoherenceEvaluator
+
+GRID_SEARCH_LOG = "grid_search_results.jsonl"
+
+# 조합을 구분하는 하이퍼파라미터 (앞의 세 개가 같으면 UMAP 축소를 공유)
+PARAM_NAMES = ("n_neighbors", "n_components", "min_dist", "min_cluster_size")
+
+# 이 조건을 만족하지 못한 조합도 로그에는 남겨서 재시작 시 다시 평가하지 않음
+MIN_TOPICS = 3
+MIN_COHERENCE = 0.4
+
+
+def _normalize_params(params):
+    # set/list 파라미터(CountVectorizer vocabulary 등)는 순서와 무관하게 같은 값으로 취급
+    return {
+        key: sorted(map(str, value)) if isinstance(value, (set, frozenset, list, tuple)) else value
+        for key, value in sorted(params.items())
+    }
+
+
+def data_fingerprint(docs, embeddings, *templates, extra=None):
+    """
+    그리드서치 결과에 영향을 주는 입력(문서, 임베딩, 모델 설정)의 해시
+    이전 로그 중 같은 fingerprint의 결과만 재사용
+    """
+    digest = hashlib.sha256()
+    for doc in docs:
+        digest.update(doc.encode('utf-8'))
+        digest.update(b"\0")
+    digest.update(np.ascontiguousarray(embeddings, dtype=np.float32).tobytes())
+    for template in templates:
+        params = _normalize_params(template.get_params())
+        digest.update(json.dumps([type(template).__name__, params], sort_keys=True, default=str).encode('utf-8'))
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class GridSearchLog:
+    """
+    조합별 결과를 한 줄씩 추가만 하는 JSONL 로그
+    - 중단돼도 이미 기록된 조합은 다음 실행에서 건너뜀 (마지막 줄이 잘렸으면 무시)
+    - fingerprint가 다른(문서/설정이 바뀐) 이전 결과는 재사용하지 않음
+
+    Args:
+        path (str): 로그 파일 경로
+        fingerprint (str): data_fingerprint 결과
+    """
+    def __init__(self, path=GRID_SEARCH_LOG, fingerprint=None):
+        self.path = path
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def key(record):
+        return tuple(record[name] for name in PARAM_NAMES)
+
+    def load(self):
+        """
+        Returns:
+            dict[tuple, dict]: 조합 → 결과 (같은 조합이 여러 번 있으면 마지막 것)
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("fingerprint") == self.fingerprint:
+                    records[self.key(record)] = record
+        return records
+
+    def append(self, records):
+        if not records:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(dict(record, fingerprint=self.fingerprint), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def best(self, keys=None):
+        """
+        조건을 만족한 조합 중 평균 coherence가 가장 높은 결과 (없으면 None)
+
+        Args:
+            keys (set[tuple]): 이 조합들 중에서만 선택 (None이면 로그 전체)
+        """
+        passed = [
+            record for key, record in self.load().items()
+            if record["status"] == "ok" and (keys is None or key in keys)
+        ]
+        return max(passed, key=lambda record: record["mean_coherence"]) if passed else None
+
+
+class TopicModelEvaluator:
+    """
+    한 프로세스에서 하이퍼파라미터 조합별 BERTopic을 학습하고 평가
+    - UMAP 축소는 (n_neighbors, n_components, min_dist) 그룹당 한 번 (ReductionCache)
+    - HDBSCAN의 single linkage tree는 min_cluster_size와 무관하므로 joblib 캐시(memory_dir)로 공유
+    - coherence용 문서 창 통계는 한 번만 계산 (CoherenceEvaluator, 넘겨받으면 그대로 사용)
+    """
+    def __init__(self, docs, cache, vectorizer_model, ctfidf_model, hdbscan_model, topic_model_kwargs,
+                 min_topics, min_coherence, memory_dir, coherence=None):
+        from joblib import Memory
+        self.docs = docs
+        self.cache = cache
+        self.vectorizer_model = vectorizer_model
+        self.ctfidf_model = ctfidf_model
+        self.hdbscan_model = hdbscan_model
+        self.topic_model_kwargs = topic_model_kwargs
+        self.min_topics = min_topics
+        self.min_coherence = min_coherence
+        self.coherence = coherence or CoherenceEvaluator([doc.split() for doc in docs])
+        self.memory = Memory(memory_dir, verbose=0)
+
+    def _fit(self, group, min_cluster_size):
+        from bertopic import BERTopic
+        from sklearn.base import clone
+        n_neighbors, n_components, min_dist = group
+        topic_model = BERTopic(
+            calculate_probabilities=False,  # 평가에는 토픽 배정만 필요
+            vectorizer_model=clone(self.vectorizer_model),
+            umap_model=CachedUMAP(self.cache, n_neighbors=n_neighbors, n_components=n_components, min_dist=min_dist),
+            hdbscan_model=clone(self.hdbscan_model).set_params(min_cluster_size=min_cluster_size, memory=self.memory),
+            ctfidf_model=clone(self.ctfidf_model),
+            verbose=False,
+            **self.topic_model_kwargs
+        )
+        topic_model.fit_transform(self.docs, embeddings=self.cache.embeddings)
+        return topic_model
+
+    def evaluate(self, group, min_cluster_size):
+        started = time.perf_counter()
+        record = dict(zip(PARAM_NAMES, (*group, min_cluster_size)))
+        try:
+            topic_model = self._fit(group, min_cluster_size)
+        except Exception as e:
+            record.update(status="error", error=str(e), seconds=time.perf_counter() - started)
+            return record
+
+        topic_freq = topic_model.get_topic_freq()
+        topic_words = {
+            str(topic_id): [word for word, _ in topic_model.get_topic(topic_id)]
+            for topic_id in topic_freq.Topic
+            if topic_id != -1
+        }
+        record["topic_counts"] = {str(int(topic)): int(count) for topic, count in zip(topic_freq.Topic, topic_freq.Count)}
+        record["topic_words"] = topic_words
+
+        if len(topic_words) < self.min_topics:
+            record.update(status="too_few_topics", seconds=time.perf_counter() - started)
+            return record
+
+        scores = self.coherence.coherence_per_topic(topic_words)
+        mean_coh = sum(scores.values()) / len(scores) if scores else 0.0
+        record["coherence_per_topic"] = scores
+        record["mean_coherence"] = mean_coh
+        record["status"] = "ok" if mean_coh >= self.min_coherence else "low_coherence"
+        record["seconds"] = time.perf_counter() - started
+        return record
+
+    def evaluate_group(self, group, min_cluster_sizes):
+        return [self.evaluate(group, min_cluster_size) for min_cluster_size in min_cluster_sizes]
+
+
+# 워커 프로세스마다 한 번만 만드는 평가기
+_evaluator = None
+
+
+def _init_worker(docs, embeddings, knn, metric, random_state, templates, topic_model_kwargs, min_topics, min_coherence,
+                 memory_dir):
+    global _evaluator
+    cache = ReductionCache(embeddings, metric=metric, random_state=random_state, knn=knn)
+    _evaluator = TopicModelEvaluator(docs, cache, *templates, topic_model_kwargs, min_topics, min_coherence, memory_dir)
+
+
+def _evaluate_group(group, min_cluster_sizes):
+    return _evaluator.evaluate_group(group, min_cluster_sizes)
+
+
+class TopicGridSearch:
+    """
+    BERTopic 하이퍼파라미터 그리드서치
+    - (n_neighbors, n_components, min_dist) 그룹을 프로세스 풀에서 병렬로 평가하고,
+      그룹 안에서는 UMAP 축소 하나에 모든 min_cluster_size를 시도
+    - kNN 그래프는 부모에서 한 번 계산해서 모든 워커가 공유
+    - 결과는 GridSearchLog에 추가만 하므로 중단 후 다시 실행하면 남은 조합만 평가
+
+    Args:
+        docs (list[str]): 전처리된 문서
+        reduction_cache (ReductionCache): 문서 임베딩으로 만든 축소 캐시 (Step4와 공유)
+        vectorizer_model, ctfidf_model, hdbscan_model: 본 모델과 같은 설정의 템플릿 (조합마다 clone)
+        topic_model_kwargs (dict): 그 밖의 BERTopic 인자 (language, nr_topics, top_n_words 등)
+        log_path (str): 결과 로그 경로
+        max_workers (int): 워커 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+    """
+    def __init__(self, docs, reduction_cache, vectorizer_model, ctfidf_model, hdbscan_model,
+                 topic_model_kwargs=None, log_path=GRID_SEARCH_LOG, max_workers=None,
+                 min_topics=MIN_TOPICS, min_coherence=MIN_COHERENCE):
+        self.docs = list(docs)
+        self.cache = reduction_cache
+        self.templates = (vectorizer_model, ctfidf_model, hdbscan_model)
+        self.topic_model_kwargs = dict(topic_model_kwargs or {})
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_topics = min_topics
+        self.min_coherence = min_coherence
+        fingerprint = data_fingerprint(
+            self.docs, reduction_cache.embeddings, *self.templates,
+            extra=[self.topic_model_kwargs, reduction_cache.metric, reduction_cache.random_state, min_topics, min_coherence]
+        )
+        self.log = GridSearchLog(log_path, fingerprint)
+
+    def _pending(self, param_grid):
+        """이미 로그에 있는 조합을 뺀 그룹별 min_cluster_size 목록"""
+        done = self.log.load()
+        pending = {}
+        for group in itertools.product(param_grid["n_neighbors"], param_grid["n_components"], param_grid["min_dist"]):
+            remaining = [mcs for mcs in param_grid["min_cluster_size"] if (*group, mcs) not in done]
+            if remaining:
+                pending[group] = remaining
+        return pending
+
+    def _run_groups(self, pending, memory_dir):
+        """그룹 결과를 완료되는 순서대로 돌려줌"""
+        if self.max_workers <= 1 or len(pending) <= 1:
+            evaluator = TopicModelEvaluator(self.docs, self.cache, *self.templates, self.topic_model_kwargs,
+                                            self.min_topics, self.min_coherence, memory_dir)
+            for group, min_cluster_sizes in pending.items():
+                yield evaluator.evaluate_group(group, min_cluster_sizes)
+            return
+
+        knn = self.cache.shared_knn(max(group[0] for group in pending))
+        initargs = (self.docs, self.cache.embeddings, knn, self.cache.metric, self.cache.random_state,
+                    self.templates, self.topic_model_kwargs, self.min_topics, self.min_coherence, memory_dir)
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending)),
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            futures = [pool.submit(_evaluate_group, group, mcs) for group, mcs in pending.items()]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, param_grid):
+        """
+        Args:
+            param_grid (dict): PARAM_NAMES별 후보 값 리스트
+
+        Returns:
+            dict | None: 평균 coherence가 가장 높은 조합의 결과 (이전 실행 결과 포함)
+        """
+        keys = set(itertools.product(*(param_grid[name] for name in PARAM_NAMES)))
+        total = len(keys)
+        pending = self._pending(param_grid)
+        remaining = sum(len(mcs) for mcs in pending.values())
+        done = total - remaining
+        if done:
+            print(f"⏭️ 이전 그리드서치 결과 {done}개 조합 재사용, {remaining}개 조합 남음")
+        report("grid", done, total, f"Grid {done}/{total} 조합 평가 중", force=True)
+
+        # HDBSCAN 캐시는 이번 실행에서만 사용 (UMAP 결과가 달라지면 어차피 재사용되지 않음)
+        memory_dir = tempfile.mkdtemp(prefix="hdbscan-")
+        try:
+            for records in self._run_groups(pending, memory_dir):
+                self.log.append(records)
+                done += len(records)
+                for record in records:
+                    if record["status"] == "error":
+                        print(f"❌ {self.log.key(record)} 조합 학습 중 에러 발생: {record['error']}")
+                report("grid", done, total, f"Grid {done}/{total} 조합 평가 중")
+        finally:
+            shutil.rmtree(memory_dir, ignore_errors=True)
+
+        report("grid", done, total, f"Grid {done}/{total} 조합 평가 완료", force=True)
+        best = self.log.best(keys)
+        if best:
+            print(
+                f"Grid search 완료. 최적 조합: "
+                f"{best['n_neighbors']}, {best['n_components']}, "
+                f"{best['min_dist']}, {best['min_cluster_size']} "
+                f"(평균 Coherence: {best['mean_coherence']:.4f})"
+            )
+        else:
+            print("조건을 만족하는 결과가 없습니다.")
+        return best
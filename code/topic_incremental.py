@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+
+from topic_model_store import doc_hashes, normalize_rows
+
+INCREMENTAL_FILE = 'incremental.npz'
+
+# 학습 문서와 새로 배정한 문서의 토픽 분포(노이즈 -1 제외) Jensen-Shannon divergence(밑 2, 0~1)가
+# 이 값을 넘으면 다시 학습
+DRIFT_THRESHOLD = 0.1
+# 새로 배정한 문서가 이보다 적으면 분포 변화를 판단하지 않음 (표본이 작으면 JS가 우연히 커짐)
+MIN_DRIFT_DOCS = 50
+# 새로 배정한 문서 중 어느 토픽에도 가깝지 않은(-1) 문서 비율이 이 값을 넘으면 다시 학습 (새 주제 등장)
+MAX_OUTLIER_RATE = 0.3
+# 새로 배정한 문서가 학습 문서의 이 비율을 넘으면 분포와 관계없이 다시 학습
+MAX_NEW_RATIO = 0.5
+
+
+def js_divergence(p, q):
+    """두 분포(합이 1이 아니어도 됨)의 Jensen-Shannon divergence (밑 2, 0~1)"""
+    p = np.asarray(p, dtype=np.float64)
+    q = np.asarray(q, dtype=np.float64)
+    p = p / p.sum()
+    q = q / q.sum()
+    m = (p + q) / 2
+
+    def kl(a, b):
+        mask = a > 0
+        return float(np.sum(a[mask] * np.log2(a[mask] / b[mask])))
+
+    return (kl(p, m) + kl(q, m)) / 2
+
+
+class IncrementalTopicAssigner:
+    """
+    저장된 Step4 실행(TopicRun)에 새 문서를 다시 학습하지 않고 배정
+    - 배정: 문서 임베딩과 토픽 임베딩의 코사인 유사도가 가장 높은 토픽
+      (그 토픽 학습 문서의 유사도 하한보다 낮으면 노이즈 토픽 -1, HDBSCAN이 학습 때 노이즈로 둔 것과 같은 역할)
+    - 배정 결과는 실행 디렉터리의 incremental.npz에 누적 (같은 문서는 한 번만 배정)
+    - drift(): 학습 문서 대비 누적 배정 문서의 토픽 분포 JS divergence, -1 비율, 새 문서 비율로 다시 학습할지 판단
+      (학습 때의 -1은 HDBSCAN 노이즈라 배정의 -1과 비율이 달라서 분포 비교에서는 뺌)
+
+    Args:
+        run (TopicRun): load_topic_run 결과 (doc_hashes, similarity_floor가 저장된 실행)
+    """
+    def __init__(self, run, drift_threshold=DRIFT_THRESHOLD, min_drift_docs=MIN_DRIFT_DOCS,
+                 max_outlier_rate=MAX_OUTLIER_RATE, max_new_ratio=MAX_NEW_RATIO):
+        if run.doc_hashes is None or run.similarity_floor is None or run.topic_embeddings is None:
+            raise ValueError(f"실행 {run.run_id}에는 증분 배정에 필요한 문서 해시/유사도 하한이 없습니다.")
+        self.run = run
+        self.drift_threshold = drift_threshold
+        self.min_drift_docs = min_drift_docs
+        self.max_outlier_rate = max_outlier_rate
+        self.max_new_ratio = max_new_ratio
+        self.topic_ids = np.asarray(run.topic_ids)
+        self._topic_vectors = normalize_rows(run.topic_embeddings)
+        self._floors = run.similarity_floor
+        # 노이즈 토픽은 임베딩이 있어도 배정 후보에서 제외
+        self._candidates = np.flatnonzero(self.topic_ids != -1)
+        self.path = os.path.join(run.run_dir, INCREMENTAL_FILE)
+        self.assigned_hashes, self.assigned_topics = self._load()
+        self._known = set(run.doc_hashes.tolist()) | set(self.assigned_hashes.tolist())
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as arrays:
+                return arrays["doc_hashes"], arrays["topics"]
+        except OSError:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int32)
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, doc_hashes=self.assigned_hashes, topics=self.assigned_topics)
+        os.replace(tmp_path, self.path)
+
+    def new_documents(self, docs):
+        """
+        Returns:
+            list[int]: 학습에도, 이전 증분 배정에도 없던 문서의 인덱스
+        """
+        return [i for i, h in enumerate(doc_hashes(docs).tolist()) if h not in self._known]
+
+    def assign(self, docs, embeddings):
+        """
+        새 문서를 토픽에 배정하고 누적 기록에 추가
+
+        Args:
+            docs (list[str]): 새 문서 (new_documents로 고른 것)
+            embeddings (np.ndarray): 학습 때와 같은 모델로 만든 문서 임베딩
+
+        Returns:
+            (np.ndarray[int], np.ndarray[float]): 문서별 토픽, 배정한 토픽과의 코사인 유사도
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.shape[1] != self._topic_vectors.shape[1]:
+            raise ValueError(
+                f"임베딩 차원({embeddings.shape[1]})이 학습 때({self._topic_vectors.shape[1]})와 다릅니다."
+            )
+        similarities = normalize_rows(embeddings) @ self._topic_vectors[self._candidates].T
+        best = np.argmax(similarities, axis=1)
+        scores = similarities[np.arange(len(best)), best]
+        rows = self._candidates[best]
+        topics = np.where(scores >= self._floors[rows], self.topic_ids[rows], -1).astype(np.int32)
+
+        hashes = doc_hashes(docs)
+        fresh = np.array([h not in self._known for h in hashes.tolist()], dtype=bool)
+        self.assigned_hashes = np.concatenate([self.assigned_hashes, hashes[fresh]])
+        self.assigned_topics = np.concatenate([self.assigned_topics, topics[fresh]])
+        self._known.update(hashes[fresh].tolist())
+        self._save()
+        return topics, scores
+
+    def topic_counts(self):
+        """
+        Returns:
+            (np.ndarray, np.ndarray): 노이즈(-1)를 뺀 토픽 순서의 학습 문서 수, 증분 배정 문서 수
+        """
+        topic_ids = self.topic_ids[self._candidates]
+        trained = np.array([self.run.topic_sizes.get(int(topic), 0) for topic in topic_ids], dtype=np.float64)
+        assigned = np.array([np.sum(self.assigned_topics == topic) for topic in topic_ids], dtype=np.float64)
+        return trained, assigned
+
+    def drift(self):
+        """
+        Returns:
+            dict: js(학습 분포 대비 새 문서 분포), n_new, new_ratio, outlier_rate(새 문서 중 -1 비율),
+                  refit(다시 학습할지), reason
+        """
+        trained, assigned = self.topic_counts()
+        n_new = len(self.assigned_topics)
+        n_trained = len(self.run.doc_hashes)
+        outlier_rate = float(np.mean(self.assigned_topics == -1)) if n_new else 0.0
+        js = js_divergence(trained, assigned) if assigned.sum() else 0.0
+        new_ratio = n_new / max(n_trained, 1)
+
+        if new_ratio > self.max_new_ratio:
+            refit, reason = True, f"새 문서가 학습 문서의 {new_ratio:.0%}"
+        elif n_new >= self.min_drift_docs and outlier_rate > self.max_outlier_rate:
+            refit, reason = True, f"어느 토픽에도 가깝지 않은 새 문서 {outlier_rate:.0%} > {self.max_outlier_rate:.0%}"
+        elif n_new >= self.min_drift_docs and js > self.drift_threshold:
+            refit, reason = True, f"토픽 분포 변화 JS={js:.3f} > {self.drift_threshold}"
+        else:
+            refit, reason = False, f"토픽 분포 변화 JS={js:.3f}, 새 문서 {n_new}건"
+        return {"js": js, "n_new": n_new, "new_ratio": new_ratio, "outlier_rate": outlier_rate,
+                "refit": refit, "reason": reason}
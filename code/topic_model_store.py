@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+STORE_DIR = './topic_models'
+
+# 이름(step4, gtm 등)마다 남겨둘 최근 실행 수 (오래된 것부터 삭제)
+KEEP_RUNS = 5
+
+# 저장 형식 버전 (형식이 바뀌면 이전 실행은 읽지 않음)
+STORE_VERSION = 1
+
+# 토픽별 유사도 하한: 학습 문서가 자기 토픽 임베딩과 갖는 코사인 유사도의 이 분위수
+# (새 문서가 가장 가까운 토픽의 하한보다 멀면 노이즈 토픽(-1)으로 배정)
+SIMILARITY_FLOOR_QUANTILE = 0.05
+
+META_FILE = 'model.json'
+ARRAYS_FILE = 'arrays.npz'
+LATEST_FILE = 'latest'
+
+
+def docs_fingerprint(docs, extra=None):
+    """
+    학습 결과에 영향을 주는 입력(문서, 모델 이름/파라미터)의 해시
+    저장된 실행이 지금 데이터로 학습한 것인지 확인할 때 사용 (임베딩 계산 전에 확인 가능)
+    """
+    digest = hashlib.sha256()
+    for doc in docs:
+        digest.update(doc.encode('utf-8'))
+        digest.update(b"\0")
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def doc_hashes(docs):
+    """문서 텍스트 sha256의 앞 8바이트 (uint64 배열, 학습/배정한 문서를 구분할 때 사용)"""
+    return np.array(
+        [int.from_bytes(hashlib.sha256(doc.encode('utf-8')).digest()[:8], 'little') for doc in docs],
+        dtype=np.uint64
+    )
+
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def similarity_floors(topic_ids, topic_embeddings, topics, embeddings, quantile=SIMILARITY_FLOOR_QUANTILE):
+    """
+    토픽별로 학습 문서와 토픽 임베딩의 코사인 유사도 분위수 (문서가 없는 토픽과 -1은 -inf)
+
+    Returns:
+        np.ndarray[len(topic_ids)] float32
+    """
+    topics = np.asarray(topics)
+    similarities = np.einsum('ij,ij->i', normalize_rows(embeddings),
+                             normalize_rows(topic_embeddings)[np.searchsorted(topic_ids, topics)])
+    return floors_from_similarities(topic_ids, topics, similarities, quantile)
+
+
+def floors_from_similarities(topic_ids, topics, similarities, quantile=SIMILARITY_FLOOR_QUANTILE):
+    """similarity_floors와 같지만 문서별 유사도를 이미 계산한 경우 (온라인 학습처럼 임베딩을 모아두지 않을 때)"""
+    topics = np.asarray(topics)
+    similarities = np.asarray(similarities)
+    floors = np.full(len(topic_ids), -np.inf, dtype=np.float32)
+    for row, topic in enumerate(topic_ids):
+        members = similarities[topics == topic]
+        if topic != -1 and len(members):
+            floors[row] = np.quantile(members, quantile)
+    return floors
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def save_topic_model(topic_model, topics, probabilities=None, name='step4', fingerprint=None, params=None,
+                     docs=None, embeddings=None, hashes=None, floors=None, store_dir=STORE_DIR,
+                     keep_runs=KEEP_RUNS):
+    """
+    학습한 BERTopic 모델의 결과를 pickle 없이 저장 (실행 ID 디렉터리 하나)
+    - model.json: 토픽별 단어/점수, 크기, 대표 문서, 라벨, 어휘, 파라미터
+    - arrays.npz: 문서별 토픽/확률, c-TF-IDF(CSR 배열), 토픽 임베딩, 축소 임베딩,
+      (docs/embeddings를 주면) 문서 해시와 토픽별 유사도 하한 → 새 문서 증분 배정(topic_incremental)에 사용
+    임시 디렉터리에 다 쓴 뒤 이름을 바꾸고 latest를 갱신하므로, 중간에 중단돼도 이전 실행은 그대로 남음
+
+    Args:
+        topic_model (BERTopic): 학습된 모델
+        topics (list[int]): fit_transform의 문서별 토픽
+        probabilities (np.ndarray | None): fit_transform의 확률 (calculate_probabilities=True면 문서 × 토픽,
+            이 경우 문서마다 상위 k개 토픽 확률만 저장)
+        name (str): 실행 묶음 이름 (latest는 이름마다 따로 관리)
+        fingerprint (str): docs_fingerprint 결과 (load_topic_run에서 같은 데이터인지 확인)
+        params (dict): 같이 기록할 하이퍼파라미터
+        docs (list[str]): 학습 문서 (해시만 저장)
+        embeddings (np.ndarray): 학습 문서 임베딩 (토픽별 유사도 하한 계산에만 쓰고 저장하지 않음)
+        hashes, floors (np.ndarray): docs/embeddings 대신 이미 계산한 문서 해시/토픽별 유사도 하한
+
+    Returns:
+        str: 실행 ID
+    """
+    name_dir = os.path.join(store_dir, name)
+    os.makedirs(name_dir, exist_ok=True)
+    run_id = time.strftime('%Y%m%d-%H%M%S') + (f"-{fingerprint[:8]}" if fingerprint else "")
+    while os.path.exists(os.path.join(name_dir, run_id)):
+        run_id += "_"
+
+    # -1(노이즈)부터 정렬한 토픽 순서 = c_tf_idf_, topic_embeddings_의 행 순서
+    topic_ids = sorted(topic_model.topic_representations_)
+    representative_docs = getattr(topic_model, 'representative_docs_', None) or {}
+    try:
+        vocabulary = [str(word) for word in topic_model.vectorizer_model.get_feature_names_out()]
+    except Exception:
+        vocabulary = []
+    meta = {
+        "version": STORE_VERSION,
+        "run_id": run_id,
+        "name": name,
+        "fingerprint": fingerprint,
+        "created_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "n_docs": len(topics),
+        "params": params or {},
+        "topic_ids": [int(topic) for topic in topic_ids],
+        "topic_labels": {str(topic): label for topic, label in (topic_model.topic_labels_ or {}).items()},
+        "topic_sizes": {str(topic): int(size) for topic, size in (topic_model.topic_sizes_ or {}).items()},
+        "topic_words": {
+            str(topic): [[str(word), float(score)] for word, score in topic_model.topic_representations_[topic]]
+            for topic in topic_ids
+        },
+        "representative_docs": {str(topic): list(topic_docs) for topic, topic_docs in representative_docs.items()},
+        "vocabulary": vocabulary,
+    }
+
+    arrays = {"topics": np.asarray(topics, dtype=np.int32)}
+    if probabilities is not None:
+        probabilities = np.asarray(probabilities)
+        if probabilities.ndim == 2:
+            # 문서 × 토픽 전체 대신 문서마다 상위 k개 토픽 확률만 (float32)
+            from topic_distribution import top_k_probabilities
+            indices, values, n_topics = top_k_probabilities(probabilities)
+            arrays.update(probability_topics=indices, probability_values=values,
+                          probability_n_topics=np.asarray(n_topics, dtype=np.int32))
+        else:
+            arrays["probabilities"] = probabilities.astype(np.float32)
+    c_tf_idf = getattr(topic_model, 'c_tf_idf_', None)
+    if c_tf_idf is not None:
+        c_tf_idf = c_tf_idf.tocsr()
+        arrays.update(
+            c_tf_idf_data=c_tf_idf.data.astype(np.float32),
+            c_tf_idf_indices=c_tf_idf.indices.astype(np.int32),
+            c_tf_idf_indptr=c_tf_idf.indptr.astype(np.int64),
+            c_tf_idf_shape=np.asarray(c_tf_idf.shape, dtype=np.int64),
+        )
+    if getattr(topic_model, 'topic_embeddings_', None) is not None:
+        arrays["topic_embeddings"] = np.asarray(topic_model.topic_embeddings_, dtype=np.float32)
+        if floors is not None:
+            arrays["similarity_floor"] = np.asarray(floors, dtype=np.float32)
+        elif embeddings is not None:
+            arrays["similarity_floor"] = similarity_floors(topic_ids, arrays["topic_embeddings"], topics, embeddings)
+    if hashes is not None:
+        arrays["doc_hashes"] = np.asarray(hashes, dtype=np.uint64)
+    elif docs is not None:
+        arrays["doc_hashes"] = doc_hashes(docs)
+    reduced = getattr(topic_model.umap_model, 'embedding_', None)
+    if reduced is not None:
+        arrays["reduced_embeddings"] = np.asarray(reduced, dtype=np.float32)
+
+    tmp_dir = os.path.join(name_dir, f".tmp-{run_id}")
+    os.makedirs(tmp_dir)
+    try:
+        np.savez(os.path.join(tmp_dir, ARRAYS_FILE), **arrays)
+        with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.rename(tmp_dir, os.path.join(name_dir, run_id))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    _write_atomic(os.path.join(name_dir, LATEST_FILE), run_id)
+
+    for old_run in list_runs(name, store_dir)[keep_runs:]:
+        shutil.rmtree(os.path.join(name_dir, old_run), ignore_errors=True)
+    return run_id
+
+
+def list_runs(name='step4', store_dir=STORE_DIR):
+    """저장된 실행 ID 목록 (최신순)"""
+    name_dir = os.path.join(store_dir, name)
+    if not os.path.isdir(name_dir):
+        return []
+    runs = [run for run in os.listdir(name_dir)
+            if not run.startswith('.') and os.path.isfile(os.path.join(name_dir, run, META_FILE))]
+    return sorted(runs, reverse=True)
+
+
+class TopicRun:
+    """
+    저장된 실행 하나 (토픽 단어/대표 문서는 JSON에서 바로, 배열은 처음 쓸 때 npz에서 읽음)
+
+    Args:
+        run_dir (str): 실행 디렉터리
+        meta (dict): model.json 내용
+    """
+    def __init__(self, run_dir, meta):
+        self.run_dir = run_dir
+        self.meta = meta
+        self.run_id = meta["run_id"]
+        self.fingerprint = meta.get("fingerprint")
+        self.params = meta.get("params", {})
+        self.topic_ids = meta["topic_ids"]
+        self.topic_sizes = {int(topic): size for topic, size in meta["topic_sizes"].items()}
+        self.topic_labels = {int(topic): label for topic, label in meta["topic_labels"].items()}
+        self.topic_words = {
+            int(topic): [(word, score) for word, score in words] for topic, words in meta["topic_words"].items()
+        }
+        self.representative_docs = {int(topic): docs for topic, docs in meta["representative_docs"].items()}
+        self.vocabulary = meta.get("vocabulary", [])
+        self._arrays = {}
+
+    def _array(self, key):
+        if key not in self._arrays:
+            # allow_pickle=False: 숫자 배열만 읽음
+            with np.load(os.path.join(self.run_dir, ARRAYS_FILE), allow_pickle=False) as arrays:
+                self._arrays[key] = arrays[key] if key in arrays.files else None
+        return self._arrays[key]
+
+    @property
+    def topics(self):
+        return self._array("topics")
+
+    @property
+    def probabilities(self):
+        """문서 × 토픽 float32 확률 (상위 k개 밖의 토픽은 0, 이전 실행은 저장된 밀집 행렬 그대로)"""
+        indices = self._array("probability_topics")
+        if indices is None:
+            return self._array("probabilities")
+        from topic_distribution import to_dense
+        return to_dense(indices, self._array("probability_values"), int(self._array("probability_n_topics")))
+
+    @property
+    def topic_embeddings(self):
+        return self._array("topic_embeddings")
+
+    @property
+    def reduced_embeddings(self):
+        return self._array("reduced_embeddings")
+
+    @property
+    def doc_hashes(self):
+        return self._array("doc_hashes")
+
+    @property
+    def similarity_floor(self):
+        return self._array("similarity_floor")
+
+    @property
+    def c_tf_idf(self):
+        data = self._array("c_tf_idf_data")
+        if data is None:
+            return None
+        from scipy.sparse import csr_matrix
+        return csr_matrix(
+            (data, self._array("c_tf_idf_indices"), self._array("c_tf_idf_indptr")),
+            shape=tuple(self._array("c_tf_idf_shape"))
+        )
+
+    def topics_dict(self):
+        """노이즈 토픽(-1)을 뺀 토픽 번호 → 단어 리스트 (Step4.ber 반환값과 같은 형식)"""
+        return {topic: [word for word, _ in words] for topic, words in self.topic_words.items() if topic != -1}
+
+
+def load_topic_run(name='step4', run_id=None, fingerprint=None, store_dir=STORE_DIR):
+    """
+    저장된 실행 불러오기 (학습 없이 JSON + npz만 읽음)
+
+    Args:
+        name (str): 실행 묶음 이름
+        run_id (str): 불러올 실행 ID (None이면 latest)
+        fingerprint (str): 주면 같은 fingerprint로 저장된 실행일 때만 반환
+
+    Returns:
+        TopicRun | None: 없거나, 형식 버전/fingerprint가 다르면 None
+    """
+    name_dir = os.path.join(store_dir, name)
+    if run_id is None:
+        try:
+            with open(os.path.join(name_dir, LATEST_FILE), 'r', encoding='utf-8') as f:
+                run_id = f.read().strip()
+        except OSError:
+            return None
+    run_dir = os.path.join(name_dir, os.path.basename(run_id))
+    try:
+        with open(os.path.join(run_dir, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != STORE_VERSION:
+        return None
+    if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+        return None
+    return TopicRun(run_dir, meta)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import heapq
+import json
+
+import numpy as np
+
+from progress_reporter import report
+from topic_model_store import doc_hashes, normalize_rows, floors_from_similarities, save_topic_model
+
+# 한 번에 디스크에서 읽어 전처리/임베딩/학습할 문서 수
+ONLINE_BATCH_SIZE = 5000
+# 특허가 이보다 많으면 Step4.ber가 전체를 메모리에 올리지 않고 온라인 모드(ber_online)로 진행
+ONLINE_MIN_DOCS = 50000
+# 토픽마다 남길 대표 문서 수 (토픽 임베딩과 가장 가까운 문서)
+N_REPRESENTATIVE_DOCS = 3
+
+
+class _FrozenReducer:
+    """1차 패스에서 학습한 축소 모델을 고정 (BERTopic.partial_fit이 부르는 partial_fit은 아무것도 하지 않음)"""
+    def __init__(self, model):
+        self.model = model
+
+    def partial_fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return self.model.transform(X)
+
+
+class _FrozenClusterer:
+    """1차 패스에서 학습한 군집 모델을 고정 (partial_fit은 배정만 해서 labels_에 둠)"""
+    def __init__(self, model):
+        self.model = model
+        self.labels_ = None
+
+    def partial_fit(self, X, y=None):
+        self.labels_ = self.model.predict(X)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+class OnlineTopicModel:
+    """
+    문서 수와 관계없이 메모리를 일정하게 쓰는 온라인 BERTopic (배치 하나만 메모리에 올림)
+    - 차원 축소 IncrementalPCA, 군집 MiniBatchKMeans, 단어 OnlineCountVectorizer (모두 partial_fit)
+    - fit은 코퍼스를 세 번 훑음 (전처리/임베딩은 디스크 캐시에 있으므로 두 번째부터는 읽기만 함)
+      1) 축소/군집 모델만 갱신해서 군집 중심을 안정시킴 (첫 배치들의 불안정한 배정이 토픽 단어에 섞이지 않게)
+      2) 축소/군집 모델을 고정하고 BERTopic.partial_fit으로 토픽 단어(c-TF-IDF)만 누적, 배치마다 나온 토픽을
+         최종 배정으로 기록, 토픽 임베딩은 문서 임베딩 합계로 누적
+         (IncrementalPCA를 계속 갱신하면 축 방향/부호가 바뀌어 MiniBatchKMeans 중심과 어긋남)
+      3) 토픽 임베딩과의 유사도로 대표 문서와 증분 배정용 유사도 하한 계산
+    - 문서별로는 해시/토픽/유사도만 남기고 확률 행렬은 만들지 않음
+
+    Args:
+        n_topics (int): 토픽 수 (MiniBatchKMeans 군집 수)
+        n_components (int): IncrementalPCA 차원
+        top_n_words (int): 토픽당 단어 수
+        delete_min_df (float): 누적 단어 빈도가 이보다 낮은 단어는 어휘에서 제거 (어휘 크기 제한)
+        seed (int): 난수 시드
+    """
+    def __init__(self, n_topics=6, n_components=7, top_n_words=15, delete_min_df=2, seed=42):
+        from bertopic import BERTopic
+        from bertopic.vectorizers import ClassTfidfTransformer, OnlineCountVectorizer
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import IncrementalPCA
+
+        self.n_topics = n_topics
+        self.n_components = n_components
+        self.params = {"n_topics": n_topics, "n_components": n_components, "delete_min_df": delete_min_df}
+        self.topic_model = BERTopic(
+            language="korean",
+            umap_model=IncrementalPCA(n_components=n_components),
+            hdbscan_model=MiniBatchKMeans(n_clusters=n_topics, random_state=seed, n_init=3),
+            vectorizer_model=OnlineCountVectorizer(token_pattern=r"(?u)\b\w[\w_]+\b", delete_min_df=delete_min_df),
+            ctfidf_model=ClassTfidfTransformer(bm25_weighting=True, reduce_frequent_words=False),
+            top_n_words=top_n_words,
+            calculate_probabilities=False,
+        )
+        self.hashes = []
+        self.topics = []
+        self.similarities = None
+        self.representative_docs = {}
+        self._sums = {}
+        self._counts = {}
+
+    def _usable(self, embeddings):
+        # IncrementalPCA/MiniBatchKMeans의 partial_fit은 배치가 차원/군집 수보다 커야 함
+        return len(embeddings) >= max(self.n_components, self.n_topics)
+
+    @staticmethod
+    def _as_float64(embeddings):
+        # IncrementalPCA는 두 번째 partial_fit부터 float64를 돌려줌 → 처음부터 float64로 맞춰야
+        # MiniBatchKMeans 중심(첫 배치의 dtype)과 어긋나지 않음
+        return np.asarray(embeddings, dtype=np.float64)
+
+    def warm_up(self, embeddings):
+        """1차 패스: 축소/군집 모델만 갱신"""
+        if self._usable(embeddings):
+            embeddings = self._as_float64(embeddings)
+            self.topic_model.umap_model.partial_fit(embeddings)
+            self.topic_model.hdbscan_model.partial_fit(self.topic_model.umap_model.transform(embeddings))
+
+    def partial_fit(self, docs, embeddings):
+        """2차 패스: 토픽 단어 누적, 문서별 토픽과 토픽 임베딩 합계 기록"""
+        embeddings = self._as_float64(embeddings)
+        if self._usable(embeddings):
+            self.topic_model.partial_fit(docs, embeddings=embeddings)
+            topics = np.asarray(self.topic_model.topics_, dtype=np.int32)
+        else:
+            # 마지막 자투리 배치는 학습하지 않고 배정만
+            topics = self.assign(embeddings)
+        unit = normalize_rows(embeddings)
+        for topic in np.unique(topics):
+            mask = topics == topic
+            self._sums[int(topic)] = self._sums.get(int(topic), 0) + unit[mask].sum(axis=0)
+            self._counts[int(topic)] = self._counts.get(int(topic), 0) + int(mask.sum())
+        self.hashes.append(doc_hashes(docs))
+        self.topics.append(topics)
+
+    def assign(self, embeddings):
+        """현재 축소/군집 모델로 토픽 배정"""
+        reduced = self.topic_model.umap_model.transform(self._as_float64(embeddings))
+        clusters = self.topic_model.hdbscan_model.predict(reduced)
+        mappings = self.topic_model.topic_mapper_.get_mappings()
+        return np.array([mappings[cluster] for cluster in clusters], dtype=np.int32)
+
+    def topic_ids(self):
+        """토픽 번호 (BERTopic 토픽 순서, c_tf_idf_ 행 순서와 같음)"""
+        return sorted(set(self.topic_model.topic_representations_ or {}) | set(self._sums))
+
+    def topic_embeddings(self):
+        """topic_ids 순서의 토픽 임베딩 (배정된 문서의 정규화 임베딩 평균, 문서가 없는 토픽은 0)"""
+        dimensions = len(next(iter(self._sums.values())))
+        return np.vstack([
+            self._sums[topic] / self._counts[topic] if self._counts.get(topic) else np.zeros(dimensions)
+            for topic in self.topic_ids()
+        ]).astype(np.float32)
+
+    def fit(self, batches):
+        """
+        Args:
+            batches (callable): 호출할 때마다 (문서 리스트, 임베딩) 배치를 처음부터 다시 내는 iterator를 반환
+
+        Returns:
+            OnlineTopicModel: self
+        """
+        n_docs = 0
+        for docs, embeddings in batches():
+            self.warm_up(embeddings)
+            n_docs += len(docs)
+            report("online", n_docs, n_docs, f"온라인 토픽 모델 준비 중 ({n_docs}개 문서)")
+
+        self.topic_model.umap_model = _FrozenReducer(self.topic_model.umap_model)
+        self.topic_model.hdbscan_model = _FrozenClusterer(self.topic_model.hdbscan_model)
+        done = 0
+        for docs, embeddings in batches():
+            self.partial_fit(docs, embeddings)
+            done += len(docs)
+            report("online", done, n_docs, f"온라인 토픽 모델 학습 중 ({done}/{n_docs})")
+        self.topics = np.concatenate(self.topics) if self.topics else np.zeros(0, dtype=np.int32)
+        self.hashes = np.concatenate(self.hashes) if self.hashes else np.zeros(0, dtype=np.uint64)
+
+        topic_ids = self.topic_ids()
+        vectors = normalize_rows(self.topic_embeddings())
+        self.similarities = np.zeros(len(self.topics), dtype=np.float32)
+        heaps = {topic: [] for topic in topic_ids}
+        start = 0
+        for docs, embeddings in batches():
+            topics = self.topics[start:start + len(docs)]
+            similarities = np.einsum('ij,ij->i', normalize_rows(embeddings), vectors[np.searchsorted(topic_ids, topics)])
+            self.similarities[start:start + len(docs)] = similarities
+            for doc, topic, similarity in zip(docs, topics.tolist(), similarities.tolist()):
+                heap = heaps[topic]
+                if len(heap) < N_REPRESENTATIVE_DOCS:
+                    heapq.heappush(heap, (similarity, doc))
+                elif similarity > heap[0][0]:
+                    heapq.heapreplace(heap, (similarity, doc))
+            start += len(docs)
+        self.representative_docs = {
+            topic: [doc for _, doc in sorted(heap, reverse=True)] for topic, heap in heaps.items()
+        }
+
+        # 저장/시각화에 쓰는 BERTopic 속성을 전체 코퍼스 기준으로 맞춤
+        self.topic_model.topic_sizes_ = {topic: self._counts.get(topic, 0) for topic in topic_ids}
+        self.topic_model.topic_embeddings_ = self.topic_embeddings()
+        self.topic_model.representative_docs_ = self.representative_docs
+        report("online", n_docs, n_docs, f"온라인 토픽 모델 학습 완료 ({n_docs}개 문서)", force=True)
+        return self
+
+    def save(self, name='step4', fingerprint=None, params=None):
+        """topic_model_store에 저장 (UI/web_api/증분 배정이 그대로 읽음)"""
+        if fingerprint is None:
+            # 문서 텍스트를 모아두지 않으므로 문서 해시와 설정으로 fingerprint 계산
+            digest = hashlib.sha256(self.hashes.tobytes())
+            digest.update(json.dumps(self.params, sort_keys=True).encode('utf-8'))
+            fingerprint = digest.hexdigest()
+        return save_topic_model(
+            self.topic_model, self.topics, None, name=name, fingerprint=fingerprint,
+            params={**self.params, **(params or {})}, hashes=self.hashes,
+            floors=floors_from_similarities(self.topic_ids(), self.topics, self.similarities)
+        )
+
+    def topics_dict(self):
+        """토픽 번호 → 단어 리스트 (Step4.ber 반환값과 같은 형식)"""
+        return {topic: [word for word, _ in words] for topic, words in self.topic_model.get_topics().items() if topic != -1}
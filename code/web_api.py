@@ -4,11 +4,12 @@ from pydantic import BaseModel
 from main import generate_report
 from fastapi.responses import JSONResponse
 import os
-import json
 import glob
 from datetime import datetime
 import asyncio
 import markdown
+import progress_reporter
+from topic_model_store import load_topic_run, list_runs
 
 app = FastAPI()
 
@@ -47,12 +48,39 @@ async def generate_report_api(req: KeywordRequest):
 
 @app.get("/progress")
 def get_progress():
-    if os.path.exists("progress.json"):
-        with open("progress.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return JSONResponse(content=data)
-    else:
-        return JSONResponse(content={"stage": "대기 중", "current": 0, "total": 1, "message": "진행 대기 중"})
+    # 보고서 생성은 같은 프로세스에서 돌기 때문에 메모리의 최신 진행상황을 바로 반환
+    return JSONResponse(content=progress_reporter.current_progress())
+
+def _topic_run_response(run):
+    return {
+        "run_id": run.run_id,
+        "created_at": run.meta.get("created_at"),
+        "params": run.params,
+        "topics": [
+            {
+                "topic_id": topic,
+                "label": run.topic_labels.get(topic),
+                "size": run.topic_sizes.get(topic, 0),
+                "words": [{"word": word, "score": score} for word, score in run.topic_words.get(topic, [])],
+                "representative_docs": run.representative_docs.get(topic, []),
+            }
+            for topic in run.topic_ids if topic != -1
+        ],
+    }
+
+@app.get("/topic_runs")
+def topic_runs():
+    """저장된 Step4 토픽 모델 실행 목록 (최신순)"""
+    return JSONResponse(content={"runs": list_runs("step4")})
+
+@app.get("/topics")
+@app.get("/topics/{run_id}")
+def get_topics(run_id: str = None):
+    """저장된 토픽 모델 결과 (run_id가 없으면 마지막 실행, 다시 학습하지 않음)"""
+    run = load_topic_run(name="step4", run_id=run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="저장된 토픽 모델이 없습니다.")
+    return JSONResponse(content=_topic_run_response(run))
 
 @app.get("/list_reports")
 def list_reports():